@@ -18,13 +18,18 @@ from app.core.database import Base
 # 导入所有模型，确保它们被注册到 Base.metadata
 from app.models.video import Video
 from app.models.subtitle import Subtitle
+from app.models.subtitle_lemma import SubtitleLemma
 from app.models.tag import Tag
 from app.models.video_tag import VideoTag
+from app.models.video_catalog_version import VideoCatalogVersion
 from app.models.word_card import WordCard
 from app.models.phrase_card import PhraseCard
 from app.models.user import User
 from app.models.sms_code import SmsCode
 from app.models.user_video_progress import UserVideoProgress
+from app.models.user_learning_stats import UserLearningStats
+from app.models.user_watch_event import UserWatchEvent
+from app.models.user_daily_activity import UserDailyActivity
 from app.models.user_video_favorite import UserVideoFavorite
 
 # this is the Alembic Config object, which provides
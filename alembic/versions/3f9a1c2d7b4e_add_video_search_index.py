@@ -0,0 +1,67 @@
+"""Add video full-text search columns and indexes
+
+Revision ID: 3f9a1c2d7b4e
+Revises: e6266d9d40a9
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c2d7b4e'
+down_revision: Union[str, None] = 'e6266d9d40a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(title_zh, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(original_author, '')), 'B') || "
+    "setweight(jsonb_to_tsvector('simple', coalesce(categories, '[]'::jsonb), '[\"string\"]'), 'B') || "
+    "setweight(jsonb_to_tsvector('simple', coalesce(categories_zh, '[]'::jsonb), '[\"string\"]'), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C') || "
+    "setweight(to_tsvector('simple', coalesce(description_zh, '')), 'D')"
+)
+
+SEARCH_TEXT_SQL = (
+    "coalesce(title, '') || ' ' || coalesce(title_zh, '') || ' ' || "
+    "coalesce(original_author, '') || ' ' || "
+    "coalesce(categories::text, '') || ' ' || coalesce(categories_zh::text, '') || ' ' || "
+    "coalesce(description, '') || ' ' || coalesce(description_zh, '')"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column('videos', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(SEARCH_VECTOR_SQL, persisted=True),
+        nullable=True,
+    ))
+    op.add_column('videos', sa.Column(
+        'search_text',
+        sa.Text(),
+        sa.Computed(SEARCH_TEXT_SQL, persisted=True),
+        nullable=True,
+    ))
+    op.create_index('ix_videos_search_vector', 'videos', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index(
+        'ix_videos_search_text_trgm',
+        'videos',
+        ['search_text'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'search_text': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_videos_search_text_trgm', table_name='videos')
+    op.drop_index('ix_videos_search_vector', table_name='videos')
+    op.drop_column('videos', 'search_text')
+    op.drop_column('videos', 'search_vector')
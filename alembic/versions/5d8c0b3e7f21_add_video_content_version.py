@@ -0,0 +1,27 @@
+"""Add video content version for conditional GET
+
+Revision ID: 5d8c0b3e7f21
+Revises: c47e19a8d2f5
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '5d8c0b3e7f21'
+down_revision: Union[str, None] = 'c47e19a8d2f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('videos', sa.Column('content_version', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('videos', sa.Column('content_updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('videos', 'content_updated_at')
+    op.drop_column('videos', 'content_version')
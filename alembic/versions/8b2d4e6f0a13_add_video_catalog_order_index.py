@@ -0,0 +1,32 @@
+"""Add video catalog order index for keyset pagination
+
+Revision ID: 8b2d4e6f0a13
+Revises: 3f9a1c2d7b4e
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2d4e6f0a13'
+down_revision: Union[str, None] = '3f9a1c2d7b4e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # keyset 比较要求排序键非空
+    op.execute("UPDATE videos SET display_order = 0 WHERE display_order IS NULL")
+    op.execute("UPDATE videos SET created_at = now() WHERE created_at IS NULL")
+    op.alter_column('videos', 'display_order', existing_type=sa.Integer(), nullable=False, server_default='0')
+    op.alter_column('videos', 'created_at', existing_type=sa.DateTime(timezone=True), nullable=False)
+    op.create_index('ix_videos_catalog_order', 'videos', ['display_order', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_videos_catalog_order', table_name='videos')
+    op.alter_column('videos', 'created_at', existing_type=sa.DateTime(timezone=True), nullable=True)
+    op.alter_column('videos', 'display_order', existing_type=sa.Integer(), nullable=True, server_default=None)
@@ -0,0 +1,28 @@
+"""Add subtitle (video_id, start_time) index for time-windowed reads
+
+Revision ID: 9e1f3a5c7b20
+Revises: 5d8c0b3e7f21
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '9e1f3a5c7b20'
+down_revision: Union[str, None] = '5d8c0b3e7f21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_subtitles_video_start', 'subtitles', ['video_id', 'start_time', 'id'], unique=False)
+    # 复合索引以 video_id 开头，单列索引已冗余
+    op.drop_index('ix_subtitles_video_id', table_name='subtitles')
+
+
+def downgrade() -> None:
+    op.create_index('ix_subtitles_video_id', 'subtitles', ['video_id'], unique=False)
+    op.drop_index('ix_subtitles_video_start', table_name='subtitles')
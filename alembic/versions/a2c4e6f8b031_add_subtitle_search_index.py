@@ -0,0 +1,45 @@
+"""Add subtitle full-text / trigram search indexes
+
+Revision ID: a2c4e6f8b031
+Revises: 9e1f3a5c7b20
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2c4e6f8b031'
+down_revision: Union[str, None] = '9e1f3a5c7b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SUBTITLE_SEARCH_VECTOR_SQL = "to_tsvector('english', coalesce(english_text, ''))"
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column('subtitles', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(SUBTITLE_SEARCH_VECTOR_SQL, persisted=True),
+        nullable=True,
+    ))
+    op.create_index('ix_subtitles_search_vector', 'subtitles', ['search_vector'], unique=False, postgresql_using='gin')
+    op.create_index(
+        'ix_subtitles_chinese_text_trgm',
+        'subtitles',
+        ['chinese_text'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'chinese_text': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_subtitles_chinese_text_trgm', table_name='subtitles')
+    op.drop_index('ix_subtitles_search_vector', table_name='subtitles')
+    op.drop_column('subtitles', 'search_vector')
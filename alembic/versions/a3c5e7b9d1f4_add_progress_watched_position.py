@@ -0,0 +1,208 @@
+"""Track playback position separately so marks and new rows don't count as watch time
+
+Revision ID: a3c5e7b9d1f4
+Revises: b9d1f3a5c7e0
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c5e7b9d1f4'
+down_revision: Union[str, None] = 'b9d1f3a5c7e0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 统计与观看流水共用的每行观看明细：播放位置前进的秒数，不超过两次上报的间隔
+WATCH_DELTAS_SQL = """
+            SELECT n.user_id, n.video_id, n.last_watched_at, n.watched_position,
+                   greatest(0, least(
+                       n.watched_position - o.watched_position,
+                       ceil(extract(epoch FROM n.last_watched_at - o.last_watched_at))
+                   ))::int AS seconds,
+                   n.is_completed::int - o.is_completed::int AS completed
+            FROM new_rows AS n
+            JOIN old_rows AS o ON o.id = n.id
+"""
+
+STATS_UPSERT_SQL = """
+        INSERT INTO user_learning_stats AS s
+            (user_id, total_watch_seconds, videos_started, videos_completed, week_start, week_watch_seconds, updated_at)
+        SELECT d.user_id, d.watch, d.started, d.completed,
+               date_trunc('week', now() AT TIME ZONE 'UTC')::date, d.watch, now()
+        FROM ({deltas}) AS d
+        ORDER BY d.user_id
+        ON CONFLICT (user_id) DO UPDATE SET
+            total_watch_seconds = s.total_watch_seconds + EXCLUDED.total_watch_seconds,
+            videos_started = s.videos_started + EXCLUDED.videos_started,
+            videos_completed = s.videos_completed + EXCLUDED.videos_completed,
+            week_watch_seconds = CASE
+                WHEN s.week_start = EXCLUDED.week_start THEN s.week_watch_seconds + EXCLUDED.week_watch_seconds
+                ELSE EXCLUDED.week_watch_seconds
+            END,
+            week_start = EXCLUDED.week_start,
+            updated_at = now()
+"""
+
+# 新增进度行不计观看时长
+INSERT_DELTAS_SQL = """
+            SELECT n.user_id, 0::bigint AS watch, count(*)::int AS started,
+                   count(*) FILTER (WHERE n.is_completed)::int AS completed
+            FROM new_rows AS n
+            GROUP BY n.user_id
+"""
+
+UPDATE_DELTAS_SQL = f"""
+            SELECT w.user_id, sum(w.seconds)::bigint AS watch, 0 AS started, sum(w.completed)::int AS completed
+            FROM ({WATCH_DELTAS_SQL}) AS w
+            GROUP BY w.user_id
+"""
+
+DELETE_SQL = """
+        UPDATE user_learning_stats AS s
+        SET videos_started = s.videos_started - d.started,
+            videos_completed = s.videos_completed - d.completed,
+            updated_at = now()
+        FROM (
+            SELECT o.user_id, count(*)::int AS started, count(*) FILTER (WHERE o.is_completed)::int AS completed
+            FROM old_rows AS o
+            GROUP BY o.user_id
+        ) AS d
+        WHERE s.user_id = d.user_id
+"""
+
+SYNC_STATS_FUNCTION_SQL = f"""
+CREATE OR REPLACE FUNCTION user_video_progress_sync_stats() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        {STATS_UPSERT_SQL.format(deltas=INSERT_DELTAS_SQL).strip()};
+    ELSIF TG_OP = 'UPDATE' THEN
+        {STATS_UPSERT_SQL.format(deltas=UPDATE_DELTAS_SQL).strip()};
+    ELSE
+        {DELETE_SQL.strip()};
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+LOG_WATCH_FUNCTION_SQL = f"""
+CREATE OR REPLACE FUNCTION user_video_progress_log_watch() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO user_watch_events (user_id, video_id, watched_at, watch_seconds, position)
+    SELECT w.user_id, w.video_id, w.last_watched_at, w.seconds, w.watched_position
+    FROM ({WATCH_DELTAS_SQL}) AS w
+    WHERE w.seconds > 0;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# 降级时恢复的旧函数（d1f3a5c7e9b2 / e3a5c7e9b1d4）：按 current_progress 计，新增行计入当前进度
+OLD_WATCHED_SECONDS_SQL = """greatest(0, least(
+                       n.current_progress - o.current_progress,
+                       ceil(extract(epoch FROM n.last_watched_at - o.last_watched_at))
+                   ))"""
+
+OLD_SYNC_STATS_FUNCTION_SQL = f"""
+CREATE OR REPLACE FUNCTION user_video_progress_sync_stats() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        {STATS_UPSERT_SQL.format(deltas='''
+            SELECT n.user_id, sum(n.current_progress)::bigint AS watch, count(*)::int AS started,
+                   count(*) FILTER (WHERE n.is_completed)::int AS completed
+            FROM new_rows AS n
+            GROUP BY n.user_id
+''').strip()};
+    ELSIF TG_OP = 'UPDATE' THEN
+        {STATS_UPSERT_SQL.format(deltas=f'''
+            SELECT n.user_id,
+                   sum({OLD_WATCHED_SECONDS_SQL})::bigint AS watch,
+                   0 AS started,
+                   sum(n.is_completed::int - o.is_completed::int)::int AS completed
+            FROM new_rows AS n
+            JOIN old_rows AS o ON o.id = n.id
+            GROUP BY n.user_id
+''').strip()};
+    ELSE
+        {DELETE_SQL.strip()};
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+OLD_LOG_WATCH_FUNCTION_SQL = f"""
+CREATE OR REPLACE FUNCTION user_video_progress_log_watch() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO user_watch_events (user_id, video_id, watched_at, watch_seconds, position)
+        SELECT n.user_id, n.video_id, n.last_watched_at, n.current_progress, n.current_progress
+        FROM new_rows AS n
+        WHERE n.current_progress > 0;
+    ELSE
+        INSERT INTO user_watch_events (user_id, video_id, watched_at, watch_seconds, position)
+        SELECT n.user_id, n.video_id, n.last_watched_at, w.seconds, n.current_progress
+        FROM new_rows AS n
+        JOIN old_rows AS o ON o.id = n.id
+        CROSS JOIN LATERAL (SELECT ({OLD_WATCHED_SECONDS_SQL})::int AS seconds) AS w
+        WHERE w.seconds > 0;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+UPDATE_TRIGGERS = [
+    ('trg_user_video_progress_stats_update', 'user_video_progress_sync_stats'),
+    ('trg_user_video_progress_watch_update', 'user_video_progress_log_watch'),
+]
+
+
+def _create_update_triggers() -> None:
+    for name, function in UPDATE_TRIGGERS:
+        op.execute(f"""
+            CREATE TRIGGER {name}
+            AFTER UPDATE ON user_video_progress
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION {function}()
+        """)
+
+
+def _drop_update_triggers() -> None:
+    for name, _function in UPDATE_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON user_video_progress")
+
+
+def upgrade() -> None:
+    # 回填不是观看，先摘掉更新触发器；迁移持有 user_video_progress 的锁直到提交，期间不会有进度写入遗漏
+    _drop_update_triggers()
+    op.add_column(
+        'user_video_progress',
+        sa.Column('watched_position', sa.Integer(), server_default='0', nullable=False),
+    )
+    # 已有进度行以当前进度作为播放位置，下一次心跳按前进的秒数计
+    op.execute("UPDATE user_video_progress SET watched_position = current_progress")
+
+    op.execute(SYNC_STATS_FUNCTION_SQL)
+    op.execute(LOG_WATCH_FUNCTION_SQL)
+    _create_update_triggers()
+    # 新增进度行不再记录观看流水
+    op.execute("DROP TRIGGER IF EXISTS trg_user_video_progress_watch_insert ON user_video_progress")
+
+
+def downgrade() -> None:
+    _drop_update_triggers()
+    op.execute(OLD_SYNC_STATS_FUNCTION_SQL)
+    op.execute(OLD_LOG_WATCH_FUNCTION_SQL)
+    _create_update_triggers()
+    op.execute("""
+        CREATE TRIGGER trg_user_video_progress_watch_insert
+        AFTER INSERT ON user_video_progress
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION user_video_progress_log_watch()
+    """)
+    op.drop_column('user_video_progress', 'watched_position')
@@ -0,0 +1,41 @@
+"""Add (user_id, video_id) indexes to subtitle/word/phrase favorites
+
+Revision ID: a7c9e1b3d5f8
+Revises: f5b7d9e1a3c6
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c9e1b3d5f8'
+down_revision: Union[str, None] = 'f5b7d9e1a3c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (收藏表, 索引名)
+FAVORITE_TABLES = [
+    ('user_subtitle_favorites', 'ix_user_subtitle_favorites_user_video'),
+    ('user_word_favorites', 'ix_user_word_favorites_user_video'),
+    ('user_phrase_favorites', 'ix_user_phrase_favorites_user_video'),
+]
+
+
+def upgrade() -> None:
+    # 收藏表由 create_tables.py 创建，可能不存在；/favorites/check 按 (user_id, video_id) 查询某视频下的全部收藏
+    for table, index in FAVORITE_TABLES:
+        op.execute(f"""
+            DO $$
+            BEGIN
+                IF to_regclass('{table}') IS NOT NULL THEN
+                    CREATE INDEX IF NOT EXISTS {index} ON {table} (user_id, video_id);
+                END IF;
+            END $$;
+        """)
+
+
+def downgrade() -> None:
+    for _, index in FAVORITE_TABLES:
+        op.execute(f"DROP INDEX IF EXISTS {index}")
@@ -0,0 +1,82 @@
+"""Add subtitle_lemmas concordance index maintained by trigger
+
+Revision ID: b5d7f9a1c3e2
+Revises: a2c4e6f8b031
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d7f9a1c3e2'
+down_revision: Union[str, None] = 'a2c4e6f8b031'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LEMMA_ROWS_SQL = """
+    SELECT left(lower(r.value), 100), n.id, n.video_id, n.start_time, array_agg(DISTINCT left(r.key, 100))
+    FROM {source} AS n
+    CROSS JOIN LATERAL jsonb_each_text(
+        CASE WHEN jsonb_typeof(n.word_refs) = 'object' THEN n.word_refs ELSE '{{}}'::jsonb END
+    ) AS r
+    WHERE btrim(r.value) <> ''
+    GROUP BY 1, n.id, n.video_id, n.start_time
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        'subtitle_lemmas',
+        sa.Column('lemma', sa.String(length=100), nullable=False),
+        sa.Column('subtitle_id', sa.Integer(), nullable=False),
+        sa.Column('video_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('start_time', sa.DECIMAL(precision=10, scale=3), nullable=False),
+        sa.Column('forms', postgresql.ARRAY(sa.String(length=100)), nullable=False),
+        sa.ForeignKeyConstraint(['subtitle_id'], ['subtitles.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['video_id'], ['videos.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('lemma', 'subtitle_id'),
+    )
+    op.create_index(op.f('ix_subtitle_lemmas_subtitle_id'), 'subtitle_lemmas', ['subtitle_id'], unique=False)
+
+    # 回填现有字幕
+    op.execute(
+        "INSERT INTO subtitle_lemmas (lemma, subtitle_id, video_id, start_time, forms) "
+        + LEMMA_ROWS_SQL.format(source="subtitles")
+    )
+
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION subtitles_sync_lemmas() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'UPDATE' THEN
+                DELETE FROM subtitle_lemmas AS l USING new_rows AS n WHERE l.subtitle_id = n.id;
+            END IF;
+            INSERT INTO subtitle_lemmas (lemma, subtitle_id, video_id, start_time, forms)
+            {LEMMA_ROWS_SQL.format(source="new_rows")};
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_subtitles_lemmas_insert
+        AFTER INSERT ON subtitles
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION subtitles_sync_lemmas()
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_subtitles_lemmas_update
+        AFTER UPDATE ON subtitles
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION subtitles_sync_lemmas()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_subtitles_lemmas_update ON subtitles")
+    op.execute("DROP TRIGGER IF EXISTS trg_subtitles_lemmas_insert ON subtitles")
+    op.execute("DROP FUNCTION IF EXISTS subtitles_sync_lemmas()")
+    op.drop_index(op.f('ix_subtitle_lemmas_subtitle_id'), table_name='subtitle_lemmas')
+    op.drop_table('subtitle_lemmas')
@@ -0,0 +1,57 @@
+"""Add video catalog version for list/detail conditional GET
+
+Revision ID: b9d1f3a5c7e0
+Revises: a7c9e1b3d5f8
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9d1f3a5c7e0'
+down_revision: Union[str, None] = 'a7c9e1b3d5f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CATALOG_TABLES = ['videos', 'video_tags', 'tags']
+
+
+def upgrade() -> None:
+    op.create_table(
+        'video_catalog_version',
+        sa.Column('id', sa.Boolean(), server_default=sa.text('true'), nullable=False),
+        sa.Column('version', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('bumped_xid', sa.BigInteger(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.CheckConstraint('id', name='ck_video_catalog_version_single_row'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.execute("INSERT INTO video_catalog_version (id, version) VALUES (true, 0)")
+    # 提交时递增（延迟约束触发器），每个事务只递增一次
+    op.execute("""
+        CREATE OR REPLACE FUNCTION video_catalog_bump_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE video_catalog_version
+            SET version = version + 1, bumped_xid = txid_current(), updated_at = now()
+            WHERE bumped_xid IS DISTINCT FROM txid_current();
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table in CATALOG_TABLES:
+        op.execute(f"""
+            CREATE CONSTRAINT TRIGGER trg_{table}_catalog_version
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            DEFERRABLE INITIALLY DEFERRED
+            FOR EACH ROW EXECUTE FUNCTION video_catalog_bump_version()
+        """)
+
+
+def downgrade() -> None:
+    for table in CATALOG_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_catalog_version ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS video_catalog_bump_version()")
+    op.drop_table('video_catalog_version')
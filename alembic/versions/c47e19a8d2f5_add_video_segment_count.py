@@ -0,0 +1,65 @@
+"""Add denormalized videos.segment_count maintained by trigger
+
+Revision ID: c47e19a8d2f5
+Revises: 8b2d4e6f0a13
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c47e19a8d2f5'
+down_revision: Union[str, None] = '8b2d4e6f0a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('videos', sa.Column('segment_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute("""
+        CREATE OR REPLACE FUNCTION videos_sync_segment_count() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' OR TG_OP = 'UPDATE' THEN
+                IF OLD.parent_id IS NOT NULL
+                   AND (TG_OP = 'DELETE' OR NEW.parent_id IS DISTINCT FROM OLD.parent_id) THEN
+                    UPDATE videos SET segment_count = GREATEST(segment_count - 1, 0)
+                    WHERE id = OLD.parent_id;
+                END IF;
+            END IF;
+            IF TG_OP = 'INSERT' OR TG_OP = 'UPDATE' THEN
+                IF NEW.parent_id IS NOT NULL
+                   AND (TG_OP = 'INSERT' OR NEW.parent_id IS DISTINCT FROM OLD.parent_id) THEN
+                    UPDATE videos SET segment_count = segment_count + 1
+                    WHERE id = NEW.parent_id;
+                END IF;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_videos_segment_count
+        AFTER INSERT OR DELETE OR UPDATE OF parent_id ON videos
+        FOR EACH ROW EXECUTE FUNCTION videos_sync_segment_count()
+    """)
+    # 回填现有数据
+    op.execute("""
+        UPDATE videos AS v
+        SET segment_count = c.cnt
+        FROM (
+            SELECT parent_id, COUNT(*) AS cnt
+            FROM videos
+            WHERE parent_id IS NOT NULL
+            GROUP BY parent_id
+        ) AS c
+        WHERE v.id = c.parent_id
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_videos_segment_count ON videos")
+    op.execute("DROP FUNCTION IF EXISTS videos_sync_segment_count()")
+    op.drop_column('videos', 'segment_count')
@@ -0,0 +1,32 @@
+"""Record when watch events are written so rollups can re-roll late offline syncs
+
+Revision ID: c5e7a9b1d3f6
+Revises: a3c5e7b9d1f4
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e7a9b1d3f6'
+down_revision: Union[str, None] = 'a3c5e7b9d1f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 已有流水保持为空（不改写整张流水表），默认值只作用于之后写入的行
+    op.add_column('user_watch_events', sa.Column('recorded_at', sa.DateTime(timezone=True), nullable=True))
+    op.execute("ALTER TABLE user_watch_events ALTER COLUMN recorded_at SET DEFAULT now()")
+    op.create_index(
+        'ix_user_watch_events_recorded_at', 'user_watch_events', ['recorded_at'],
+        unique=False, postgresql_using='brin',
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_watch_events_recorded_at', table_name='user_watch_events')
+    op.drop_column('user_watch_events', 'recorded_at')
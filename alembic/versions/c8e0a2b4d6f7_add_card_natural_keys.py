@@ -0,0 +1,65 @@
+"""Deduplicate word/phrase cards and add (video_id, word|phrase) unique keys
+
+Revision ID: c8e0a2b4d6f7
+Revises: b5d7f9a1c3e2
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e0a2b4d6f7'
+down_revision: Union[str, None] = 'b5d7f9a1c3e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (卡片表, 自然键列, 收藏表, 收藏表中的卡片列, 唯一约束名)
+CARD_TABLES = [
+    ('word_cards', 'word', 'user_word_favorites', 'word_card_id', 'uq_word_cards_video_word'),
+    ('phrase_cards', 'phrase', 'user_phrase_favorites', 'phrase_card_id', 'uq_phrase_cards_video_phrase'),
+]
+
+
+def upgrade() -> None:
+    for table, key, favorites, favorite_column, constraint in CARD_TABLES:
+        # 每组重复卡片保留最早创建的一张
+        op.execute(f"""
+            CREATE TEMP TABLE {table}_dedupe ON COMMIT DROP AS
+            SELECT id, keep_id FROM (
+                SELECT id,
+                       first_value(id) OVER (
+                           PARTITION BY video_id, {key} ORDER BY created_at NULLS LAST, id
+                       ) AS keep_id
+                FROM {table}
+            ) AS ranked
+            WHERE id <> keep_id
+        """)
+        # 收藏表由 create_tables.py 创建，可能不存在；存在时把收藏改挂到保留的卡片
+        op.execute(f"""
+            DO $$
+            BEGIN
+                IF to_regclass('{favorites}') IS NOT NULL THEN
+                    DELETE FROM {favorites} AS f
+                    USING {table}_dedupe AS d
+                    WHERE f.{favorite_column} = d.id
+                      AND EXISTS (
+                          SELECT 1 FROM {favorites} AS k
+                          WHERE k.user_id = f.user_id AND k.{favorite_column} = d.keep_id
+                      );
+                    UPDATE {favorites} AS f
+                    SET {favorite_column} = d.keep_id
+                    FROM {table}_dedupe AS d
+                    WHERE f.{favorite_column} = d.id;
+                END IF;
+            END
+            $$
+        """)
+        op.execute(f"DELETE FROM {table} AS c USING {table}_dedupe AS d WHERE c.id = d.id")
+        op.create_unique_constraint(constraint, table, ['video_id', key])
+
+
+def downgrade() -> None:
+    for table, _key, _favorites, _favorite_column, constraint in CARD_TABLES:
+        op.drop_constraint(constraint, table, type_='unique')
@@ -0,0 +1,140 @@
+"""Add user_learning_stats maintained incrementally by trigger
+
+Revision ID: d1f3a5c7e9b2
+Revises: c8e0a2b4d6f7
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1f3a5c7e9b2'
+down_revision: Union[str, None] = 'c8e0a2b4d6f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STATS_ROWS_SQL = """
+    SELECT p.user_id,
+           sum(p.current_progress)::bigint,
+           count(*)::int,
+           count(*) FILTER (WHERE p.is_completed)::int,
+           date_trunc('week', now() AT TIME ZONE 'UTC')::date,
+           coalesce(sum(p.current_progress) FILTER (
+               WHERE p.last_watched_at >= date_trunc('week', now() AT TIME ZONE 'UTC')::date::timestamp AT TIME ZONE 'UTC'
+           ), 0)::bigint,
+           now()
+    FROM user_video_progress AS p
+    GROUP BY p.user_id
+"""
+
+# 按用户汇总的增量（{deltas}）累加到统计表；按 user_id 排序写入以避免并发死锁
+STATS_UPSERT_SQL = """
+        INSERT INTO user_learning_stats AS s
+            (user_id, total_watch_seconds, videos_started, videos_completed, week_start, week_watch_seconds, updated_at)
+        SELECT d.user_id, d.watch, d.started, d.completed,
+               date_trunc('week', now() AT TIME ZONE 'UTC')::date, d.watch, now()
+        FROM ({deltas}) AS d
+        ORDER BY d.user_id
+        ON CONFLICT (user_id) DO UPDATE SET
+            total_watch_seconds = s.total_watch_seconds + EXCLUDED.total_watch_seconds,
+            videos_started = s.videos_started + EXCLUDED.videos_started,
+            videos_completed = s.videos_completed + EXCLUDED.videos_completed,
+            week_watch_seconds = CASE
+                WHEN s.week_start = EXCLUDED.week_start THEN s.week_watch_seconds + EXCLUDED.week_watch_seconds
+                ELSE EXCLUDED.week_watch_seconds
+            END,
+            week_start = EXCLUDED.week_start,
+            updated_at = now()
+"""
+
+INSERT_DELTAS_SQL = """
+            SELECT n.user_id, sum(n.current_progress)::bigint AS watch, count(*)::int AS started,
+                   count(*) FILTER (WHERE n.is_completed)::int AS completed
+            FROM new_rows AS n
+            GROUP BY n.user_id
+"""
+
+UPDATE_DELTAS_SQL = """
+            SELECT n.user_id,
+                   sum(greatest(0, least(
+                       n.current_progress - o.current_progress,
+                       ceil(extract(epoch FROM n.last_watched_at - o.last_watched_at))
+                   )))::bigint AS watch,
+                   0 AS started,
+                   sum(n.is_completed::int - o.is_completed::int)::int AS completed
+            FROM new_rows AS n
+            JOIN old_rows AS o ON o.id = n.id
+            GROUP BY n.user_id
+"""
+
+SYNC_STATS_FUNCTION_SQL = f"""
+CREATE OR REPLACE FUNCTION user_video_progress_sync_stats() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        {STATS_UPSERT_SQL.format(deltas=INSERT_DELTAS_SQL).strip()};
+    ELSIF TG_OP = 'UPDATE' THEN
+        {STATS_UPSERT_SQL.format(deltas=UPDATE_DELTAS_SQL).strip()};
+    ELSE
+        UPDATE user_learning_stats AS s
+        SET videos_started = s.videos_started - d.started,
+            videos_completed = s.videos_completed - d.completed,
+            updated_at = now()
+        FROM (
+            SELECT o.user_id, count(*)::int AS started, count(*) FILTER (WHERE o.is_completed)::int AS completed
+            FROM old_rows AS o
+            GROUP BY o.user_id
+        ) AS d
+        WHERE s.user_id = d.user_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+TRIGGERS = [
+    ('trg_user_video_progress_stats_insert', 'INSERT', 'NEW TABLE AS new_rows'),
+    ('trg_user_video_progress_stats_update', 'UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+    ('trg_user_video_progress_stats_delete', 'DELETE', 'OLD TABLE AS old_rows'),
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user_learning_stats',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('total_watch_seconds', sa.BigInteger(), nullable=False),
+        sa.Column('videos_started', sa.Integer(), nullable=False),
+        sa.Column('videos_completed', sa.Integer(), nullable=False),
+        sa.Column('week_start', sa.Date(), nullable=False),
+        sa.Column('week_watch_seconds', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+
+    # 建触发器时持有 user_video_progress 的锁直到迁移提交，回填期间不会有进度写入遗漏
+    op.execute(SYNC_STATS_FUNCTION_SQL)
+    for name, action, referencing in TRIGGERS:
+        op.execute(f"""
+            CREATE TRIGGER {name}
+            AFTER {action} ON user_video_progress
+            REFERENCING {referencing}
+            FOR EACH STATEMENT EXECUTE FUNCTION user_video_progress_sync_stats()
+        """)
+
+    op.execute(
+        "INSERT INTO user_learning_stats "
+        "(user_id, total_watch_seconds, videos_started, videos_completed, week_start, week_watch_seconds, updated_at) "
+        + STATS_ROWS_SQL
+    )
+
+
+def downgrade() -> None:
+    for name, _action, _referencing in reversed(TRIGGERS):
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON user_video_progress")
+    op.execute("DROP FUNCTION IF EXISTS user_video_progress_sync_stats()")
+    op.drop_table('user_learning_stats')
@@ -0,0 +1,113 @@
+"""Add month-partitioned watch event log and daily activity rollups
+
+Revision ID: e3a5c7e9b1d4
+Revises: d1f3a5c7e9b2
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a5c7e9b1d4'
+down_revision: Union[str, None] = 'd1f3a5c7e9b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LOG_WATCH_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION user_video_progress_log_watch() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO user_watch_events (user_id, video_id, watched_at, watch_seconds, position)
+        SELECT n.user_id, n.video_id, n.last_watched_at, n.current_progress, n.current_progress
+        FROM new_rows AS n
+        WHERE n.current_progress > 0;
+    ELSE
+        INSERT INTO user_watch_events (user_id, video_id, watched_at, watch_seconds, position)
+        SELECT n.user_id, n.video_id, n.last_watched_at, w.seconds, n.current_progress
+        FROM new_rows AS n
+        JOIN old_rows AS o ON o.id = n.id
+        CROSS JOIN LATERAL (SELECT (greatest(0, least(
+            n.current_progress - o.current_progress,
+            ceil(extract(epoch FROM n.last_watched_at - o.last_watched_at))
+        )))::int AS seconds) AS w
+        WHERE w.seconds > 0;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+TRIGGERS = [
+    ('trg_user_video_progress_watch_insert', 'INSERT', 'NEW TABLE AS new_rows'),
+    ('trg_user_video_progress_watch_update', 'UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+]
+
+
+def _next_month(month: date) -> date:
+    index = month.year * 12 + month.month
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _month_partitions():
+    """当月与下月的分区；之后的月份由 scripts/rollup_watch_history.py 预建"""
+    current = datetime.now(timezone.utc).date().replace(day=1)
+    return [
+        (f"user_watch_events_y{month.year:04d}m{month.month:02d}", month, _next_month(month))
+        for month in (current, _next_month(current))
+    ]
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE user_watch_events (
+            user_id UUID NOT NULL,
+            video_id UUID NOT NULL,
+            watched_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            watch_seconds INTEGER NOT NULL,
+            position INTEGER NOT NULL
+        ) PARTITION BY RANGE (watched_at)
+    """)
+    op.execute("CREATE TABLE user_watch_events_default PARTITION OF user_watch_events DEFAULT")
+    for name, start, end in _month_partitions():
+        op.execute(
+            f"CREATE TABLE {name} PARTITION OF user_watch_events "
+            f"FOR VALUES FROM ('{start.isoformat()} 00:00:00+00') TO ('{end.isoformat()} 00:00:00+00')"
+        )
+    op.create_index(
+        'ix_user_watch_events_watched_at', 'user_watch_events', ['watched_at'],
+        unique=False, postgresql_using='brin',
+    )
+
+    op.create_table(
+        'user_daily_activity',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('watch_seconds', sa.Integer(), nullable=False),
+        sa.Column('videos_watched', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'day'),
+    )
+
+    op.execute(LOG_WATCH_FUNCTION_SQL)
+    for name, action, referencing in TRIGGERS:
+        op.execute(f"""
+            CREATE TRIGGER {name}
+            AFTER {action} ON user_video_progress
+            REFERENCING {referencing}
+            FOR EACH STATEMENT EXECUTE FUNCTION user_video_progress_log_watch()
+        """)
+
+
+def downgrade() -> None:
+    for name, _action, _referencing in reversed(TRIGGERS):
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON user_video_progress")
+    op.execute("DROP FUNCTION IF EXISTS user_video_progress_log_watch()")
+    op.drop_table('user_daily_activity')
+    # 删除分区表会一并删除所有分区与索引
+    op.execute("DROP TABLE user_watch_events")
@@ -0,0 +1,31 @@
+"""Backfill completed_at for completed progress rows
+
+Revision ID: f5b7d9e1a3c6
+Revises: e3a5c7e9b1d4
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5b7d9e1a3c6'
+down_revision: Union[str, None] = 'e3a5c7e9b1d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # /learning/completed 按 completed_at 做游标分页，已完成的记录必须有完成时间；
+    # 早期数据缺失时以最后观看时间代替（与接口原先的展示一致）
+    op.execute("""
+        UPDATE user_video_progress
+        SET completed_at = last_watched_at
+        WHERE is_completed AND completed_at IS NULL
+    """)
+
+
+def downgrade() -> None:
+    # 数据回填，无需回退
+    pass
@@ -1,9 +1,10 @@
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select, func, desc
+from sqlalchemy import String, cast, desc, func, literal, or_, select, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth import fastapi_users
+from app.core.config import settings
 from app.core.database import get_db
 from app.models.user import User
 from app.models.video import Video
@@ -20,6 +21,8 @@ from app.schemas import (
     FavoriteCheckResponse,
     FavoriteBatchCheckRequest,
     FavoriteBatchCheckResponse,
+    FavoriteUnifiedCheckRequest,
+    FavoriteUnifiedCheckResponse,
     SubtitleFavoriteListResponse,
     SubtitleFavoriteActionResponse,
     SubtitleFavoriteCheckResponse,
@@ -61,7 +64,7 @@ def _video_payload(video: Video) -> dict:
         "parent_id": video.parent_id,
         "segment_index": video.segment_index,
         "video_type": video.video_type or "full",
-        "segment_count": 0,
+        "segment_count": video.segment_count or 0,
         "created_at": video.created_at,
         "updated_at": video.updated_at,
     }
@@ -110,6 +113,75 @@ def _phrase_card_payload(phrase_card: PhraseCard) -> dict:
     }
 
 
+@router.post("/batch-check", response_model=FavoriteBatchCheckResponse)
+async def batch_check_favorites(
+    payload: FavoriteBatchCheckRequest,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(current_user),
+):
+    if not payload.video_ids:
+        return FavoriteBatchCheckResponse(results={})
+
+    result = await db.execute(
+        select(UserVideoFavorite.video_id).where(
+            UserVideoFavorite.user_id == user.id,
+            UserVideoFavorite.video_id.in_(payload.video_ids),
+        )
+    )
+    favorited_ids = {str(row[0]) for row in result.all()}
+    results = {str(video_id): str(video_id) in favorited_ids for video_id in payload.video_ids}
+    return FavoriteBatchCheckResponse(results=results)
+
+
+# 各收藏类型：(类型, 收藏模型, ID 列, 请求 / 响应中的字段名)
+_FAVORITE_KINDS = [
+    ("video", UserVideoFavorite, UserVideoFavorite.video_id, "video_ids"),
+    ("subtitle", UserSubtitleFavorite, UserSubtitleFavorite.subtitle_id, "subtitle_ids"),
+    ("word", UserWordFavorite, UserWordFavorite.word_card_id, "word_card_ids"),
+    ("phrase", UserPhraseFavorite, UserPhraseFavorite.phrase_card_id, "phrase_card_ids"),
+]
+
+
+@router.post("/check", response_model=FavoriteUnifiedCheckResponse)
+async def check_favorites(
+    payload: FavoriteUnifiedCheckRequest,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(current_user),
+):
+    """
+    一次检查视频、字幕、单词、短语四类收藏
+
+    - 传 video_id：返回该视频本身及其下所有已收藏的字幕、单词、短语
+    - 传各类 ID 列表：返回其中已收藏的 ID；可与 video_id 同时使用，结果取并集
+    - 四类查询合并为一条 UNION ALL 语句，走各收藏表的 (user_id, video_id) / (user_id, X_id) 索引
+    """
+    total_ids = sum(len(getattr(payload, field)) for _, _, _, field in _FAVORITE_KINDS)
+    if total_ids > settings.BATCH_CREATE_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"单次最多检查 {settings.BATCH_CREATE_MAX_ITEMS} 个 ID")
+
+    branches = []
+    for kind, model, id_column, field in _FAVORITE_KINDS:
+        conditions = []
+        if payload.video_id is not None:
+            conditions.append(model.video_id == payload.video_id)
+        ids = getattr(payload, field)
+        if ids:
+            conditions.append(id_column.in_(ids))
+        if not conditions:
+            continue
+        branches.append(
+            select(literal(kind).label("kind"), cast(id_column, String).label("id"))
+            .where(model.user_id == user.id, or_(*conditions))
+        )
+    if not branches:
+        raise HTTPException(status_code=400, detail="请提供 video_id 或要检查的 ID")
+
+    result = await db.execute(union_all(*branches))
+    favorited = {field: [] for _, _, _, field in _FAVORITE_KINDS}
+    fields = {kind: field for kind, _, _, field in _FAVORITE_KINDS}
+    for kind, value in result.all():
+        favorited[fields[kind]].append(int(value) if kind == "subtitle" else UUID(value))
+    return FavoriteUnifiedCheckResponse(**favorited)
 
 
 @router.post("/{video_id}", response_model=FavoriteActionResponse, status_code=201)
@@ -209,26 +281,6 @@ async def check_favorite(
     return FavoriteCheckResponse(video_id=video_id, is_favorite=bool(favorite))
 
 
-@router.post("/batch-check", response_model=FavoriteBatchCheckResponse)
-async def batch_check_favorites(
-    payload: FavoriteBatchCheckRequest,
-    db: AsyncSession = Depends(get_db),
-    user: User = Depends(current_user),
-):
-    if not payload.video_ids:
-        return FavoriteBatchCheckResponse(results={})
-
-    result = await db.execute(
-        select(UserVideoFavorite.video_id).where(
-            UserVideoFavorite.user_id == user.id,
-            UserVideoFavorite.video_id.in_(payload.video_ids),
-        )
-    )
-    favorited_ids = {str(row[0]) for row in result.all()}
-    results = {str(video_id): str(video_id) in favorited_ids for video_id in payload.video_ids}
-    return FavoriteBatchCheckResponse(results=results)
-
-
 # ==================== Subtitle Favorites ====================
 
 @router.post("/subtitles/{subtitle_id}", response_model=SubtitleFavoriteActionResponse, status_code=201)
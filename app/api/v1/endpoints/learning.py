@@ -1,55 +1,92 @@
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import select, func, desc
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
+from sqlalchemy import select, func, desc, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth import fastapi_users
+from app.core.config import settings
 from app.core.database import get_db
 from app.models.user import User
 from app.models.video import Video
 from app.models.user_video_progress import UserVideoProgress
+from app.models.user_learning_stats import UserLearningStats
+from app.models.user_daily_activity import UserDailyActivity
 from app.schemas import (
     LearningProgressUpdateRequest,
     LearningProgressResponse,
+    LearningProgressEvent,
+    LearningProgressBatchResponse,
+    LearningStatsResponse,
+    LearningHistoryResponse,
     LearningRecentResponse,
     LearningCompletedResponse,
+    LearningVideoCard,
+    VideoGroupProgress,
 )
+from app.services.group_progress import load_group_progress
+from app.services.learning_progress import sync_progress_events, write_video_progress
+from app.services.progress_buffer import progress_buffer
+from app.utils.pagination import encode_cursor, decode_cursor
 
 router = APIRouter()
 
 current_user = fastapi_users.current_user(active=True)
+current_superuser = fastapi_users.current_user(active=True, superuser=True)
 
 
-def _video_payload(video: Video) -> dict:
-    return {
-        "id": video.id,
-        "title": video.title,
-        "title_zh": video.title_zh,
-        "description": video.description,
-        "description_zh": video.description_zh,
-        "video_url": video.video_url,
-        "vod_file_id": video.vod_file_id,
-        "thumbnail_url": video.thumbnail_url,
-        "duration": video.duration,
-        "difficulty": video.difficulty,
-        "youtube_id": video.youtube_id,
-        "youtube_url": video.youtube_url,
-        "original_author": video.original_author,
-        "author_avatar_url": video.author_avatar_url,
-        "tags": [],
-        "categories": video.categories_zh or video.categories or [],
-        "categories_zh": video.categories_zh or [],
-        "status": video.status,
-        "is_published": video.is_published,
-        "display_order": video.display_order,
-        "parent_id": video.parent_id,
-        "segment_index": video.segment_index,
-        "video_type": video.video_type or "full",
-        "segment_count": 0,
-        "created_at": video.created_at,
-        "updated_at": video.updated_at,
-    }
+# 学习记录列表只查询视频卡片所需的列
+_VIDEO_CARD_COLUMNS = [getattr(Video, name) for name in LearningVideoCard.model_fields]
+
+
+def _video_card(row) -> dict:
+    card = {name: getattr(row, name) for name in LearningVideoCard.model_fields}
+    card["video_type"] = card["video_type"] or "full"
+    card["segment_count"] = card["segment_count"] or 0
+    return card
+
+
+def _progress_card_query(*conditions):
+    """学习记录 + 视频卡片列的投影查询"""
+    return (
+        select(
+            UserVideoProgress.id.label("progress_id"),
+            UserVideoProgress.current_progress,
+            UserVideoProgress.total_duration,
+            UserVideoProgress.is_completed,
+            UserVideoProgress.last_watched_at,
+            UserVideoProgress.completed_at,
+            *_VIDEO_CARD_COLUMNS,
+        )
+        .join(Video, Video.id == UserVideoProgress.video_id)
+        .where(*conditions)
+    )
+
+
+async def _count_progress(db: AsyncSession, *conditions) -> int:
+    result = await db.execute(select(func.count()).select_from(UserVideoProgress).where(*conditions))
+    return result.scalar_one()
+
+
+def _recent_cursor_condition(cursor: str):
+    """根据游标构造 (last_watched_at, id) 降序的 keyset 条件"""
+    watched_at, progress_id = decode_cursor(cursor, 2)
+    try:
+        key = (datetime.fromisoformat(watched_at), UUID(progress_id))
+    except (TypeError, ValueError) as exc:
+        raise ValueError("无效的分页游标") from exc
+    return tuple_(UserVideoProgress.last_watched_at, UserVideoProgress.id) < key
+
+
+def _completed_cursor_condition(cursor: str):
+    """根据游标构造 (completed_at, id) 降序的 keyset 条件"""
+    completed_at, progress_id = decode_cursor(cursor, 2)
+    try:
+        key = (datetime.fromisoformat(completed_at), UUID(progress_id))
+    except (TypeError, ValueError) as exc:
+        raise ValueError("无效的分页游标") from exc
+    return tuple_(UserVideoProgress.completed_at, UserVideoProgress.id) < key
 
 
 def _progress_percent(current_progress: int, total_duration: int) -> float:
@@ -58,65 +95,206 @@ def _progress_percent(current_progress: int, total_duration: int) -> float:
     return round((current_progress / total_duration) * 100, 2)
 
 
+def _longest_streak(days: List[date]) -> int:
+    """按升序排列的活跃日期中最长的连续天数"""
+    longest = current = 0
+    previous = None
+    for day in days:
+        current = current + 1 if previous is not None and day - previous == timedelta(days=1) else 1
+        longest = max(longest, current)
+        previous = day
+    return longest
+
+
+def _progress_response(progress) -> LearningProgressResponse:
+    return LearningProgressResponse(
+        video_id=progress.video_id,
+        current_progress=progress.current_progress,
+        total_duration=progress.total_duration,
+        progress_percent=_progress_percent(progress.current_progress, progress.total_duration),
+        is_completed=progress.is_completed,
+        last_watched_at=progress.last_watched_at,
+        completed_at=progress.completed_at,
+    )
+
+
 @router.post("/progress", response_model=LearningProgressResponse)
 async def update_learning_progress(
     progress_in: LearningProgressUpdateRequest,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(current_user),
 ):
-    result = await db.execute(select(Video).where(Video.id == progress_in.video_id))
-    video = result.scalars().first()
-    if not video:
+    """
+    上报观看进度（播放器心跳）
+
+    启用 PROGRESS_WRITE_BEHIND 时进度先写入内存缓冲，定期合并为批量 upsert 落库，
+    返回内容与直接写库一致。
+    """
+    if settings.PROGRESS_WRITE_BEHIND:
+        duration = await progress_buffer.video_duration(db, progress_in.video_id)
+        if duration is None:
+            raise HTTPException(status_code=404, detail="视频不存在")
+        progress = await progress_buffer.record(
+            db,
+            user.id,
+            progress_in.video_id,
+            progress_in.current_progress,
+            progress_in.total_duration or duration,
+            progress_in.is_completed,
+        )
+        return LearningProgressResponse(
+            **progress,
+            progress_percent=_progress_percent(progress["current_progress"], progress["total_duration"]),
+        )
+
+    progress = await write_video_progress(
+        db,
+        user.id,
+        progress_in.video_id,
+        progress_in.current_progress,
+        progress_in.total_duration,
+        datetime.now(timezone.utc),
+        progress_in.is_completed,
+    )
+    if progress is None:
         raise HTTPException(status_code=404, detail="视频不存在")
+    await db.commit()
+
+    return _progress_response(progress)
 
-    total_duration = progress_in.total_duration or video.duration
-    current_progress = min(progress_in.current_progress, total_duration)
+
+@router.post("/progress/batch", response_model=LearningProgressBatchResponse)
+async def sync_learning_progress(
+    events: list[LearningProgressEvent] = Body(..., min_length=1, max_length=settings.BATCH_CREATE_MAX_ITEMS),
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(current_user),
+):
+    """
+    离线进度批量同步
+
+    客户端重新联网后一次提交离线期间记录的全部进度事件（可包含多个视频），
+    按客户端时间后写者胜合并，完成状态只会从未完成变为完成；不存在的视频计入 skipped。
+    """
     now = datetime.now(timezone.utc)
+    rows = []
+    for event in events:
+        watched_at = event.watched_at
+        if watched_at.tzinfo is None:
+            watched_at = watched_at.replace(tzinfo=timezone.utc)
+        rows.append({
+            "video_id": event.video_id,
+            "current_progress": event.current_progress,
+            "total_duration": event.total_duration,
+            "is_completed": event.is_completed,
+            # 客户端时钟超前时按服务器时间计，避免长期压住之后的正常进度
+            "watched_at": min(watched_at, now),
+        })
+
+    written = await sync_progress_events(db, user.id, rows)
+    await db.commit()
+    for progress in written:
+        progress_buffer.refresh(user.id, progress.video_id, progress.is_completed, progress.completed_at)
+
+    video_count = len({event.video_id for event in events})
+    return LearningProgressBatchResponse(
+        received=len(events),
+        applied=len(written),
+        skipped=video_count - len(written),
+        items=[_progress_response(progress) for progress in written],
+    )
+
+
+@router.get("/stats", response_model=LearningStatsResponse)
+async def get_learning_stats(
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(current_user),
+):
+    """
+    学习统计：累计观看时长、开始 / 完成的视频数、本周观看时长
+
+    读取由触发器增量维护的 user_learning_stats（按主键查询一行）；写回缓冲中尚未落库的进度不计入。
+    """
+    today = datetime.now(timezone.utc).date()
+    week_start = today - timedelta(days=today.weekday())
+
+    stats = await db.get(UserLearningStats, user.id)
+    total_watch_seconds = stats.total_watch_seconds if stats else 0
+    week_watch_seconds = stats.week_watch_seconds if stats and stats.week_start == week_start else 0
+    return LearningStatsResponse(
+        total_watch_seconds=total_watch_seconds,
+        total_watch_minutes=total_watch_seconds // 60,
+        videos_started=stats.videos_started if stats else 0,
+        videos_completed=stats.videos_completed if stats else 0,
+        week_start=week_start,
+        week_watch_seconds=week_watch_seconds,
+        week_watch_minutes=week_watch_seconds // 60,
+    )
+
+
+@router.get("/history", response_model=LearningHistoryResponse)
+async def get_learning_history(
+    start: Optional[date] = Query(None, alias="from", description="起始日期（UTC，含），默认结束日期前 29 天"),
+    end: Optional[date] = Query(None, alias="to", description="结束日期（UTC，含），默认今天"),
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(current_user),
+):
+    """
+    学习历史：每日观看时长（热力图）、活跃天数与连续学习天数
+
+    只读取按日汇总表 user_daily_activity（由定时任务从观看流水汇总，最近数据有汇总间隔的延迟），
+    单次最多查询 366 天；没有观看记录的日期不返回。
+    """
+    today = datetime.now(timezone.utc).date()
+    end = end or today
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise HTTPException(status_code=400, detail="起始日期不能晚于结束日期")
+    if (end - start).days >= 366:
+        raise HTTPException(status_code=400, detail="查询范围不能超过 366 天")
 
     result = await db.execute(
-        select(UserVideoProgress).where(
-            UserVideoProgress.user_id == user.id,
-            UserVideoProgress.video_id == progress_in.video_id,
+        select(UserDailyActivity.day, UserDailyActivity.watch_seconds, UserDailyActivity.videos_watched)
+        .where(
+            UserDailyActivity.user_id == user.id,
+            UserDailyActivity.day >= start,
+            UserDailyActivity.day <= end,
+            UserDailyActivity.watch_seconds > 0,
         )
+        .order_by(UserDailyActivity.day)
     )
-    progress = result.scalars().first()
-    if progress:
-        progress.current_progress = current_progress
-        progress.total_duration = total_duration
-        progress.last_watched_at = now
-        if progress_in.is_completed is True:
-            progress.is_completed = True
-            progress.completed_at = now
-        elif progress_in.is_completed is False:
-            progress.is_completed = False
-            progress.completed_at = None
-        elif not progress.is_completed and current_progress >= total_duration * 0.9:
-            progress.is_completed = True
-            progress.completed_at = now
-    else:
-        is_completed = progress_in.is_completed is True or current_progress >= total_duration * 0.9
-        progress = UserVideoProgress(
-            user_id=user.id,
-            video_id=progress_in.video_id,
-            current_progress=current_progress,
-            total_duration=total_duration,
-            is_completed=is_completed,
-            last_watched_at=now,
-            completed_at=now if is_completed else None,
-        )
-        db.add(progress)
+    days = [
+        {"day": row.day, "watch_seconds": row.watch_seconds, "videos_watched": row.videos_watched}
+        for row in result.all()
+    ]
 
-    await db.commit()
-    await db.refresh(progress)
-
-    return LearningProgressResponse(
-        video_id=progress.video_id,
-        current_progress=progress.current_progress,
-        total_duration=progress.total_duration,
-        progress_percent=_progress_percent(progress.current_progress, progress.total_duration),
-        is_completed=progress.is_completed,
-        last_watched_at=progress.last_watched_at,
-        completed_at=progress.completed_at,
+    # 当前连续天数：截至今天（今天尚无记录时截至昨天），与查询范围无关，最多回溯 366 天
+    result = await db.execute(
+        select(UserDailyActivity.day)
+        .where(
+            UserDailyActivity.user_id == user.id,
+            UserDailyActivity.day >= today - timedelta(days=366),
+            UserDailyActivity.day <= today,
+            UserDailyActivity.watch_seconds > 0,
+        )
+        .order_by(desc(UserDailyActivity.day))
+    )
+    current_streak = 0
+    expected = today
+    for day in result.scalars():
+        if day == expected or (current_streak == 0 and day == today - timedelta(days=1)):
+            current_streak += 1
+            expected = day - timedelta(days=1)
+        else:
+            break
+
+    return LearningHistoryResponse(
+        start=start,
+        end=end,
+        total_watch_seconds=sum(day["watch_seconds"] for day in days),
+        active_days=len(days),
+        current_streak=current_streak,
+        longest_streak=_longest_streak([day["day"] for day in days]),
+        days=days,
     )
 
 
@@ -124,84 +302,111 @@ async def update_learning_progress(
 async def get_recent_learning(
     skip: int = Query(0, ge=0, description="跳过记录数"),
     limit: int = Query(20, ge=1, le=100, description="每页记录数"),
+    cursor: Optional[str] = Query(None, description="分页游标（上一页返回的 next_cursor）"),
+    include_total: bool = Query(True, description="是否返回总数"),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(current_user),
 ):
-    total_result = await db.execute(
-        select(func.count())
-        .select_from(UserVideoProgress)
-        .where(UserVideoProgress.user_id == user.id)
-    )
-    total = total_result.scalar_one()
+    """
+    最近学习记录，按最后观看时间倒序
+
+    - **cursor**: 游标分页，传入上一页的 next_cursor，此时忽略 skip；按 (last_watched_at, id) 走索引，每页开销恒定
+    - **include_total**: 为 false 时不计算总数（total 返回 null），首页等场景建议关闭
+    """
+    conditions = [UserVideoProgress.user_id == user.id]
+    if cursor:
+        try:
+            conditions.append(_recent_cursor_condition(cursor))
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    total = None
+    if include_total:
+        total = await _count_progress(db, UserVideoProgress.user_id == user.id)
 
     stmt = (
-        select(UserVideoProgress, Video)
-        .join(Video, Video.id == UserVideoProgress.video_id)
-        .where(UserVideoProgress.user_id == user.id)
-        .order_by(desc(UserVideoProgress.last_watched_at))
-        .offset(skip)
-        .limit(limit)
+        _progress_card_query(*conditions)
+        .order_by(UserVideoProgress.last_watched_at.desc(), UserVideoProgress.id.desc())
+        .limit(limit + 1)
     )
+    if not cursor:
+        stmt = stmt.offset(skip)
     result = await db.execute(stmt)
-    items = []
-    for progress, video in result.all():
-        items.append(
-            {
-                "video": _video_payload(video),
-                "current_progress": progress.current_progress,
-                "total_duration": progress.total_duration,
-                "progress_percent": _progress_percent(
-                    progress.current_progress, progress.total_duration
-                ),
-                "last_watched_at": progress.last_watched_at,
-                "is_completed": progress.is_completed,
-                "completed_at": progress.completed_at,
-            }
-        )
-
-    return LearningRecentResponse(total=total, items=items)
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([last.last_watched_at.isoformat(), str(last.progress_id)])
+
+    items = [
+        {
+            "video": _video_card(row),
+            "current_progress": row.current_progress,
+            "total_duration": row.total_duration,
+            "progress_percent": _progress_percent(row.current_progress, row.total_duration),
+            "last_watched_at": row.last_watched_at,
+            "is_completed": row.is_completed,
+            "completed_at": row.completed_at,
+        }
+        for row in rows
+    ]
+    return LearningRecentResponse(total=total, items=items, next_cursor=next_cursor)
 
 
 @router.get("/completed", response_model=LearningCompletedResponse)
 async def get_completed_learning(
     skip: int = Query(0, ge=0, description="跳过记录数"),
     limit: int = Query(20, ge=1, le=100, description="每页记录数"),
+    cursor: Optional[str] = Query(None, description="分页游标（上一页返回的 next_cursor）"),
+    include_total: bool = Query(True, description="是否返回总数"),
     db: AsyncSession = Depends(get_db),
     user: User = Depends(current_user),
 ):
-    total_result = await db.execute(
-        select(func.count())
-        .select_from(UserVideoProgress)
-        .where(
-            UserVideoProgress.user_id == user.id,
-            UserVideoProgress.is_completed.is_(True),
-        )
-    )
-    total = total_result.scalar_one()
+    """
+    已完成的视频，按完成时间倒序
+
+    - **cursor**: 游标分页，传入上一页的 next_cursor，此时忽略 skip；按 (completed_at, id) 走索引，每页开销恒定
+    - **include_total**: 为 false 时不计算总数（total 返回 null），首页等场景建议关闭
+    """
+    completed = [UserVideoProgress.user_id == user.id, UserVideoProgress.is_completed.is_(True)]
+    conditions = list(completed)
+    if cursor:
+        try:
+            conditions.append(_completed_cursor_condition(cursor))
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    total = None
+    if include_total:
+        total = await _count_progress(db, *completed)
 
     stmt = (
-        select(UserVideoProgress, Video)
-        .join(Video, Video.id == UserVideoProgress.video_id)
-        .where(
-            UserVideoProgress.user_id == user.id,
-            UserVideoProgress.is_completed.is_(True),
-        )
-        .order_by(desc(UserVideoProgress.completed_at).nullslast())
-        .offset(skip)
-        .limit(limit)
+        _progress_card_query(*conditions)
+        # 与 ix_user_video_progress_user_completed 的反向扫描顺序一致（已完成的记录 completed_at 均不为空）
+        .order_by(UserVideoProgress.completed_at.desc(), UserVideoProgress.id.desc())
+        .limit(limit + 1)
     )
+    if not cursor:
+        stmt = stmt.offset(skip)
     result = await db.execute(stmt)
-    items = []
-    for progress, video in result.all():
-        completed_at = progress.completed_at or progress.last_watched_at
-        items.append(
-            {
-                "video": _video_payload(video),
-                "completed_at": completed_at,
-            }
-        )
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([last.completed_at.isoformat(), str(last.progress_id)])
 
-    return LearningCompletedResponse(total=total, items=items)
+    items = [
+        {
+            "video": _video_card(row),
+            "completed_at": row.completed_at or row.last_watched_at,
+        }
+        for row in rows
+    ]
+    return LearningCompletedResponse(total=total, items=items, next_cursor=next_cursor)
 
 
 @router.get("/progress/{video_id}", response_model=LearningProgressResponse)
@@ -210,6 +415,14 @@ async def get_learning_progress(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(current_user),
 ):
+    pending = progress_buffer.peek(user.id, video_id)
+    if pending is not None:
+        # 尚未落库的最新进度优先
+        return LearningProgressResponse(
+            **pending,
+            progress_percent=_progress_percent(pending["current_progress"], pending["total_duration"]),
+        )
+
     result = await db.execute(
         select(UserVideoProgress).where(
             UserVideoProgress.user_id == user.id,
@@ -220,68 +433,42 @@ async def get_learning_progress(
     if not progress:
         raise HTTPException(status_code=404, detail="学习记录不存在")
 
-    return LearningProgressResponse(
-        video_id=progress.video_id,
-        current_progress=progress.current_progress,
-        total_duration=progress.total_duration,
-        progress_percent=_progress_percent(progress.current_progress, progress.total_duration),
-        is_completed=progress.is_completed,
-        last_watched_at=progress.last_watched_at,
-        completed_at=progress.completed_at,
-    )
+    return _progress_response(progress)
 
 
-@router.post("/complete/{video_id}", response_model=LearningProgressResponse)
-async def complete_learning(
-    video_id: UUID,
+@router.get("/progress/group/{group_id}", response_model=VideoGroupProgress)
+async def get_group_progress(
+    group_id: UUID,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(current_user),
 ):
-    result = await db.execute(select(Video).where(Video.id == video_id))
-    video = result.scalars().first()
-    if not video:
+    """
+    视频组的学习进度：各片段进度与整体完成情况（一次查询，替代逐个片段请求 /progress/{video_id}）
+    """
+    try:
+        progress = await load_group_progress(db, user.id, group_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if progress is None:
         raise HTTPException(status_code=404, detail="视频不存在")
+    return progress
 
-    now = datetime.now(timezone.utc)
-    total_duration = video.duration
 
-    result = await db.execute(
-        select(UserVideoProgress).where(
-            UserVideoProgress.user_id == user.id,
-            UserVideoProgress.video_id == video_id,
-        )
+@router.post("/complete/{video_id}", response_model=LearningProgressResponse)
+async def complete_learning(
+    video_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(current_user),
+):
+    progress = await write_video_progress(
+        db, user.id, video_id, None, None, datetime.now(timezone.utc), mark=True
     )
-    progress = result.scalars().first()
-    if progress:
-        progress.current_progress = total_duration
-        progress.total_duration = total_duration
-        progress.is_completed = True
-        progress.completed_at = now
-        progress.last_watched_at = now
-    else:
-        progress = UserVideoProgress(
-            user_id=user.id,
-            video_id=video_id,
-            current_progress=total_duration,
-            total_duration=total_duration,
-            is_completed=True,
-            completed_at=now,
-            last_watched_at=now,
-        )
-        db.add(progress)
-
+    if progress is None:
+        raise HTTPException(status_code=404, detail="视频不存在")
     await db.commit()
-    await db.refresh(progress)
+    progress_buffer.remember(user.id, video_id, progress.is_completed, progress.completed_at)
 
-    return LearningProgressResponse(
-        video_id=progress.video_id,
-        current_progress=progress.current_progress,
-        total_duration=progress.total_duration,
-        progress_percent=_progress_percent(progress.current_progress, progress.total_duration),
-        is_completed=progress.is_completed,
-        last_watched_at=progress.last_watched_at,
-        completed_at=progress.completed_at,
-    )
+    return _progress_response(progress)
 
 
 @router.delete("/progress/{video_id}", status_code=204)
@@ -290,6 +477,9 @@ async def delete_learning_progress(
     db: AsyncSession = Depends(get_db),
     user: User = Depends(current_user),
 ):
+    # 先丢弃缓冲中的进度（等待进行中的落库结束），再查询并删除库中的行
+    pending = progress_buffer.peek(user.id, video_id)
+    await progress_buffer.discard(user.id, video_id)
     result = await db.execute(
         select(UserVideoProgress).where(
             UserVideoProgress.user_id == user.id,
@@ -298,8 +488,23 @@ async def delete_learning_progress(
     )
     progress = result.scalars().first()
     if not progress:
+        if pending is not None:
+            return None
         raise HTTPException(status_code=404, detail="学习记录不存在")
 
     await db.delete(progress)
     await db.commit()
     return None
+
+
+@router.get("/progress/buffer/stats")
+async def get_progress_buffer_stats(
+    _user: User = Depends(current_superuser),
+):
+    """
+    学习进度写回缓冲统计（当前 worker）
+
+    返回待落库条目数、累计心跳数、落库次数与行数、最近一次落库耗时，
+    以及合并比（心跳数 / 落库行数），用于评估写库 TPS 相对在线观看人数的缩减。
+    """
+    return progress_buffer.stats()
@@ -1,16 +1,20 @@
 from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.auth import fastapi_users, current_user_optional
+from app.core.config import settings
 from app.core.database import get_db
 from app.dependencies import get_accessible_video
 from app.models.phrase_card import PhraseCard
 from app.models.user import User
 from app.models.video import Video
-from app.schemas import PhraseCardCreate, PhraseCardResponse, PhraseCardListResponse
+from app.schemas import PhraseCardCreate, PhraseCardResponse, PhraseCardListResponse, PhraseCardBatchResponse
+from app.services.bulk_insert import upsert_returning
+from app.services.content_version import bump_content_version
 
 router = APIRouter()
 
@@ -57,31 +61,46 @@ async def create_phrase_card(
 
     为指定视频添加一个短语卡片。
     """
-    phrase_card = PhraseCard(**phrase_card_in.model_dump())
-    db.add(phrase_card)
+    # 依赖 (video_id, phrase) 唯一约束判重：并发创建同一卡片时只有一个成功，其余返回 409
+    phrase_card = await db.scalar(
+        pg_insert(PhraseCard)
+        .values(**phrase_card_in.model_dump())
+        .on_conflict_do_nothing(index_elements=[PhraseCard.video_id, PhraseCard.phrase])
+        .returning(PhraseCard)
+    )
+    if phrase_card is None:
+        raise HTTPException(status_code=409, detail="该视频已有相同的短语卡片")
+
+    await bump_content_version(db, phrase_card.video_id)
     await db.commit()
     await db.refresh(phrase_card)
     return phrase_card
 
 
-@router.post("/batch", response_model=PhraseCardListResponse, status_code=201)
+@router.post("/batch", response_model=PhraseCardBatchResponse, status_code=201)
 async def create_phrase_cards_batch(
-    phrase_cards_in: list[PhraseCardCreate],
+    phrase_cards_in: list[PhraseCardCreate] = Body(..., min_length=1, max_length=settings.BATCH_CREATE_MAX_ITEMS),
     db: AsyncSession = Depends(get_db),
 ):
     """
     批量创建短语卡片
 
     一次性为视频添加多个短语卡片。
+
+    - 按 (video_id, phrase) 自然键 upsert：已存在的短语更新内容，不存在的新建，重复导入同一视频是幂等的
+    - 每块一条 INSERT ... ON CONFLICT DO UPDATE ... RETURNING 语句；同一批内重复的短语以最后一条为准
+    - 返回 inserted / updated 计数
+    - 单次最多 BATCH_CREATE_MAX_ITEMS 条，超出返回 422
     """
-    phrase_cards = [PhraseCard(**pc.model_dump()) for pc in phrase_cards_in]
-    db.add_all(phrase_cards)
+    phrase_cards, inserted = await upsert_returning(
+        db, PhraseCard, [pc.model_dump() for pc in phrase_cards_in], ("video_id", "phrase")
+    )
+    await bump_content_version(db, *{pc.video_id for pc in phrase_cards_in})
     await db.commit()
 
-    for phrase_card in phrase_cards:
-        await db.refresh(phrase_card)
-
-    return PhraseCardListResponse(total=len(phrase_cards), items=phrase_cards)
+    return PhraseCardBatchResponse(
+        total=len(phrase_cards), items=phrase_cards, inserted=inserted, updated=len(phrase_cards) - inserted
+    )
 
 
 @router.delete("/{phrase_card_id}", status_code=204)
@@ -102,5 +121,6 @@ async def delete_phrase_card(
         raise HTTPException(status_code=404, detail="短语卡片不存在")
 
     await db.delete(phrase_card)
+    await bump_content_version(db, phrase_card.video_id)
     await db.commit()
     return None
@@ -1,16 +1,57 @@
+import re
+from decimal import Decimal, InvalidOperation
 from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Body, Depends, File, HTTPException, Query, Request, Response, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func, insert, literal, null, tuple_
+from sqlalchemy.orm import aliased
 
 from app.auth import fastapi_users, current_user_optional
+from app.core.config import settings
 from app.core.database import get_db
 from app.dependencies import get_accessible_video
 from app.models.subtitle import Subtitle
+from app.models.subtitle_lemma import SubtitleLemma
 from app.models.user import User
 from app.models.video import Video
-from app.schemas import SubtitleCreate, SubtitleResponse, SubtitleListResponse
+from app.schemas import (
+    SubtitleBase,
+    SubtitleCreate,
+    SubtitleResponse,
+    SubtitleListResponse,
+    SubtitleReplaceResponse,
+    SubtitleUploadResponse,
+    SubtitleSearchItem,
+    SubtitleSearchResponse,
+    SubtitleConcordanceItem,
+    SubtitleConcordanceResponse,
+)
+from app.services.bulk_insert import insert_returning
+from app.services.content_version import bump_content_version
+from app.services.subtitle_cache import subtitle_cache
+from app.services.subtitle_replace import replace_subtitles
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.serialization import json_bytes
+from app.utils.streaming import iter_lines, iter_upload
+from app.utils.subtitle_formats import (
+    SubtitleParseError,
+    columnar,
+    contains_cjk,
+    iter_srt,
+    iter_webvtt,
+    merge_translation,
+    parse_cues,
+)
+from app.utils.http_cache import (
+    accepts_gzip,
+    cache_control,
+    is_not_modified,
+    not_modified_response,
+    validator_headers,
+    version_etag,
+)
 
 router = APIRouter()
 
@@ -19,9 +60,99 @@ current_user = fastapi_users.current_user(active=True)
 current_superuser = fastapi_users.current_user(active=True, superuser=True)
 
 
+def _subtitle_cursor_condition(cursor: str):
+    """根据游标构造 (start_time, id) 升序的 keyset 条件"""
+    start_time, subtitle_id = decode_cursor(cursor, 2)
+    try:
+        key = (Decimal(start_time), int(subtitle_id))
+    except (TypeError, ValueError, InvalidOperation) as exc:
+        raise ValueError("无效的分页游标") from exc
+    return tuple_(Subtitle.start_time, Subtitle.id) > key
+
+
+def _window_start_condition(video_id: UUID, from_time: float):
+    """
+    时间窗口起点：从 from 时刻正在播放的那一行开始
+
+    用 (video_id, start_time) 索引反向取最后一条 start_time <= from 的字幕作为下界，
+    避免对 end_time 做无索引的范围过滤；from 之前没有字幕时退化为 start_time >= from。
+    """
+    earlier = aliased(Subtitle)
+    playing_start = (
+        select(func.max(earlier.start_time))
+        .where(earlier.video_id == video_id, earlier.start_time <= from_time)
+        .scalar_subquery()
+    )
+    return (
+        Subtitle.start_time >= func.coalesce(playing_start, literal(from_time, Subtitle.start_time.type)),
+        Subtitle.end_time > from_time,
+    )
+
+
+async def _full_subtitles_response(request: Request, video: Video, headers: dict, db: AsyncSession) -> Response:
+    """完整字幕列表：优先使用按内容版本缓存的压缩响应体"""
+    payload = subtitle_cache.get(video.id, video.content_version)
+    if payload is None:
+        result = await db.execute(
+            select(Subtitle)
+            .where(Subtitle.video_id == video.id)
+            .order_by(Subtitle.start_time, Subtitle.id)
+        )
+        subtitles = result.scalars().all()
+        body = SubtitleListResponse(total=len(subtitles), items=subtitles).model_dump_json()
+        payload = subtitle_cache.put(video.id, video.content_version, body.encode("utf-8"))
+
+    use_gzip = accepts_gzip(request)
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+    return Response(content=payload.body(use_gzip), media_type="application/json", headers=headers)
+
+
+def _windowed_query(stmt, video_id: UUID, from_time: Optional[float], to_time: Optional[float], cursor: Optional[str]):
+    """在字幕查询上叠加时间窗口与游标条件，并按 (start_time, id) 排序"""
+    stmt = stmt.where(Subtitle.video_id == video_id)
+    if from_time is not None:
+        stmt = stmt.where(*_window_start_condition(video_id, from_time))
+    if to_time is not None:
+        stmt = stmt.where(Subtitle.start_time < to_time)
+    if cursor:
+        try:
+            stmt = stmt.where(_subtitle_cursor_condition(cursor))
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return stmt.order_by(Subtitle.start_time, Subtitle.id)
+
+
+# 字幕输出格式：format 参数优先，其次 Accept 头
+_FORMAT_MEDIA_TYPES = {
+    "columnar": "application/vnd.subtitles.columnar+json",
+    "vtt": "text/vtt",
+    "srt": "application/x-subrip",
+}
+
+
+def _negotiate_format(request: Request, output_format: Optional[str]) -> str:
+    if output_format:
+        return output_format
+    accept = request.headers.get("accept", "")
+    for fmt, media_type in _FORMAT_MEDIA_TYPES.items():
+        if media_type in accept:
+            return fmt
+    return "json"
+
+
 @router.get("/", response_model=SubtitleListResponse)
 async def get_subtitles(
+    request: Request,
     video: Video = Depends(get_accessible_video),
+    from_time: Optional[float] = Query(None, alias="from", ge=0, description="时间窗口起点（秒）"),
+    to_time: Optional[float] = Query(None, alias="to", ge=0, description="时间窗口终点（秒，不含）"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="每次返回条数，不传则返回全部"),
+    cursor: Optional[str] = Query(None, description="分页游标（上一次返回的 next_cursor）"),
+    output_format: Optional[str] = Query(
+        None, alias="format", pattern="^(json|columnar|vtt|srt)$", description="输出格式: json/columnar/vtt/srt"
+    ),
+    user: Optional[User] = Depends(current_user_optional),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -29,20 +160,291 @@ async def get_subtitles(
 
     - **video_id**: 视频 UUID（通过查询参数传递）
     - 按时间顺序返回
+    - 不带窗口 / 分页参数时返回完整字幕（用于下载）
+
+    **时间窗口与分段拉取**（长视频播放器按播放位置增量加载）:
+    - **from** / **to**: 只返回与 [from, to) 重叠的字幕，包含 from 时刻正在播放的那一行
+    - **limit** + **cursor**: 按时间顺序分页，响应中的 next_cursor 用于拉取下一段，为 null 表示已到末尾
+
+    **输出格式**（format 参数或 Accept 头）:
+    - **json**（默认）: SubtitleListResponse
+    - **columnar**（application/vnd.subtitles.columnar+json）: 并行数组
+      `{"video_id", "total", "id", "start", "end", "en", "zh", "word_refs", "next_cursor"}`，
+      不再逐行重复键名、video_id 和 created_at
+    - **vtt**（text/vtt）/ **srt**（application/x-subrip）: 从数据库游标流式导出，支持 from / to，不支持分页参数
 
     **访问控制**:
     - 免费视频：任何人都可以访问字幕
     - 付费视频：需要登录才能访问字幕
     - 子视频继承父视频的权限设置
+
+    **条件请求**:
+    - 响应带 ETag / Last-Modified（基于视频的内容版本），支持 If-None-Match / If-Modified-Since
+    - 内容未变化时返回 304，不查询字幕
+
+    **响应缓存**:
+    - 完整字幕列表（json 格式）按 (视频, 内容版本) 缓存 gzip 压缩后的响应体，命中时不查询字幕表
     """
-    result = await db.execute(
-        select(Subtitle)
-        .where(Subtitle.video_id == video.id)
-        .order_by(Subtitle.start_time)
+    if from_time is not None and to_time is not None and to_time <= from_time:
+        raise HTTPException(status_code=400, detail="to 必须大于 from")
+    fmt = _negotiate_format(request, output_format)
+    if fmt in ("vtt", "srt") and (limit or cursor):
+        raise HTTPException(status_code=400, detail="字幕导出格式不支持分页参数")
+
+    etag = version_etag("subtitles", video.id, video.content_version, fmt)
+    headers = validator_headers(
+        etag, video.content_updated_at, cache_control(user is None and video.is_free)
     )
-    subtitles = result.scalars().all()
+    headers["Vary"] = "Authorization, Accept, Accept-Encoding"
+    if is_not_modified(request, etag, video.content_updated_at):
+        return not_modified_response(headers)
 
-    return SubtitleListResponse(total=len(subtitles), items=subtitles)
+    if fmt in ("vtt", "srt"):
+        stmt = _windowed_query(
+            select(Subtitle.start_time, Subtitle.end_time, Subtitle.english_text, Subtitle.chinese_text),
+            video.id, from_time, to_time, None,
+        )
+        # 服务端游标分批读取，边读边写，不在内存中拼接完整字幕
+        rows = await db.stream(stmt.execution_options(yield_per=500))
+        lines = iter_webvtt(rows) if fmt == "vtt" else iter_srt(rows)
+        headers["Content-Disposition"] = f'attachment; filename="{video.id}.{fmt}"'
+        return StreamingResponse(
+            lines, media_type=f"{_FORMAT_MEDIA_TYPES[fmt]}; charset=utf-8", headers=headers
+        )
+
+    if fmt == "json" and from_time is None and to_time is None and limit is None and not cursor:
+        return await _full_subtitles_response(request, video, headers, db)
+
+    if fmt == "columnar":
+        stmt = select(
+            Subtitle.id, Subtitle.start_time, Subtitle.end_time,
+            Subtitle.english_text, Subtitle.chinese_text, Subtitle.word_refs,
+        )
+    else:
+        stmt = select(Subtitle)
+    stmt = _windowed_query(stmt, video.id, from_time, to_time, cursor)
+    if limit:
+        # 多取一条用于判断是否还有下一段
+        stmt = stmt.limit(limit + 1)
+
+    result = await db.execute(stmt)
+    rows = result.all() if fmt == "columnar" else result.scalars().all()
+
+    next_cursor = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([str(last.start_time), last.id])
+
+    if fmt == "columnar":
+        body = json_bytes({
+            "video_id": video.id,
+            "total": len(rows),
+            **columnar(rows),
+            "next_cursor": next_cursor,
+        })
+        return Response(content=body, media_type=_FORMAT_MEDIA_TYPES["columnar"], headers=headers)
+
+    body = SubtitleListResponse(total=len(rows), items=rows, next_cursor=next_cursor).model_dump_json()
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# 英文命中片段：只截取命中附近的若干词
+_HEADLINE_OPTIONS = "StartSel=<em>, StopSel=</em>, MaxWords=30, MinWords=10, MaxFragments=1"
+
+
+def _highlight_substring(text: Optional[str], keyword: str) -> str:
+    """中文命中片段：用 <em> 标出所有（不区分大小写的）关键词位置，与 ts_headline 的输出格式一致"""
+    if not text:
+        return ""
+    return re.sub(re.escape(keyword), lambda match: f"<em>{match.group(0)}</em>", text, flags=re.IGNORECASE)
+
+
+def _join_accessible_video(stmt, video_id_column, user: Optional[User]):
+    """
+    连接 videos 并只保留当前用户可访问的已发布视频
+
+    与 get_accessible_video 规则一致：免费视频公开，付费视频需登录，子视频继承父视频的 is_free；
+    父视频未发布时其下片段同样不可检索。
+    """
+    parent = aliased(Video)
+    stmt = (
+        stmt.join(Video, Video.id == video_id_column)
+        .outerjoin(parent, parent.id == Video.parent_id)
+        .where(Video.is_published.is_(True), func.coalesce(parent.is_published, True).is_(True))
+    )
+    if user is None:
+        stmt = stmt.where(func.coalesce(parent.is_free, Video.is_free).is_(True))
+    return stmt
+
+
+@router.get("/search", response_model=SubtitleSearchResponse)
+async def search_subtitles(
+    q: str = Query(..., min_length=2, max_length=200, description="搜索的句子或短语"),
+    limit: int = Query(20, ge=1, le=100, description="每页条数"),
+    cursor: Optional[str] = Query(None, description="分页游标（上一页返回的 next_cursor）"),
+    user: Optional[User] = Depends(current_user_optional),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    全库字幕检索 - 支持可选认证
+
+    例如搜索 "take it for granted"，返回所有说过这句话的片段。
+
+    - 英文按短语全文检索（english 词干化，taking / took 等词形都会命中），使用 search_vector GIN 索引
+    - 含中文的关键词对中文字幕做子串匹配，使用 chinese_text 的 pg_trgm 索引
+    - 只检索已发布视频（父视频未发布的片段也不检索）；未登录用户只能检索免费视频（子视频继承父视频的 is_free）
+    - 按字幕 ID 倒序（新导入的内容在前）做 keyset 分页，响应中的 next_cursor 用于翻页
+    - **highlight** 为命中片段，关键词用 <em></em> 包裹（原文不做 HTML 转义）
+    """
+    keyword = q.strip()
+    if len(keyword) < 2:
+        raise HTTPException(status_code=400, detail="搜索关键词至少 2 个字符")
+    # 含中日韩字符的关键词走中文字幕的 trigram 子串匹配，否则走英文全文检索
+    is_chinese = contains_cjk(keyword)
+
+    if is_chinese:
+        match = Subtitle.chinese_text.ilike(f"%{keyword}%")
+        highlight = null()
+    else:
+        ts_query = func.phraseto_tsquery("english", keyword)
+        match = Subtitle.search_vector.op("@@")(ts_query)
+        highlight = func.ts_headline("english", Subtitle.english_text, ts_query, _HEADLINE_OPTIONS)
+
+    stmt = (
+        select(
+            Subtitle.id,
+            Subtitle.video_id,
+            Subtitle.start_time,
+            Subtitle.end_time,
+            Subtitle.english_text,
+            Subtitle.chinese_text,
+            Video.title,
+            Video.title_zh,
+            Video.thumbnail_url,
+            highlight.label("highlight"),
+        )
+        .where(match)
+    )
+    stmt = _join_accessible_video(stmt, Subtitle.video_id, user)
+    if cursor:
+        try:
+            (last_id,) = decode_cursor(cursor, 1)
+            stmt = stmt.where(Subtitle.id < int(last_id))
+        except (TypeError, ValueError) as exc:
+            raise HTTPException(status_code=400, detail="无效的分页游标") from exc
+    stmt = stmt.order_by(Subtitle.id.desc()).limit(limit + 1)
+
+    result = await db.execute(stmt)
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1].id])
+
+    items = [
+        SubtitleSearchItem(
+            subtitle_id=row.id,
+            video_id=row.video_id,
+            video_title=row.title,
+            video_title_zh=row.title_zh,
+            thumbnail_url=row.thumbnail_url,
+            start_time=row.start_time,
+            end_time=row.end_time,
+            english_text=row.english_text,
+            chinese_text=row.chinese_text,
+            highlight=(
+                _highlight_substring(row.chinese_text, keyword) if is_chinese else row.highlight
+            ),
+        )
+        for row in rows
+    ]
+    return SubtitleSearchResponse(items=items, next_cursor=next_cursor)
+
+
+@router.get("/concordance", response_model=SubtitleConcordanceResponse)
+async def get_lemma_concordance(
+    lemma: str = Query(..., min_length=1, max_length=100, description="单词原形，如 clean"),
+    limit: int = Query(20, ge=1, le=100, description="每页条数"),
+    cursor: Optional[str] = Query(None, description="分页游标（上一页返回的 next_cursor）"),
+    user: Optional[User] = Depends(current_user_optional),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    按单词原形查询所有出现过该词的字幕片段 - 支持可选认证
+
+    例如 lemma=clean 返回包含 clean / cleaner / cleanest / cleaning 等词形的全部字幕。
+
+    - 查询 subtitle_lemmas 倒排索引（由字幕 word_refs 经触发器维护），不扫描 JSONB
+    - **forms** 为该字幕中实际出现的词形
+    - 访问控制与全库字幕检索相同；按字幕 ID 倒序做 keyset 分页
+    """
+    key = lemma.strip().lower()
+    if not key:
+        raise HTTPException(status_code=400, detail="单词不能为空")
+
+    stmt = (
+        select(
+            SubtitleLemma.subtitle_id,
+            SubtitleLemma.video_id,
+            SubtitleLemma.start_time,
+            SubtitleLemma.forms,
+            Subtitle.end_time,
+            Subtitle.english_text,
+            Subtitle.chinese_text,
+            Video.title,
+            Video.title_zh,
+            Video.thumbnail_url,
+        )
+        .join(Subtitle, Subtitle.id == SubtitleLemma.subtitle_id)
+        .where(SubtitleLemma.lemma == key)
+    )
+    stmt = _join_accessible_video(stmt, SubtitleLemma.video_id, user)
+    if cursor:
+        try:
+            (last_id,) = decode_cursor(cursor, 1)
+            stmt = stmt.where(SubtitleLemma.subtitle_id < int(last_id))
+        except (TypeError, ValueError) as exc:
+            raise HTTPException(status_code=400, detail="无效的分页游标") from exc
+    stmt = stmt.order_by(SubtitleLemma.subtitle_id.desc()).limit(limit + 1)
+
+    result = await db.execute(stmt)
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1].subtitle_id])
+
+    items = [
+        SubtitleConcordanceItem(
+            subtitle_id=row.subtitle_id,
+            video_id=row.video_id,
+            video_title=row.title,
+            video_title_zh=row.title_zh,
+            thumbnail_url=row.thumbnail_url,
+            start_time=row.start_time,
+            end_time=row.end_time,
+            english_text=row.english_text,
+            chinese_text=row.chinese_text,
+            forms=row.forms,
+        )
+        for row in rows
+    ]
+    return SubtitleConcordanceResponse(lemma=key, items=items, next_cursor=next_cursor)
+
+
+@router.get("/cache/stats")
+async def get_subtitle_cache_stats(
+    _user: User = Depends(current_superuser),
+):
+    """
+    字幕响应缓存统计（当前 worker）
+
+    返回条目数、压缩后 / 原始字节数、命中 / 未命中 / 淘汰次数和命中率。
+    """
+    return subtitle_cache.stats()
 
 
 @router.post("/", response_model=SubtitleResponse, status_code=201)
@@ -58,32 +460,123 @@ async def create_subtitle(
     """
     subtitle = Subtitle(**subtitle_in.model_dump())
     db.add(subtitle)
+    await bump_content_version(db, subtitle.video_id)
     await db.commit()
+    subtitle_cache.invalidate(subtitle.video_id)
     await db.refresh(subtitle)
     return subtitle
 
 
 @router.post("/batch", response_model=SubtitleListResponse, status_code=201)
 async def create_subtitles_batch(
-    subtitles_in: list[SubtitleCreate],
+    subtitles_in: list[SubtitleCreate] = Body(..., min_length=1, max_length=settings.BATCH_CREATE_MAX_ITEMS),
     db: AsyncSession = Depends(get_db),
 ):
     """
     批量创建字幕
 
     一次性为视频添加多条字幕。
+
+    - 单条多行 INSERT ... RETURNING 写入，大批量自动分块
+    - 单次最多 BATCH_CREATE_MAX_ITEMS 条，超出返回 422
     """
-    subtitles = [Subtitle(**s.model_dump()) for s in subtitles_in]
-    db.add_all(subtitles)
+    subtitles = await insert_returning(db, Subtitle, [s.model_dump() for s in subtitles_in])
+    video_ids = {s.video_id for s in subtitles_in}
+    await bump_content_version(db, *video_ids)
     await db.commit()
-
-    # 刷新所有对象
-    for subtitle in subtitles:
-        await db.refresh(subtitle)
+    subtitle_cache.invalidate(*video_ids)
 
     return SubtitleListResponse(total=len(subtitles), items=subtitles)
 
 
+@router.post("/upload", response_model=SubtitleUploadResponse, status_code=201)
+async def upload_subtitles(
+    video_id: UUID = Query(..., description="视频 ID"),
+    file: UploadFile = File(..., description="SRT / WebVTT 字幕文件（UTF-8），可为中英双语"),
+    translation: Optional[UploadFile] = File(None, description="可选：独立的中文字幕文件，按开始时间与英文字幕配对"),
+    db: AsyncSession = Depends(get_db),
+    _user: User = Depends(current_superuser),
+):
+    """
+    上传 SRT / WebVTT 字幕文件
+
+    - 按行流式解析并按 SUBTITLE_UPLOAD_CHUNK_SIZE 条分块批量写入，内存占用与文件大小无关
+    - 同一字幕块内的中文行写入 chinese_text，其余行写入 english_text
+    - 也可另传 translation 中文字幕文件，按开始时间（误差 0.5 秒内）配对
+    - 只用于首次导入：视频已有字幕时返回 409，修订请使用 PUT 整体替换
+    - 全部写入在一个事务中完成，文件格式错误时整体回滚并返回出错行号
+    """
+    video = await db.get(Video, video_id)
+    if video is None:
+        raise HTTPException(status_code=404, detail="视频不存在")
+    existing = await db.execute(select(Subtitle.id).where(Subtitle.video_id == video_id).limit(1))
+    if existing.first() is not None:
+        raise HTTPException(status_code=409, detail="该视频已有字幕，请使用 PUT 接口整体替换")
+
+    cues = parse_cues(iter_lines(iter_upload(file)))
+    if translation is not None:
+        cues = merge_translation(cues, parse_cues(iter_lines(iter_upload(translation))))
+
+    total = 0
+    chunk = []
+    try:
+        async for cue in cues:
+            total += 1
+            chunk.append({
+                "video_id": video_id,
+                "start_time": cue.start_time,
+                "end_time": cue.end_time,
+                "english_text": cue.english_text,
+                "chinese_text": cue.chinese_text,
+                "sequence_number": total,
+                "word_refs": {},
+            })
+            if len(chunk) >= settings.SUBTITLE_UPLOAD_CHUNK_SIZE:
+                await db.execute(insert(Subtitle), chunk)
+                chunk = []
+        if chunk:
+            await db.execute(insert(Subtitle), chunk)
+    except (SubtitleParseError, UnicodeDecodeError) as exc:
+        await db.rollback()
+        detail = str(exc) if isinstance(exc, SubtitleParseError) else "字幕文件不是有效的 UTF-8 文本"
+        raise HTTPException(status_code=400, detail=detail) from exc
+
+    if total == 0:
+        raise HTTPException(status_code=400, detail="字幕文件中没有可导入的字幕")
+
+    await bump_content_version(db, video_id)
+    await db.commit()
+    subtitle_cache.invalidate(video_id)
+    return SubtitleUploadResponse(video_id=video_id, total=total)
+
+
+@router.put("/", response_model=SubtitleReplaceResponse)
+async def replace_video_subtitles(
+    video_id: UUID = Query(..., description="视频 ID"),
+    subtitles_in: list[SubtitleBase] = Body(..., max_length=settings.BATCH_CREATE_MAX_ITEMS),
+    db: AsyncSession = Depends(get_db),
+    _user: User = Depends(current_superuser),
+):
+    """
+    整体替换视频的字幕（重新导入 / 修订字幕用）
+
+    - 请求体为该视频的完整字幕列表，在一个事务中完成替换
+    - 已有字幕按 sequence_number 匹配（两侧都唯一时），其余按 start_time 匹配；
+      内容不变的行不写入，变化的行原地更新，字幕 ID 保持不变
+    - 新增的行批量插入，不再出现的行批量删除
+    - 被删除字幕上的单词卡、短语卡和用户收藏改挂到时间最近的字幕
+    - 返回 unchanged / updated / inserted / deleted 计数
+    """
+    video = await db.get(Video, video_id)
+    if video is None:
+        raise HTTPException(status_code=404, detail="视频不存在")
+
+    summary = await replace_subtitles(db, video_id, subtitles_in)
+    await db.commit()
+    subtitle_cache.invalidate(video_id)
+    return summary
+
+
 @router.delete("/{subtitle_id}", status_code=204)
 async def delete_subtitle(
     subtitle_id: int,  # 字幕 ID 是整型
@@ -100,5 +593,7 @@ async def delete_subtitle(
         raise HTTPException(status_code=404, detail="字幕不存在")
 
     await db.delete(subtitle)
+    await bump_content_version(db, subtitle.video_id)
     await db.commit()
+    subtitle_cache.invalidate(subtitle.video_id)
     return None
@@ -1,17 +1,43 @@
+from datetime import datetime
 from typing import Optional, List
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
-from sqlalchemy import func as sql_func, text, select, delete, or_
+from sqlalchemy.orm import selectinload, aliased
+from sqlalchemy.dialects.postgresql import JSON, aggregate_order_by
+from sqlalchemy import func as sql_func, select, delete, or_, case, tuple_
 
 from app.auth import fastapi_users, current_user_optional
 from app.core.database import get_db
-from app.models.tag import Tag
+from app.models.tag import Tag, DEFAULT_TAG_TYPE
 from app.models.user import User
 from app.models.video import Video
+from app.models.video_catalog_version import VideoCatalogVersion
 from app.models.video_tag import VideoTag
-from app.schemas import VideoCreate, VideoUpdate, VideoResponse, VideoListResponse, VideoDetailResponse, VideoBrief
+from app.schemas import (
+    VideoCreate,
+    VideoUpdate,
+    VideoResponse,
+    VideoListResponse,
+    VideoDetailResponse,
+    VideoBrief,
+    VideoImportResponse,
+)
+from app.services.group_progress import load_group_progress
+from app.services.video_facets import video_facets, facet_contribution
+from app.services.video_import import import_videos
+from app.utils.http_cache import (
+    cache_control,
+    cached_json_response,
+    etag_matches,
+    not_modified_response,
+    validator_headers,
+    version_etag,
+)
+from app.utils.normalize import normalize_names
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.serialization import json_bytes
+from app.utils.streaming import iter_lines
 
 router = APIRouter()
 
@@ -19,8 +45,6 @@ router = APIRouter()
 current_user = fastapi_users.current_user(active=True)
 current_superuser = fastapi_users.current_user(active=True, superuser=True)
 
-DEFAULT_TAG_TYPE = "topic"
-
 
 def _ensure_https_url(url: Optional[str]) -> Optional[str]:
     """确保 URL 包含 https:// 前缀"""
@@ -31,25 +55,6 @@ def _ensure_https_url(url: Optional[str]) -> Optional[str]:
     return f'https://{url}'
 
 
-def _normalize_names(values: Optional[List[str]]) -> List[str]:
-    if not values:
-        return []
-    normalized = []
-    seen = set()
-    for value in values:
-        if not value or not isinstance(value, str):
-            continue
-        name = value.strip()
-        if not name:
-            continue
-        key = name.lower()
-        if key in seen:
-            continue
-        seen.add(key)
-        normalized.append(name)
-    return normalized
-
-
 async def _upsert_tags(db: AsyncSession, tag_names: List[str]) -> List[Tag]:
     if not tag_names:
         return []
@@ -72,7 +77,7 @@ async def _set_video_tags(
 ) -> Optional[List[str]]:
     if tags is None:
         return None
-    normalized = _normalize_names(tags)
+    normalized = normalize_names(tags)
     await db.execute(delete(VideoTag).where(VideoTag.video_id == video.id))
     if not normalized:
         return []
@@ -86,7 +91,7 @@ def _get_video_tags(video: Video) -> List[str]:
     return [vt.tag.name for vt in video.video_tags if vt.tag]
 
 
-def _video_to_dict(video: Video, segment_count: int = 0, tags: Optional[List[str]] = None) -> dict:
+def _video_to_dict(video: Video, tags: Optional[List[str]] = None) -> dict:
     return {
         'id': video.id,
         'title': video.title,
@@ -112,45 +117,142 @@ def _video_to_dict(video: Video, segment_count: int = 0, tags: Optional[List[str
         'parent_id': video.parent_id,
         'segment_index': video.segment_index,
         'video_type': video.video_type or 'full',
-        'segment_count': segment_count,
+        'segment_count': video.segment_count or 0,
         'created_at': video.created_at,
         'updated_at': video.updated_at,
     }
 
 
-async def _add_segment_count(videos: List[Video], db: AsyncSession) -> List[dict]:
-    """为视频列表添加 segment_count 字段"""
-    if not videos:
-        return []
-
-    # 获取所有视频组的 ID
-    group_ids = [v.id for v in videos if v.video_type == 'group']
+def _apply_search(query, keyword: str):
+    """
+    为查询添加搜索条件，返回 (query, rank)
 
-    # 批量查询每个视频组的子视频数量
-    segment_counts = {}
-    if group_ids:
-        result = await db.execute(
-            select(
-                Video.parent_id,
-                sql_func.count(Video.id).label('count')
-            ).where(
-                Video.parent_id.in_(group_ids)
-            ).group_by(Video.parent_id)
+    - 英文走 search_vector 全文检索（词干化，如 running 命中 run）
+    - 中文及任意子串走 search_text 的 pg_trgm 索引（ILIKE）
+    - rank 用于相关度排序，标题命中额外加权
+    """
+    ts_query = sql_func.websearch_to_tsquery("english", keyword)
+    pattern = f"%{keyword}%"
+    query = query.where(
+        or_(
+            Video.search_vector.op("@@")(ts_query),
+            Video.search_text.ilike(pattern),
         )
-        counts = result.all()
-
-        segment_counts = {str(parent_id): count for parent_id, count in counts}
+    )
+    rank = sql_func.ts_rank_cd(Video.search_vector, ts_query) + case(
+        (or_(Video.title.ilike(pattern), Video.title_zh.ilike(pattern)), 1.0),
+        else_=0.0,
+    )
+    return query, rank
+
+
+VIDEO_LIST_FIELDS = list(VideoResponse.model_fields)
+VIDEO_CARD_FIELDS = [
+    "id",
+    "title",
+    "title_zh",
+    "thumbnail_url",
+    "duration",
+    "difficulty",
+    "original_author",
+    "author_avatar_url",
+    "is_free",
+    "video_type",
+    "segment_count",
+]
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """解析 fields 参数，返回字段列表（id 始终在首位）；未指定时返回 None"""
+    if not fields or not fields.strip():
+        return None
+    names = ["id"]
+    for name in fields.split(","):
+        name = name.strip()
+        if not name:
+            continue
+        expanded = VIDEO_CARD_FIELDS if name == "card" else [name]
+        for item in expanded:
+            if item not in VIDEO_LIST_FIELDS:
+                raise ValueError(f"不支持的字段: {item}")
+            if item not in names:
+                names.append(item)
+    return names
+
+
+def _tag_names_subquery():
+    """视频标签名数组（相关子查询）"""
+    return (
+        select(sql_func.array_agg(Tag.name))
+        .select_from(VideoTag)
+        .join(Tag, Tag.id == VideoTag.tag_id)
+        .where(VideoTag.video_id == Video.id)
+        .scalar_subquery()
+    )
 
-    # 构造响应
-    result = []
-    for video in videos:
-        result.append(_video_to_dict(video, segment_counts.get(str(video.id), 0)))
 
-    return result
+def _projection_columns(field_names: List[str]) -> list:
+    """稀疏字段集对应的查询列（额外包含游标分页所需的排序键）"""
+    columns = {}
+    for name in field_names + ["display_order", "created_at"]:
+        if name == "tags":
+            columns[name] = _tag_names_subquery().label("tags")
+        elif name in ("categories", "categories_zh"):
+            columns["categories"] = Video.categories
+            columns["categories_zh"] = Video.categories_zh
+        else:
+            columns[name] = getattr(Video, name)
+    return list(columns.values())
+
+
+def _project_row(row, field_names: List[str]) -> dict:
+    data = row._mapping
+    item = {}
+    for name in field_names:
+        if name == "categories":
+            item[name] = data["categories_zh"] or data["categories"] or []
+        elif name in ("categories_zh", "tags"):
+            item[name] = data[name] or []
+        elif name in ("thumbnail_url", "author_avatar_url"):
+            item[name] = _ensure_https_url(data[name])
+        elif name == "video_type":
+            item[name] = data[name] or "full"
+        elif name == "segment_count":
+            item[name] = data[name] or 0
+        else:
+            item[name] = data[name]
+    return item
+
+
+def _catalog_cursor_condition(cursor: str):
+    """根据游标构造 (display_order, created_at, id) 降序的 keyset 条件"""
+    display_order, created_at, video_id = decode_cursor(cursor, 3)
+    try:
+        key = (int(display_order), datetime.fromisoformat(created_at), UUID(video_id))
+    except (TypeError, ValueError) as exc:
+        raise ValueError("无效的分页游标") from exc
+    return tuple_(Video.display_order, Video.created_at, Video.id) < key
+
+
+def _catalog_version_subquery():
+    return select(VideoCatalogVersion.version).scalar_subquery()
+
+
+async def _catalog_version(db: AsyncSession) -> int:
+    return await db.scalar(select(VideoCatalogVersion.version)) or 0
+
+
+def _catalog_etag(version: int, user: Optional[User], *parts) -> str:
+    """
+    视频列表 / 详情的 ETag：由目录版本派生（目录表任意写入提交后版本递增），
+    区分匿名与登录用户（两者可见的视频与访问权限不同）
+    """
+    return version_etag("videos", version, "anon" if user is None else "user", *parts)
 
 
 @router.get("/", response_model=VideoListResponse)
 async def get_videos(
+    request: Request,
     skip: int = Query(0, ge=0, description="跳过记录数"),
     limit: int = Query(20, ge=1, le=100, description="每页记录数"),
     search: Optional[str] = Query(None, description="搜索关键词（标题、作者、分类）"),
@@ -161,6 +263,9 @@ async def get_videos(
     original_author: Optional[str] = Query(None, description="按原作者/频道筛选"),
     min_duration: Optional[int] = Query(None, ge=0, description="最小时长（秒）"),
     max_duration: Optional[int] = Query(None, ge=0, description="最大时长（秒）"),
+    cursor: Optional[str] = Query(None, description="分页游标（上一页返回的 next_cursor）"),
+    include_total: bool = Query(True, description="是否返回总数"),
+    fields: Optional[str] = Query(None, description="返回字段，逗号分隔；card 表示卡片精简字段"),
     db: AsyncSession = Depends(get_db),
     user: Optional[User] = Depends(current_user_optional),
 ):
@@ -169,7 +274,7 @@ async def get_videos(
 
     - **skip**: 跳过记录数（分页）
     - **limit**: 每页记录数
-    - **search**: 搜索关键词，匹配标题、描述、作者、分类
+    - **search**: 搜索关键词，匹配标题、描述、作者、分类，结果按相关度排序
     - **difficulty**: 难度筛选（beginner/intermediate/advanced）
     - **is_published**: 是否只显示已发布的视频
     - **video_type**: 视频类型筛选（full/segment/group）
@@ -177,6 +282,18 @@ async def get_videos(
     - **original_author**: 按原作者/频道筛选
     - **min_duration**: 最小时长（秒）
     - **max_duration**: 最大时长（秒）
+    - **cursor**: 游标分页，传入上一页的 next_cursor，此时忽略 skip
+    - **include_total**: 为 false 时不计算总数（total 返回 null）
+    - **fields**: 稀疏字段集，如 `fields=card` 或 `fields=title,thumbnail_url,tags`
+
+    **稀疏字段集**:
+    - 指定 fields 后只查询并返回所需列（id 总会返回），不加载描述等大字段
+    - `card` 为列表卡片所需字段：id, title, title_zh, thumbnail_url, duration, difficulty, original_author, author_avatar_url, is_free, video_type, segment_count
+
+    **游标分页**:
+    - 默认排序下，若还有下一页，响应会带上 next_cursor
+    - 无限滚动场景建议使用 cursor + include_total=false，每页开销恒定
+    - 搜索结果（按相关度排序）和片段列表不支持游标分页
 
     **访问控制**:
     - 未认证用户：默认只返回已发布的视频
@@ -185,7 +302,20 @@ async def get_videos(
 
     默认只返回主视频（full 和 group），不返回片段（segment）。
     返回的视频包含 is_free 字段，前端可根据此字段显示锁图标。
+    响应带 ETag，支持 If-None-Match 条件请求（未变化时返回 304）。
     """
+    try:
+        field_names = _parse_fields(fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    # 先读目录版本：客户端缓存仍有效时直接返回 304，不执行列表查询与序列化。
+    # 版本在查询之前读取，即使期间有写入提交也只会多返回一次 200，不会返回过期的 304
+    etag = _catalog_etag(await _catalog_version(db), user)
+    headers = validator_headers(etag, cache_control=cache_control(user is None))
+    if etag_matches(request, etag):
+        return not_modified_response(headers)
+
     query = select(Video)
 
     # 发布状态筛选
@@ -199,33 +329,10 @@ async def get_videos(
         # 明确指定了 is_published 参数
         query = query.where(Video.is_published == is_published)
 
-    # 搜索功能
+    # 搜索功能：全文检索 + trigram 子串匹配，均走 GIN 索引
+    rank = None
     if search and search.strip():
-        search_pattern = f"%{search.strip()}%"
-        # 构建搜索条件：匹配标题、描述、作者
-        search_conditions = [
-            Video.title.ilike(search_pattern),
-            Video.title_zh.ilike(search_pattern),
-            Video.description.ilike(search_pattern),
-            Video.description_zh.ilike(search_pattern),
-            Video.original_author.ilike(search_pattern),
-        ]
-
-        # 搜索分类（JSONB 数组）
-        # 使用 JSONB 的 @> 操作符检查数组是否包含元素
-        try:
-            # 尝试匹配完整的分类名称
-            search_conditions.append(
-                Video.categories.cast(text("text")).ilike(search_pattern)
-            )
-            search_conditions.append(
-                Video.categories_zh.cast(text("text")).ilike(search_pattern)
-            )
-        except Exception:
-            # 如果转换失败，忽略分类搜索
-            pass
-
-        query = query.where(or_(*search_conditions))
+        query, rank = _apply_search(query, search.strip())
 
     # 筛选条件
     if difficulty:
@@ -245,66 +352,90 @@ async def get_videos(
     if not video_type and not parent_id:
         query = query.where(Video.video_type != 'segment')
 
-    # 总数
-    total_result = await db.execute(
-        select(sql_func.count()).select_from(query.subquery())
-    )
-    total = total_result.scalar_one()
+    # 游标分页仅适用于默认排序（display_order, created_at, id）
+    keyset = not parent_id and rank is None
+    if cursor:
+        if not keyset:
+            raise HTTPException(status_code=400, detail="搜索结果和片段列表不支持游标分页")
+        try:
+            query = query.where(_catalog_cursor_condition(cursor))
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    # 总数（可选，滚动加载时可关闭以省去一次全量计数）
+    total = None
+    if include_total:
+        total_result = await db.execute(
+            select(sql_func.count()).select_from(query.subquery())
+        )
+        total = total_result.scalar_one()
 
-    # 分页和排序
+    # 分页和排序：多取一条用于判断是否还有下一页
     if parent_id:
         # 如果是查询片段，按 segment_index 排序
-        stmt = query.options(
-            selectinload(Video.video_tags).selectinload(VideoTag.tag)
-        ).order_by(Video.segment_index.asc()).offset(skip).limit(limit)
+        order_by = [Video.segment_index.asc()]
     else:
-        stmt = query.options(
-            selectinload(Video.video_tags).selectinload(VideoTag.tag)
-        ).order_by(Video.display_order.desc(), Video.created_at.desc()).offset(skip).limit(limit)
+        order_by = [Video.display_order.desc(), Video.created_at.desc(), Video.id.desc()]
+        if rank is not None:
+            # 搜索时按相关度优先排序
+            order_by.insert(0, rank.desc())
+
+    if field_names:
+        # 列投影：只查询所需列，返回 Row 而非 ORM 对象
+        stmt = query.with_only_columns(*_projection_columns(field_names))
+    else:
+        stmt = query.options(selectinload(Video.video_tags).selectinload(VideoTag.tag))
+    stmt = stmt.order_by(*order_by).limit(limit + 1)
+    if not cursor:
+        stmt = stmt.offset(skip)
     result = await db.execute(stmt)
-    videos = result.scalars().all()
+    rows = result.all() if field_names else result.scalars().all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = None
+    if keyset and has_more and rows:
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            [last.display_order, last.created_at.isoformat(), str(last.id)]
+        )
 
-    # 添加 segment_count 字段
-    items = await _add_segment_count(videos, db)
+    if field_names:
+        # 精简响应直接序列化，跳过 Pydantic 模型校验
+        items = [_project_row(row, field_names) for row in rows]
+        body = json_bytes({"total": total, "items": items, "next_cursor": next_cursor})
+    else:
+        # segment_count 已冗余存储在 videos 表中，无需额外查询
+        items = [_video_to_dict(video) for video in rows]
+        body = VideoListResponse(total=total, items=items, next_cursor=next_cursor).model_dump_json().encode()
 
-    return VideoListResponse(total=total, items=items)
+    return cached_json_response(request, body, etag, cache_control(user is None))
 
 
 @router.get("/categories", response_model=List[str])
 async def get_video_categories(
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
     """
     获取所有视频分类（去重）- 公开接口
+
+    由内存分面缓存提供，支持 ETag / If-None-Match 条件请求。
     """
-    result = await db.execute(text("""
-        SELECT DISTINCT jsonb_array_elements_text(
-            CASE
-                WHEN categories_zh IS NULL OR jsonb_array_length(categories_zh) = 0
-                THEN categories
-                ELSE categories_zh
-            END
-        ) AS category
-        FROM videos
-        WHERE (categories IS NOT NULL AND jsonb_array_length(categories) > 0)
-           OR (categories_zh IS NOT NULL AND jsonb_array_length(categories_zh) > 0)
-    """))
-    rows = result.all()
-
-    categories = sorted(
-        {row[0].strip() for row in rows if row[0] and row[0].strip()},
-        key=str.lower,
-    )
-    return categories
+    body, etag = await video_facets.categories(db)
+    return cached_json_response(request, body, etag, cache_control(True))
 
 
 @router.get("/authors", response_model=List[dict])
 async def get_video_authors(
+    request: Request,
     db: AsyncSession = Depends(get_db),
 ):
     """
     获取所有视频作者/频道列表（去重）- 公开接口
 
+    由内存分面缓存提供，支持 ETag / If-None-Match 条件请求。
+
     返回格式：
     [
         {
@@ -314,34 +445,86 @@ async def get_video_authors(
         }
     ]
     """
-    result = await db.execute(text("""
-        SELECT
-            original_author,
-            author_avatar_url,
-            COUNT(*) as video_count
-        FROM videos
-        WHERE original_author IS NOT NULL
-          AND original_author != ''
-          AND video_type != 'segment'
-        GROUP BY original_author, author_avatar_url
-        ORDER BY video_count DESC, original_author ASC
-    """))
-    rows = result.all()
-
-    authors = [
-        {
-            "name": row[0],
-            "avatar_url": row[1],
-            "video_count": row[2]
-        }
-        for row in rows
+    body, etag = await video_facets.authors(db)
+    return cached_json_response(request, body, etag, cache_control(True))
+
+
+async def _load_video_detail(db: AsyncSession, condition, with_segments: bool = True):
+    """
+    单条语句加载视频详情所需的全部数据，返回 (video, access_is_free, tags, segments, catalog_version)
+
+    - 外连接父视频，取其 is_free 作为访问控制依据（子视频继承父视频权限）
+    - 标签通过相关子查询 array_agg 聚合
+    - 片段通过相关子查询 json_agg 按 segment_index 聚合为简要信息
+    - 目录版本与数据取自同一快照，用于生成 ETag
+    视频不存在时返回 None。
+    """
+    parent = aliased(Video)
+    segment = aliased(Video)
+    columns = [
+        Video,
+        parent.is_free.label("parent_is_free"),
+        _tag_names_subquery().label("tag_names"),
+        _catalog_version_subquery().label("catalog_version"),
     ]
-    return authors
+    if with_segments:
+        segment_briefs = (
+            select(
+                sql_func.json_agg(
+                    aggregate_order_by(
+                        sql_func.json_build_object(
+                            "id", segment.id,
+                            "title", segment.title,
+                            "title_zh", segment.title_zh,
+                            "duration", segment.duration,
+                            "segment_index", segment.segment_index,
+                            "thumbnail_url", segment.thumbnail_url,
+                            "vod_file_id", segment.vod_file_id,
+                        ),
+                        segment.segment_index.asc(),
+                    ),
+                    type_=JSON,
+                )
+            )
+            .where(segment.parent_id == Video.id)
+            .scalar_subquery()
+        )
+        columns.append(segment_briefs.label("segments"))
+
+    result = await db.execute(
+        select(*columns)
+        .outerjoin(parent, parent.id == Video.parent_id)
+        .where(condition)
+    )
+    row = result.first()
+    if row is None:
+        return None
+
+    video = row[0]
+    access_is_free = row.parent_is_free if video.parent_id and row.parent_is_free is not None else video.is_free
+    segments = []
+    if with_segments:
+        segments = [
+            VideoBrief(**{**seg, "thumbnail_url": _ensure_https_url(seg["thumbnail_url"])})
+            for seg in row.segments or []
+        ]
+    return video, access_is_free, list(row.tag_names or []), segments, row.catalog_version or 0
+
+
+def _check_video_access(access_is_free: bool, user: Optional[User]) -> None:
+    # 付费视频需要登录
+    if not access_is_free and not user:
+        raise HTTPException(
+            status_code=401,
+            detail="该视频需要登录后观看，请先登录或注册"
+        )
 
 
 @router.get("/{video_id}", response_model=VideoDetailResponse)
 async def get_video(
+    request: Request,
     video_id: UUID,
+    include_progress: bool = Query(False, description="视频组是否附带当前用户的学习进度"),
     db: AsyncSession = Depends(get_db),
     user: Optional[User] = Depends(current_user_optional),
 ):
@@ -350,100 +533,46 @@ async def get_video(
 
     - **video_id**: 视频 UUID
     - 如果是视频组，会返回其下的所有片段列表
+    - **include_progress**: 为 true 且已登录时，视频组额外返回 progress（各片段与整体学习进度）
 
     **访问控制**:
     - 免费视频 (is_free=true): 任何人都可以访问
     - 付费视频 (is_free=false): 需要登录才能访问
     - 子视频继承父视频的权限设置
+
+    响应带 ETag，支持 If-None-Match 条件请求（未变化时返回 304，不执行详情查询）。
     """
-    result = await db.execute(
-        select(Video).where(Video.id == video_id)
-    )
-    video = result.scalars().first()
-    if not video:
+    # 带学习进度的响应因人而异，只能按响应内容生成 ETag
+    personalized = include_progress and user is not None
+    if not personalized and request.headers.get("if-none-match"):
+        etag = _catalog_etag(await _catalog_version(db), user, "detail")
+        if etag_matches(request, etag):
+            # 匿名用户只能拿到免费视频（付费返回 401），304 的缓存策略只取决于是否登录
+            return not_modified_response(validator_headers(etag, cache_control=cache_control(user is None)))
+
+    detail = await _load_video_detail(db, Video.id == video_id)
+    if detail is None:
         raise HTTPException(status_code=404, detail="视频不存在")
+    video, access_is_free, tags, segments, version = detail
 
     # 访问控制：如果是子视频，检查父视频的权限；否则检查自身权限
-    check_video = video
-    if video.parent_id:
-        parent_result = await db.execute(
-            select(Video).where(Video.id == video.parent_id)
-        )
-        parent_video = parent_result.scalars().first()
-        if parent_video:
-            check_video = parent_video
+    _check_video_access(access_is_free, user)
 
-    # 付费视频需要登录
-    if not check_video.is_free and not user:
-        raise HTTPException(
-            status_code=401,
-            detail="该视频需要登录后观看，请先登录或注册"
-        )
-
-    # 手动获取tags
-    tag_result = await db.execute(
-        select(Tag)
-        .join(VideoTag, VideoTag.tag_id == Tag.id)
-        .where(VideoTag.video_id == video_id)
-    )
-    tags = [tag.name for tag in tag_result.scalars().all()]
-
-    # 如果是视频组，获取其下的片段
-    segments = []
-    if video.video_type == 'group':
-        result = await db.execute(
-            select(Video)
-            .where(Video.parent_id == video_id)
-            .order_by(Video.segment_index.asc())
-        )
-        segment_videos = result.scalars().all()
-
-        segments = [
-            VideoBrief(
-                id=seg.id,
-                title=seg.title,
-                title_zh=seg.title_zh,
-                duration=seg.duration,
-                segment_index=seg.segment_index,
-                thumbnail_url=_ensure_https_url(seg.thumbnail_url),
-                vod_file_id=seg.vod_file_id,
-            )
-            for seg in segment_videos
-        ]
+    # 只有视频组才返回片段
+    if video.video_type != 'group':
+        segments = []
 
     # 构造响应
-    response = VideoDetailResponse(
-        id=video.id,
-        title=video.title,
-        title_zh=video.title_zh,
-        description=video.description,
-        description_zh=video.description_zh,
-        video_url=video.video_url,
-        vod_file_id=video.vod_file_id,
-        thumbnail_url=_ensure_https_url(video.thumbnail_url),
-        duration=video.duration,
-        difficulty=video.difficulty,
-        youtube_id=video.youtube_id,
-        youtube_url=video.youtube_url,
-        original_author=video.original_author,
-        tags=tags,
-        categories=video.categories_zh or video.categories or [],
-        categories_zh=video.categories_zh or [],
-        status=video.status,
-        is_published=video.is_published,
-        is_free=video.is_free,
-        display_order=video.display_order,
-        parent_id=video.parent_id,
-        segment_index=video.segment_index,
-        video_type=video.video_type or 'full',
-        segment_count=len(segments),
-        created_at=video.created_at,
-        updated_at=video.updated_at,
-        segments=segments,
+    payload = _video_to_dict(video, tags=tags)
+    progress = None
+    if include_progress and user and video.video_type == 'group':
+        progress = await load_group_progress(db, user.id, video.id)
+    body = VideoDetailResponse(**payload, segments=segments, progress=progress).model_dump_json().encode()
+    etag = None if personalized else _catalog_etag(version, user, "detail")
+    return cached_json_response(
+        request, body, etag, cache_control=cache_control(user is None and access_is_free)
     )
 
-    return response
-
 
 @router.get("/{video_id}/segments", response_model=List[VideoBrief])
 async def get_video_segments(
@@ -461,39 +590,15 @@ async def get_video_segments(
     - 付费视频组: 需要登录才能访问
     - 子视频继承父视频（视频组）的权限
     """
-    # 验证视频存在
-    result = await db.execute(select(Video).where(Video.id == video_id))
-    video = result.scalars().first()
-    if not video:
+    detail = await _load_video_detail(db, Video.id == video_id)
+    if detail is None:
         raise HTTPException(status_code=404, detail="视频不存在")
+    _video, access_is_free, _tags, segments, _version = detail
 
     # 访问控制：检查父视频（视频组）的权限
-    if not video.is_free and not user:
-        raise HTTPException(
-            status_code=401,
-            detail="该视频需要登录后观看，请先登录或注册"
-        )
+    _check_video_access(access_is_free, user)
 
-    # 获取片段
-    result = await db.execute(
-        select(Video)
-        .where(Video.parent_id == video_id)
-        .order_by(Video.segment_index.asc())
-    )
-    segments = result.scalars().all()
-
-    return [
-        VideoBrief(
-            id=seg.id,
-            title=seg.title,
-            title_zh=seg.title_zh,
-            duration=seg.duration,
-            segment_index=seg.segment_index,
-            thumbnail_url=_ensure_https_url(seg.thumbnail_url),
-            vod_file_id=seg.vod_file_id,
-        )
-        for seg in segments
-    ]
+    return segments
 
 
 @router.get("/by-youtube-id/{youtube_id}", response_model=VideoResponse)
@@ -510,27 +615,16 @@ async def get_video_by_youtube_id(
     **访问控制**:
     - 免费视频: 任何人都可以访问
     - 付费视频: 需要登录才能访问
+    - 子视频继承父视频的权限设置
     """
-    result = await db.execute(
-        select(Video).where(Video.youtube_id == youtube_id)
-    )
-    video = result.scalars().first()
-    if not video:
+    detail = await _load_video_detail(db, Video.youtube_id == youtube_id, with_segments=False)
+    if detail is None:
         raise HTTPException(status_code=404, detail="视频不存在")
+    video, access_is_free, tags, _segments, _version = detail
 
     # 访问控制：付费视频需要登录
-    if not video.is_free and not user:
-        raise HTTPException(
-            status_code=401,
-            detail="该视频需要登录后观看，请先登录或注册"
-        )
-    segment_count = 0
-    if video.video_type == 'group':
-        count_result = await db.execute(
-            select(sql_func.count()).select_from(Video).where(Video.parent_id == video.id)
-        )
-        segment_count = count_result.scalar_one()
-    return _video_to_dict(video, segment_count)
+    _check_video_access(access_is_free, user)
+    return _video_to_dict(video, tags=tags)
 
 
 @router.post("/", response_model=VideoResponse, status_code=201)
@@ -581,19 +675,49 @@ async def create_video(
         video = Video(**video_in_dict)
 
     if categories is not None:
-        video.categories = _normalize_names(categories)
+        video.categories = normalize_names(categories)
     if categories_zh is not None:
-        video.categories_zh = _normalize_names(categories_zh)
+        video.categories_zh = normalize_names(categories_zh)
     db.add(video)
     await db.flush()
     normalized_tags = await _set_video_tags(db, video, tags)
     await db.commit()
     await db.refresh(video)
+    video_facets.replace(None, facet_contribution(video))
     # 传入 normalized_tags 避免懒加载触发 MissingGreenlet 错误
-    payload = _video_to_dict(video, segment_count=0, tags=normalized_tags or [])
+    payload = _video_to_dict(video, tags=normalized_tags or [])
     return payload
 
 
+@router.post("/import", response_model=VideoImportResponse)
+async def import_videos_ndjson(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    _user: User = Depends(current_superuser),
+):
+    """
+    批量导入视频（NDJSON 流式上传）
+
+    请求体每行一个 JSON 对象，字段同创建视频接口，另可带 `segments` 片段数组：
+
+    ```
+    {"title": "...", "duration": 300, "youtube_id": "abc", "tags": ["TED"], "segments": [{"title": "...", "duration": 60, "segment_index": 1}]}
+    ```
+
+    - 请求体按行流式解析，不会整体读入内存
+    - 每 500 行一个事务，视频 / 标签 / 视频标签均使用多行 INSERT ... ON CONFLICT 写入
+    - **youtube_id** 为幂等键：已存在则更新；无 youtube_id 的片段按 segment_index 匹配
+    - 更新已有视频时只覆盖行中出现的字段，未出现的字段（如 display_order、is_published）保持原值
+    - 行中带 tags / categories 时以导入数据为准整体替换
+    - 片段也可单独成行，用 **parent_youtube_id** 指定父视频（可引用同一文件中前面的行）
+    - 返回逐行结果（created / updated / failed）
+    """
+    try:
+        return await import_videos(db, iter_lines(request.stream()))
+    except UnicodeDecodeError as exc:
+        raise HTTPException(status_code=400, detail="请求体不是有效的 UTF-8 文本") from exc
+
+
 @router.patch("/{video_id}", response_model=VideoResponse)
 async def update_video(
     video_id: UUID,
@@ -612,6 +736,8 @@ async def update_video(
     if not video:
         raise HTTPException(status_code=404, detail="视频不存在")
 
+    facets_before = facet_contribution(video)
+
     # 更新字段
     update_data = video_in.model_dump(exclude_unset=True)
     tags = update_data.pop("tags", None)
@@ -621,9 +747,9 @@ async def update_video(
         setattr(video, field, value)
 
     if categories is not None:
-        video.categories = _normalize_names(categories)
+        video.categories = normalize_names(categories)
     if categories_zh is not None:
-        video.categories_zh = _normalize_names(categories_zh)
+        video.categories_zh = normalize_names(categories_zh)
     normalized_tags = await _set_video_tags(db, video, tags)
     await db.commit()
 
@@ -634,12 +760,13 @@ async def update_video(
         .where(Video.id == video_id)
     )
     video = result.scalars().first()
+    video_facets.replace(facets_before, facet_contribution(video))
 
     # 如果有 normalized_tags，使用它；否则从预加载的关系中获取
     if normalized_tags is not None:
-        payload = _video_to_dict(video, segment_count=0, tags=normalized_tags)
+        payload = _video_to_dict(video, tags=normalized_tags)
     else:
-        payload = _video_to_dict(video, segment_count=0)
+        payload = _video_to_dict(video)
     return payload
 
 
@@ -661,6 +788,13 @@ async def delete_video(
     if not video:
         raise HTTPException(status_code=404, detail="视频不存在")
 
+    facets_before = facet_contribution(video)
+    is_group = video.video_type == 'group'
     await db.delete(video)
     await db.commit()
+    if is_group:
+        # 片段随视频组一并删除，无法增量计算，交由下次读取时重建
+        video_facets.invalidate()
+    else:
+        video_facets.replace(facets_before, None)
     return None
@@ -1,16 +1,27 @@
 from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.auth import fastapi_users, current_user_optional
+from app.core.config import settings
 from app.core.database import get_db
 from app.dependencies import get_accessible_video
 from app.models.user import User
 from app.models.video import Video
 from app.models.word_card import WordCard
-from app.schemas import WordCardCreate, WordCardResponse, WordCardListResponse
+from app.schemas import WordCardCreate, WordCardResponse, WordCardListResponse, WordCardBatchResponse
+from app.services.bulk_insert import upsert_returning
+from app.services.content_version import bump_content_version
+from app.utils.http_cache import (
+    cache_control,
+    is_not_modified,
+    not_modified_response,
+    validator_headers,
+    version_etag,
+)
 
 router = APIRouter()
 
@@ -21,8 +32,10 @@ current_superuser = fastapi_users.current_user(active=True, superuser=True)
 
 @router.get("/", response_model=WordCardListResponse)
 async def get_word_cards(
+    request: Request,
     video: Video = Depends(get_accessible_video),
     difficulty_level: int = Query(None, ge=1, le=6, description="难度等级筛选"),
+    user: Optional[User] = Depends(current_user_optional),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -35,7 +48,17 @@ async def get_word_cards(
     - 免费视频：任何人都可以访问单词卡
     - 付费视频：需要登录才能访问单词卡
     - 子视频继承父视频的权限设置
+
+    **条件请求**:
+    - 响应带 ETag / Last-Modified（基于视频的内容版本），内容未变化时返回 304
     """
+    etag = version_etag("word-cards", video.id, video.content_version, difficulty_level or "all")
+    headers = validator_headers(
+        etag, video.content_updated_at, cache_control(user is None and video.is_free)
+    )
+    if is_not_modified(request, etag, video.content_updated_at):
+        return not_modified_response(headers)
+
     stmt = select(WordCard).where(WordCard.video_id == video.id)
     if difficulty_level:
         stmt = stmt.where(WordCard.difficulty_level == difficulty_level)
@@ -43,7 +66,8 @@ async def get_word_cards(
     result = await db.execute(stmt)
     word_cards = result.scalars().all()
 
-    return WordCardListResponse(total=len(word_cards), items=word_cards)
+    body = WordCardListResponse(total=len(word_cards), items=word_cards).model_dump_json()
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.post("/", response_model=WordCardResponse, status_code=201)
@@ -57,31 +81,46 @@ async def create_word_card(
 
     为指定视频添加一个单词卡片。
     """
-    word_card = WordCard(**word_card_in.model_dump())
-    db.add(word_card)
+    # 依赖 (video_id, word) 唯一约束判重：并发创建同一卡片时只有一个成功，其余返回 409
+    word_card = await db.scalar(
+        pg_insert(WordCard)
+        .values(**word_card_in.model_dump())
+        .on_conflict_do_nothing(index_elements=[WordCard.video_id, WordCard.word])
+        .returning(WordCard)
+    )
+    if word_card is None:
+        raise HTTPException(status_code=409, detail="该视频已有相同的单词卡片")
+
+    await bump_content_version(db, word_card.video_id)
     await db.commit()
     await db.refresh(word_card)
     return word_card
 
 
-@router.post("/batch", response_model=WordCardListResponse, status_code=201)
+@router.post("/batch", response_model=WordCardBatchResponse, status_code=201)
 async def create_word_cards_batch(
-    word_cards_in: list[WordCardCreate],
+    word_cards_in: list[WordCardCreate] = Body(..., min_length=1, max_length=settings.BATCH_CREATE_MAX_ITEMS),
     db: AsyncSession = Depends(get_db),
 ):
     """
     批量创建单词卡片
 
     一次性为视频添加多个单词卡片。
+
+    - 按 (video_id, word) 自然键 upsert：已存在的单词更新内容，不存在的新建，重复导入同一视频是幂等的
+    - 每块一条 INSERT ... ON CONFLICT DO UPDATE ... RETURNING 语句；同一批内重复的单词以最后一条为准
+    - 返回 inserted / updated 计数
+    - 单次最多 BATCH_CREATE_MAX_ITEMS 条，超出返回 422
     """
-    word_cards = [WordCard(**wc.model_dump()) for wc in word_cards_in]
-    db.add_all(word_cards)
+    word_cards, inserted = await upsert_returning(
+        db, WordCard, [wc.model_dump() for wc in word_cards_in], ("video_id", "word")
+    )
+    await bump_content_version(db, *{wc.video_id for wc in word_cards_in})
     await db.commit()
 
-    for word_card in word_cards:
-        await db.refresh(word_card)
-
-    return WordCardListResponse(total=len(word_cards), items=word_cards)
+    return WordCardBatchResponse(
+        total=len(word_cards), items=word_cards, inserted=inserted, updated=len(word_cards) - inserted
+    )
 
 
 @router.delete("/{word_card_id}", status_code=204)
@@ -100,5 +139,6 @@ async def delete_word_card(
         raise HTTPException(status_code=404, detail="单词卡片不存在")
 
     await db.delete(word_card)
+    await bump_content_version(db, word_card.video_id)
     await db.commit()
     return None
@@ -48,6 +48,27 @@ class Settings(BaseSettings):
     VOD_PSIGN_RAW_ADAPTIVE_DEFINITION: str = ""
     VOD_PSIGN_TRANSCODE_DEFINITION: str = ""
 
+    # 视频分类/作者分面缓存：全量重建间隔（秒），多 worker 部署下用于收敛
+    FACETS_RESYNC_SECONDS: int = 300
+
+    # HTTP 缓存：公开内容（匿名 + 免费）允许共享缓存的秒数
+    HTTP_CACHE_MAX_AGE: int = 60
+
+    # 字幕 / 单词卡 / 短语卡批量创建接口单次最多条数
+    BATCH_CREATE_MAX_ITEMS: int = 5000
+
+    # 字幕文件上传：每批写入条数
+    SUBTITLE_UPLOAD_CHUNK_SIZE: int = 1000
+
+    # 字幕响应缓存：压缩后总字节上限与 gzip 压缩级别
+    SUBTITLE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    SUBTITLE_CACHE_GZIP_LEVEL: int = 6
+
+    # 学习进度心跳写回缓冲：是否启用、落库间隔（秒）、内存中缓存的完成状态条数上限
+    PROGRESS_WRITE_BEHIND: bool = True
+    PROGRESS_FLUSH_SECONDS: float = 5.0
+    PROGRESS_KNOWN_STATES_MAX: int = 100000
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -5,11 +5,13 @@ from sqlalchemy import text
 import logging
 import os
 import time
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from app.core.config import settings
 from app.api.v1.api import api_router
 from app.core.database import get_db
+from app.services.progress_buffer import progress_buffer
 
 # 确保日志目录存在
 log_dir = Path("logs")
@@ -26,12 +28,22 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """启动学习进度写回缓冲，关闭时把未落库的进度写入数据库"""
+    if settings.PROGRESS_WRITE_BEHIND:
+        progress_buffer.start()
+    yield
+    await progress_buffer.stop()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url="/api/docs",  # 文档路径改为 /api/docs
     redoc_url="/api/redoc",  # ReDoc 路径改为 /api/redoc
+    lifespan=lifespan,
 )
 
 # 请求日志中间件
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Text, DateTime, DECIMAL, ForeignKey
+from sqlalchemy import Column, String, Integer, Text, DateTime, DECIMAL, ForeignKey, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -9,6 +9,10 @@ from app.core.database import Base
 
 class PhraseCard(Base):
     __tablename__ = "phrase_cards"
+    __table_args__ = (
+        # 自然键：同一视频内短语唯一，批量导入按此 upsert
+        UniqueConstraint("video_id", "phrase", name="uq_phrase_cards_video_phrase"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     video_id = Column(UUID(as_uuid=True), ForeignKey('videos.id', ondelete='CASCADE'), nullable=False, index=True)
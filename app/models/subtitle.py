@@ -1,16 +1,31 @@
-from sqlalchemy import Column, Integer, Text, DateTime, DECIMAL, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy import Column, Integer, Text, DateTime, DECIMAL, ForeignKey, Index, Computed
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 
 from app.core.database import Base
 
+# 英文字幕全文检索向量（english 词干化）；中文字幕走 chinese_text 的 pg_trgm 索引
+SUBTITLE_SEARCH_VECTOR_SQL = "to_tsvector('english', coalesce(english_text, ''))"
+
 
 class Subtitle(Base):
     __tablename__ = "subtitles"
+    __table_args__ = (
+        # 按视频时间轴读取 / 时间窗口 / 游标分页：(video_id, start_time, id)，同时覆盖按 video_id 的查询
+        Index("ix_subtitles_video_start", "video_id", "start_time", "id"),
+        # 全库字幕检索
+        Index("ix_subtitles_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_subtitles_chinese_text_trgm",
+            "chinese_text",
+            postgresql_using="gin",
+            postgresql_ops={"chinese_text": "gin_trgm_ops"},
+        ),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    video_id = Column(UUID(as_uuid=True), ForeignKey('videos.id', ondelete='CASCADE'), nullable=False, index=True)
+    video_id = Column(UUID(as_uuid=True), ForeignKey('videos.id', ondelete='CASCADE'), nullable=False)
 
     start_time = Column(DECIMAL(10, 3), nullable=False)
     end_time = Column(DECIMAL(10, 3), nullable=False)
@@ -25,6 +40,9 @@ class Subtitle(Base):
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # 搜索（数据库生成列，默认不加载）
+    search_vector = deferred(Column(TSVECTOR, Computed(SUBTITLE_SEARCH_VECTOR_SQL, persisted=True)))
+
     # 关系
     video = relationship("Video", backref="subtitles")
 
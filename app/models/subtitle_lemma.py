@@ -0,0 +1,68 @@
+from sqlalchemy import Column, String, Integer, DECIMAL, ForeignKey, DDL, event
+from sqlalchemy.dialects.postgresql import UUID, ARRAY
+
+from app.core.database import Base
+
+
+class SubtitleLemma(Base):
+    """
+    词形还原倒排索引：原形 -> 字幕
+
+    由 subtitles 上的语句级触发器根据 word_refs 维护，不直接写入。
+    主键 (lemma, subtitle_id) 同时用于按原形查询和 keyset 分页。
+    """
+    __tablename__ = "subtitle_lemmas"
+
+    lemma = Column(String(100), primary_key=True)
+    subtitle_id = Column(Integer, ForeignKey('subtitles.id', ondelete='CASCADE'), primary_key=True, index=True)
+    video_id = Column(UUID(as_uuid=True), ForeignKey('videos.id', ondelete='CASCADE'), nullable=False)
+    start_time = Column(DECIMAL(10, 3), nullable=False)
+    forms = Column(ARRAY(String(100)), nullable=False)  # 该字幕中出现的实际词形，如 ["cleaner", "cleanest"]
+
+    def __repr__(self):
+        return f"<SubtitleLemma {self.lemma} @ {self.subtitle_id}>"
+
+
+# 从一批字幕行（{source}：触发器中为 new_rows，重建时为 subtitles）的 word_refs 展开倒排项；
+# 原形统一小写，非对象的 word_refs 视为空
+LEMMA_ROWS_SQL = """
+    SELECT left(lower(r.value), 100), n.id, n.video_id, n.start_time, array_agg(DISTINCT left(r.key, 100))
+    FROM {source} AS n
+    CROSS JOIN LATERAL jsonb_each_text(
+        CASE WHEN jsonb_typeof(n.word_refs) = 'object' THEN n.word_refs ELSE '{{}}'::jsonb END
+    ) AS r
+    WHERE btrim(r.value) <> ''
+    GROUP BY 1, n.id, n.video_id, n.start_time
+"""
+
+# 维护 subtitle_lemmas：字幕插入 / 更新时按语句批量重建对应行，删除由外键级联
+SUBTITLE_LEMMA_TRIGGER_SQL = f"""
+CREATE OR REPLACE FUNCTION subtitles_sync_lemmas() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        DELETE FROM subtitle_lemmas AS l USING new_rows AS n WHERE l.subtitle_id = n.id;
+    END IF;
+    INSERT INTO subtitle_lemmas (lemma, subtitle_id, video_id, start_time, forms)
+    {LEMMA_ROWS_SQL.format(source="new_rows")};
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_subtitles_lemmas_insert ON subtitles;
+CREATE TRIGGER trg_subtitles_lemmas_insert
+AFTER INSERT ON subtitles
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION subtitles_sync_lemmas();
+
+DROP TRIGGER IF EXISTS trg_subtitles_lemmas_update ON subtitles;
+CREATE TRIGGER trg_subtitles_lemmas_update
+AFTER UPDATE ON subtitles
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION subtitles_sync_lemmas();
+"""
+
+event.listen(
+    SubtitleLemma.__table__,
+    "after_create",
+    DDL(SUBTITLE_LEMMA_TRIGGER_SQL).execute_if(dialect="postgresql"),
+)
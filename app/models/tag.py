@@ -5,6 +5,8 @@ import uuid
 
 from app.core.database import Base
 
+DEFAULT_TAG_TYPE = "topic"
+
 
 class Tag(Base):
     __tablename__ = "tags"
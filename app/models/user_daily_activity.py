@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, Date, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class UserDailyActivity(Base):
+    """
+    每个用户每天（UTC）的观看汇总
+
+    由 scripts/rollup_watch_history.py 从观看流水 user_watch_events 按日重算写入，
+    /learning/history 的热力图、连续学习天数等只读取这张表。
+    """
+    __tablename__ = "user_daily_activity"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    watch_seconds = Column(Integer, nullable=False, default=0)
+    videos_watched = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<UserDailyActivity {self.user_id} {self.day}>"
@@ -0,0 +1,151 @@
+from sqlalchemy import Column, Integer, BigInteger, Date, DateTime, ForeignKey, DDL, event
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+from app.models.user_video_progress import UserVideoProgress
+
+
+class UserLearningStats(Base):
+    """
+    每个用户的学习统计汇总
+
+    由 user_video_progress 上的语句级触发器按增量维护，不直接写入；
+    全量重建见 scripts/rebuild_learning_stats.py。
+    观看时长按播放位置前进的秒数累计（单次不超过两次上报的间隔），回看不重复计入已看过的位置之前的部分；
+    新增进度行与手动标记完成不计观看时长。
+    """
+    __tablename__ = "user_learning_stats"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    total_watch_seconds = Column(BigInteger, nullable=False, default=0)
+    videos_started = Column(Integer, nullable=False, default=0)
+    videos_completed = Column(Integer, nullable=False, default=0)
+    week_start = Column(Date, nullable=False)  # 本周（UTC，周一开始）
+    week_watch_seconds = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<UserLearningStats {self.user_id}>"
+
+
+# 当前统计周的起始日（UTC，周一）
+CURRENT_WEEK_SQL = "date_trunc('week', now() AT TIME ZONE 'UTC')::date"
+
+# 按用户汇总的增量（{deltas}：返回 user_id, watch, started, completed 的查询）累加到统计表；
+# 按 user_id 排序写入，避免并发语句交叉加锁导致死锁
+STATS_UPSERT_SQL = f"""
+    INSERT INTO user_learning_stats AS s
+        (user_id, total_watch_seconds, videos_started, videos_completed, week_start, week_watch_seconds, updated_at)
+    SELECT d.user_id, d.watch, d.started, d.completed, {CURRENT_WEEK_SQL}, d.watch, now()
+    FROM ({{deltas}}) AS d
+    ORDER BY d.user_id
+    ON CONFLICT (user_id) DO UPDATE SET
+        total_watch_seconds = s.total_watch_seconds + EXCLUDED.total_watch_seconds,
+        videos_started = s.videos_started + EXCLUDED.videos_started,
+        videos_completed = s.videos_completed + EXCLUDED.videos_completed,
+        week_watch_seconds = CASE
+            WHEN s.week_start = EXCLUDED.week_start THEN s.week_watch_seconds + EXCLUDED.week_watch_seconds
+            ELSE EXCLUDED.week_watch_seconds
+        END,
+        week_start = EXCLUDED.week_start,
+        updated_at = now()
+"""
+
+# 新增进度行：没有上一次上报可比，不计观看时长（首次上报前的播放与拖动、直接标记完成都无从区分）
+INSERT_DELTAS_SQL = """
+    SELECT n.user_id, 0::bigint AS watch, count(*)::int AS started,
+           count(*) FILTER (WHERE n.is_completed)::int AS completed
+    FROM new_rows AS n
+    GROUP BY n.user_id
+"""
+
+# 每行进度更新的观看明细（n 为新行、o 为旧行），统计与观看流水两个触发器共用：
+# 观看秒数为播放位置（watched_position）前进的秒数，不超过两次上报的间隔；
+# 拖动进度条不计入，手动标记完成不改变播放位置，也不计入
+WATCH_DELTAS_SQL = """
+    SELECT n.user_id, n.video_id, n.last_watched_at, n.watched_position,
+           greatest(0, least(
+               n.watched_position - o.watched_position,
+               ceil(extract(epoch FROM n.last_watched_at - o.last_watched_at))
+           ))::int AS seconds,
+           n.is_completed::int - o.is_completed::int AS completed
+    FROM new_rows AS n
+    JOIN old_rows AS o ON o.id = n.id
+"""
+
+# 更新进度行：观看秒数与完成状态的变化
+UPDATE_DELTAS_SQL = f"""
+    SELECT w.user_id, sum(w.seconds)::bigint AS watch, 0 AS started, sum(w.completed)::int AS completed
+    FROM ({WATCH_DELTAS_SQL}) AS w
+    GROUP BY w.user_id
+"""
+
+# 从现有进度行重建统计（{where}：可选的过滤条件），只能按播放位置近似观看时长
+STATS_ROWS_SQL = f"""
+    SELECT p.user_id,
+           sum(p.watched_position)::bigint,
+           count(*)::int,
+           count(*) FILTER (WHERE p.is_completed)::int,
+           {CURRENT_WEEK_SQL},
+           coalesce(sum(p.watched_position) FILTER (
+               WHERE p.last_watched_at >= {CURRENT_WEEK_SQL}::timestamp AT TIME ZONE 'UTC'
+           ), 0)::bigint,
+           now()
+    FROM user_video_progress AS p
+    {{where}}
+    GROUP BY p.user_id
+"""
+
+# 维护 user_learning_stats：进度插入 / 更新按语句累加增量；删除只扣减计数，已观看时长保留。
+# 删除使用 UPDATE 而不是 upsert，用户被删除级联时不会重新插入统计行
+USER_LEARNING_STATS_TRIGGER_SQL = f"""
+CREATE OR REPLACE FUNCTION user_video_progress_sync_stats() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        {STATS_UPSERT_SQL.format(deltas=INSERT_DELTAS_SQL)};
+    ELSIF TG_OP = 'UPDATE' THEN
+        {STATS_UPSERT_SQL.format(deltas=UPDATE_DELTAS_SQL)};
+    ELSE
+        UPDATE user_learning_stats AS s
+        SET videos_started = s.videos_started - d.started,
+            videos_completed = s.videos_completed - d.completed,
+            updated_at = now()
+        FROM (
+            SELECT o.user_id, count(*)::int AS started, count(*) FILTER (WHERE o.is_completed)::int AS completed
+            FROM old_rows AS o
+            GROUP BY o.user_id
+        ) AS d
+        WHERE s.user_id = d.user_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_user_video_progress_stats_insert ON user_video_progress;
+CREATE TRIGGER trg_user_video_progress_stats_insert
+AFTER INSERT ON user_video_progress
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION user_video_progress_sync_stats();
+
+DROP TRIGGER IF EXISTS trg_user_video_progress_stats_update ON user_video_progress;
+CREATE TRIGGER trg_user_video_progress_stats_update
+AFTER UPDATE ON user_video_progress
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION user_video_progress_sync_stats();
+
+DROP TRIGGER IF EXISTS trg_user_video_progress_stats_delete ON user_video_progress;
+CREATE TRIGGER trg_user_video_progress_stats_delete
+AFTER DELETE ON user_video_progress
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION user_video_progress_sync_stats();
+"""
+
+# 触发器建在 user_video_progress 上，建表时须排在其后
+UserLearningStats.__table__.add_is_dependent_on(UserVideoProgress.__table__)
+
+event.listen(
+    UserLearningStats.__table__,
+    "after_create",
+    DDL(USER_LEARNING_STATS_TRIGGER_SQL).execute_if(dialect="postgresql"),
+)
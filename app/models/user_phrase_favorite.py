@@ -11,6 +11,7 @@ class UserPhraseFavorite(Base):
     __table_args__ = (
         UniqueConstraint("user_id", "phrase_card_id", name="uq_user_phrase_favorites_user_phrase"),
         Index("ix_user_phrase_favorites_user_favorited_at", "user_id", "favorited_at"),
+        Index("ix_user_phrase_favorites_user_video", "user_id", "video_id"),
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -18,6 +18,8 @@ class UserVideoProgress(Base):
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     video_id = Column(UUID(as_uuid=True), ForeignKey("videos.id", ondelete="CASCADE"), nullable=False, index=True)
     current_progress = Column(Integer, nullable=False, default=0)
+    # 最近一次播放上报的位置（秒）：手动标记完成只改 current_progress，不改此列；观看时长按此列计算
+    watched_position = Column(Integer, nullable=False, default=0, server_default="0")
     total_duration = Column(Integer, nullable=False)
     is_completed = Column(Boolean, nullable=False, default=False)
     last_watched_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
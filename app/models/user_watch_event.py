@@ -0,0 +1,70 @@
+from sqlalchemy import Column, Integer, DateTime, Index, DDL, event
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+from app.models.user_learning_stats import WATCH_DELTAS_SQL
+from app.models.user_video_progress import UserVideoProgress
+
+
+class UserWatchEvent(Base):
+    """
+    观看记录流水（只追加）
+
+    由 user_video_progress 上的语句级触发器在每次进度更新时追加一行（本次观看的秒数），不直接写入。
+    按 watched_at 以月为单位分区，默认分区兜底尚未创建的月份；分区创建、按日汇总与过期分区清理
+    由 scripts/rollup_watch_history.py 定时执行。请求中只读取按日汇总表 user_daily_activity。
+    离线同步的流水 watched_at 可能早于写入时间 recorded_at，按日汇总据此重算迟到的日期。
+    流水表不设主键与外键，写入只维护两个 BRIN 索引。
+    """
+    __tablename__ = "user_watch_events"
+    __table_args__ = (
+        Index("ix_user_watch_events_watched_at", "watched_at", postgresql_using="brin"),
+        Index("ix_user_watch_events_recorded_at", "recorded_at", postgresql_using="brin"),
+        {"postgresql_partition_by": "RANGE (watched_at)"},
+    )
+    # 表本身没有主键，ORM 映射时以这三列标识一行
+    __mapper_args__ = {"primary_key": ["user_id", "watched_at", "video_id"]}
+
+    user_id = Column(UUID(as_uuid=True), nullable=False)
+    video_id = Column(UUID(as_uuid=True), nullable=False)
+    watched_at = Column(DateTime(timezone=True), nullable=False)
+    watch_seconds = Column(Integer, nullable=False)
+    position = Column(Integer, nullable=False)  # 本次上报后的播放位置（秒，即 watched_position）
+    recorded_at = Column(DateTime(timezone=True), server_default=func.now())  # 写入时间；早于该列上线的流水为空
+
+    def __repr__(self):
+        return f"<UserWatchEvent {self.user_id} {self.video_id} @ {self.watched_at}>"
+
+
+# 追加观看流水：与统计共用每行的观看明细，只在进度更新时记录；新增进度行与观看秒数为 0 的写入不记录
+USER_WATCH_EVENTS_TRIGGER_SQL = f"""
+CREATE TABLE IF NOT EXISTS user_watch_events_default PARTITION OF user_watch_events DEFAULT;
+
+CREATE OR REPLACE FUNCTION user_video_progress_log_watch() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO user_watch_events (user_id, video_id, watched_at, watch_seconds, position)
+    SELECT w.user_id, w.video_id, w.last_watched_at, w.seconds, w.watched_position
+    FROM ({WATCH_DELTAS_SQL}) AS w
+    WHERE w.seconds > 0;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_user_video_progress_watch_insert ON user_video_progress;
+
+DROP TRIGGER IF EXISTS trg_user_video_progress_watch_update ON user_video_progress;
+CREATE TRIGGER trg_user_video_progress_watch_update
+AFTER UPDATE ON user_video_progress
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION user_video_progress_log_watch();
+"""
+
+# 触发器建在 user_video_progress 上，建表时须排在其后
+UserWatchEvent.__table__.add_is_dependent_on(UserVideoProgress.__table__)
+
+event.listen(
+    UserWatchEvent.__table__,
+    "after_create",
+    DDL(USER_WATCH_EVENTS_TRIGGER_SQL).execute_if(dialect="postgresql"),
+)
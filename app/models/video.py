@@ -1,14 +1,45 @@
-from sqlalchemy import Column, String, Integer, Boolean, Text, DateTime, DECIMAL, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Integer, Boolean, Text, DateTime, DECIMAL, ForeignKey, Computed, Index, DDL, event
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 import uuid
 
 from app.core.database import Base
 
 
+# 全文检索向量：英文字段走 english 词干化，中文/作者/分类走 simple 分词
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(title_zh, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(original_author, '')), 'B') || "
+    "setweight(jsonb_to_tsvector('simple', coalesce(categories, '[]'::jsonb), '[\"string\"]'), 'B') || "
+    "setweight(jsonb_to_tsvector('simple', coalesce(categories_zh, '[]'::jsonb), '[\"string\"]'), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C') || "
+    "setweight(to_tsvector('simple', coalesce(description_zh, '')), 'D')"
+)
+
+# 子串检索文本：配合 pg_trgm GIN 索引支持中文等无分词场景的 ILIKE
+SEARCH_TEXT_SQL = (
+    "coalesce(title, '') || ' ' || coalesce(title_zh, '') || ' ' || "
+    "coalesce(original_author, '') || ' ' || "
+    "coalesce(categories::text, '') || ' ' || coalesce(categories_zh::text, '') || ' ' || "
+    "coalesce(description, '') || ' ' || coalesce(description_zh, '')"
+)
+
+
 class Video(Base):
     __tablename__ = "videos"
+    __table_args__ = (
+        Index("ix_videos_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_videos_search_text_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+        # 目录默认排序 / 游标分页：display_order DESC, created_at DESC, id DESC（反向扫描）
+        Index("ix_videos_catalog_order", "display_order", "created_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     title = Column(String(255), nullable=False, index=True)
@@ -29,12 +60,13 @@ class Video(Base):
     parent_id = Column(UUID(as_uuid=True), ForeignKey("videos.id"), nullable=True, index=True)
     segment_index = Column(Integer, nullable=True)  # 片段序号 (1, 2, 3...)
     video_type = Column(String(20), default='full')  # full(完整视频)/segment(片段)/group(视频组)
+    segment_count = Column(Integer, nullable=False, default=0, server_default='0')  # 子视频数量，由触发器维护
 
     # 状态
     status = Column(String(20), default='published')
     is_published = Column(Boolean, default=False)
     is_free = Column(Boolean, default=False)  # 是否免费视频
-    display_order = Column(Integer, default=0, index=True)
+    display_order = Column(Integer, nullable=False, default=0, server_default='0', index=True)
 
     # YouTube 相关
     youtube_id = Column(String(50), unique=True, index=True)
@@ -44,11 +76,19 @@ class Video(Base):
     categories = Column(JSONB, nullable=True, default=list)
     categories_zh = Column(JSONB, nullable=True)
 
+    # 搜索（数据库生成列，默认不加载）
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True)))
+    search_text = deferred(Column(Text, Computed(SEARCH_TEXT_SQL, persisted=True)))
+
     # 审计
     created_by = Column(UUID(as_uuid=True))
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # 内容版本：字幕/单词卡/短语卡写入时递增，用于 ETag / Last-Modified 条件请求
+    content_version = Column(Integer, nullable=False, default=0, server_default='0')
+    content_updated_at = Column(DateTime(timezone=True), server_default=func.now())
+
     # 关系
     segments = relationship(
         "Video",
@@ -59,3 +99,34 @@ class Video(Base):
 
     def __repr__(self):
         return f"<Video {self.title}>"
+
+
+# 维护 videos.segment_count：片段新增、改挂父视频、删除（含级联）时同步父视频计数
+SEGMENT_COUNT_TRIGGER_SQL = """
+CREATE OR REPLACE FUNCTION videos_sync_segment_count() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' OR TG_OP = 'UPDATE' THEN
+        IF OLD.parent_id IS NOT NULL
+           AND (TG_OP = 'DELETE' OR NEW.parent_id IS DISTINCT FROM OLD.parent_id) THEN
+            UPDATE videos SET segment_count = GREATEST(segment_count - 1, 0)
+            WHERE id = OLD.parent_id;
+        END IF;
+    END IF;
+    IF TG_OP = 'INSERT' OR TG_OP = 'UPDATE' THEN
+        IF NEW.parent_id IS NOT NULL
+           AND (TG_OP = 'INSERT' OR NEW.parent_id IS DISTINCT FROM OLD.parent_id) THEN
+            UPDATE videos SET segment_count = segment_count + 1
+            WHERE id = NEW.parent_id;
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_videos_segment_count ON videos;
+CREATE TRIGGER trg_videos_segment_count
+AFTER INSERT OR DELETE OR UPDATE OF parent_id ON videos
+FOR EACH ROW EXECUTE FUNCTION videos_sync_segment_count();
+"""
+
+event.listen(Video.__table__, "after_create", DDL(SEGMENT_COUNT_TRIGGER_SQL).execute_if(dialect="postgresql"))
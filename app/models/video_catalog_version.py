@@ -0,0 +1,72 @@
+from sqlalchemy import Column, Boolean, BigInteger, DateTime, CheckConstraint, DDL, event, text
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+from app.models.tag import Tag
+from app.models.video import Video
+from app.models.video_tag import VideoTag
+
+
+class VideoCatalogVersion(Base):
+    """
+    视频目录版本（单行表）
+
+    videos / video_tags / tags 的任意写入在事务提交时由触发器递增 version，
+    视频列表与详情据此生成 ETag，条件请求先读这一行即可决定是否返回 304，无需执行查询与序列化。
+    """
+    __tablename__ = "video_catalog_version"
+    __table_args__ = (
+        CheckConstraint("id", name="ck_video_catalog_version_single_row"),
+    )
+
+    id = Column(Boolean, primary_key=True, default=True, server_default=text("true"))
+    version = Column(BigInteger, nullable=False, default=0, server_default="0")
+    bumped_xid = Column(BigInteger, nullable=True)  # 最近一次递增所在的事务，同一事务只递增一次
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<VideoCatalogVersion {self.version}>"
+
+
+# 目录相关表写入后递增版本：延迟到提交时执行，单行锁只在提交瞬间持有；
+# 逐行触发但每个事务只真正更新一次
+VIDEO_CATALOG_VERSION_TRIGGER_SQL = """
+INSERT INTO video_catalog_version (id, version) VALUES (true, 0) ON CONFLICT (id) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION video_catalog_bump_version() RETURNS trigger AS $$
+BEGIN
+    UPDATE video_catalog_version
+    SET version = version + 1, bumped_xid = txid_current(), updated_at = now()
+    WHERE bumped_xid IS DISTINCT FROM txid_current();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_videos_catalog_version ON videos;
+CREATE CONSTRAINT TRIGGER trg_videos_catalog_version
+AFTER INSERT OR UPDATE OR DELETE ON videos
+DEFERRABLE INITIALLY DEFERRED
+FOR EACH ROW EXECUTE FUNCTION video_catalog_bump_version();
+
+DROP TRIGGER IF EXISTS trg_video_tags_catalog_version ON video_tags;
+CREATE CONSTRAINT TRIGGER trg_video_tags_catalog_version
+AFTER INSERT OR UPDATE OR DELETE ON video_tags
+DEFERRABLE INITIALLY DEFERRED
+FOR EACH ROW EXECUTE FUNCTION video_catalog_bump_version();
+
+DROP TRIGGER IF EXISTS trg_tags_catalog_version ON tags;
+CREATE CONSTRAINT TRIGGER trg_tags_catalog_version
+AFTER INSERT OR UPDATE OR DELETE ON tags
+DEFERRABLE INITIALLY DEFERRED
+FOR EACH ROW EXECUTE FUNCTION video_catalog_bump_version();
+"""
+
+# 触发器建在目录相关表上，建表时须排在其后
+for _table in (Video.__table__, VideoTag.__table__, Tag.__table__):
+    VideoCatalogVersion.__table__.add_is_dependent_on(_table)
+
+event.listen(
+    VideoCatalogVersion.__table__,
+    "after_create",
+    DDL(VIDEO_CATALOG_VERSION_TRIGGER_SQL).execute_if(dialect="postgresql"),
+)
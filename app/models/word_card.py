@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Text, DateTime, DECIMAL, ForeignKey
+from sqlalchemy import Column, String, Integer, Text, DateTime, DECIMAL, ForeignKey, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -9,6 +9,10 @@ from app.core.database import Base
 
 class WordCard(Base):
     __tablename__ = "word_cards"
+    __table_args__ = (
+        # 自然键：同一视频内单词唯一，批量导入按此 upsert
+        UniqueConstraint("video_id", "word", name="uq_word_cards_video_word"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     video_id = Column(UUID(as_uuid=True), ForeignKey('videos.id', ondelete='CASCADE'), nullable=False, index=True)
@@ -6,12 +6,23 @@ from app.schemas.video import (
     VideoListResponse,
     VideoBrief,
     VideoDetailResponse,
+    VideoSegmentProgress,
+    VideoGroupProgress,
+    VideoImportItem,
+    VideoImportResult,
+    VideoImportResponse,
 )
 from app.schemas.subtitle import (
     SubtitleBase,
     SubtitleCreate,
     SubtitleResponse,
     SubtitleListResponse,
+    SubtitleReplaceResponse,
+    SubtitleUploadResponse,
+    SubtitleSearchItem,
+    SubtitleSearchResponse,
+    SubtitleConcordanceItem,
+    SubtitleConcordanceResponse,
 )
 from app.schemas.tag import (
     TagBase,
@@ -25,12 +36,14 @@ from app.schemas.word_card import (
     WordCardCreate,
     WordCardResponse,
     WordCardListResponse,
+    WordCardBatchResponse,
 )
 from app.schemas.phrase_card import (
     PhraseCardBase,
     PhraseCardCreate,
     PhraseCardResponse,
     PhraseCardListResponse,
+    PhraseCardBatchResponse,
 )
 from app.schemas.user import (
     UserRead,
@@ -50,6 +63,12 @@ from app.schemas.auth import (
 from app.schemas.learning import (
     LearningProgressUpdateRequest,
     LearningProgressResponse,
+    LearningProgressEvent,
+    LearningProgressBatchResponse,
+    LearningStatsResponse,
+    LearningHistoryDay,
+    LearningHistoryResponse,
+    LearningVideoCard,
     LearningRecentItem,
     LearningRecentResponse,
     LearningCompletedItem,
@@ -60,6 +79,8 @@ from app.schemas.learning import (
     FavoriteCheckResponse,
     FavoriteBatchCheckRequest,
     FavoriteBatchCheckResponse,
+    FavoriteUnifiedCheckRequest,
+    FavoriteUnifiedCheckResponse,
     SubtitleFavoriteItem,
     SubtitleFavoriteListResponse,
     SubtitleFavoriteActionResponse,
@@ -83,11 +104,22 @@ __all__ = [
     "VideoListResponse",
     "VideoBrief",
     "VideoDetailResponse",
+    "VideoSegmentProgress",
+    "VideoGroupProgress",
+    "VideoImportItem",
+    "VideoImportResult",
+    "VideoImportResponse",
     # Subtitle
     "SubtitleBase",
     "SubtitleCreate",
     "SubtitleResponse",
     "SubtitleListResponse",
+    "SubtitleReplaceResponse",
+    "SubtitleUploadResponse",
+    "SubtitleSearchItem",
+    "SubtitleSearchResponse",
+    "SubtitleConcordanceItem",
+    "SubtitleConcordanceResponse",
     # Tag
     "TagBase",
     "TagCreate",
@@ -99,11 +131,13 @@ __all__ = [
     "WordCardCreate",
     "WordCardResponse",
     "WordCardListResponse",
+    "WordCardBatchResponse",
     # Phrase Card
     "PhraseCardBase",
     "PhraseCardCreate",
     "PhraseCardResponse",
     "PhraseCardListResponse",
+    "PhraseCardBatchResponse",
     # User
     "UserRead",
     "UserCreate",
@@ -120,6 +154,12 @@ __all__ = [
     # Learning & Favorites
     "LearningProgressUpdateRequest",
     "LearningProgressResponse",
+    "LearningProgressEvent",
+    "LearningProgressBatchResponse",
+    "LearningStatsResponse",
+    "LearningHistoryDay",
+    "LearningHistoryResponse",
+    "LearningVideoCard",
     "LearningRecentItem",
     "LearningRecentResponse",
     "LearningCompletedItem",
@@ -130,6 +170,8 @@ __all__ = [
     "FavoriteCheckResponse",
     "FavoriteBatchCheckRequest",
     "FavoriteBatchCheckResponse",
+    "FavoriteUnifiedCheckRequest",
+    "FavoriteUnifiedCheckResponse",
     "SubtitleFavoriteItem",
     "SubtitleFavoriteListResponse",
     "SubtitleFavoriteActionResponse",
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional, List
 from uuid import UUID
 from pydantic import BaseModel, Field
@@ -26,8 +26,64 @@ class LearningProgressResponse(BaseModel):
     completed_at: Optional[datetime] = None
 
 
+class LearningProgressEvent(BaseModel):
+    video_id: UUID
+    current_progress: int = Field(..., ge=0, description="当前进度（秒）")
+    total_duration: Optional[int] = Field(None, gt=0, description="视频总时长（秒）")
+    is_completed: Optional[bool] = Field(None, description="是否手动标记完成（离线同步时 False 会被忽略）")
+    watched_at: datetime = Field(..., description="客户端记录该进度的时间")
+
+
+class LearningProgressBatchResponse(BaseModel):
+    received: int
+    applied: int
+    skipped: int
+    items: List[LearningProgressResponse]
+
+
+class LearningStatsResponse(BaseModel):
+    total_watch_seconds: int
+    total_watch_minutes: int
+    videos_started: int
+    videos_completed: int
+    week_start: date
+    week_watch_seconds: int
+    week_watch_minutes: int
+
+
+class LearningHistoryDay(BaseModel):
+    day: date
+    watch_seconds: int
+    videos_watched: int
+
+
+class LearningHistoryResponse(BaseModel):
+    start: date
+    end: date
+    total_watch_seconds: int
+    active_days: int
+    current_streak: int
+    longest_streak: int
+    days: List[LearningHistoryDay]
+
+
+class LearningVideoCard(BaseModel):
+    """学习记录列表中的视频卡片（精简字段）"""
+    id: UUID
+    title: str
+    title_zh: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    duration: int
+    difficulty: str
+    original_author: Optional[str] = None
+    author_avatar_url: Optional[str] = None
+    is_free: bool
+    video_type: str = "full"
+    segment_count: int = 0
+
+
 class LearningRecentItem(BaseModel):
-    video: VideoResponse
+    video: LearningVideoCard
     current_progress: int
     total_duration: int
     progress_percent: float
@@ -37,18 +93,20 @@ class LearningRecentItem(BaseModel):
 
 
 class LearningRecentResponse(BaseModel):
-    total: int
+    total: Optional[int] = None  # include_total=false 时为 None
     items: List[LearningRecentItem]
+    next_cursor: Optional[str] = None  # 游标分页：下一页游标，无更多数据时为 None
 
 
 class LearningCompletedItem(BaseModel):
-    video: VideoResponse
+    video: LearningVideoCard
     completed_at: datetime
 
 
 class LearningCompletedResponse(BaseModel):
-    total: int
+    total: Optional[int] = None  # include_total=false 时为 None
     items: List[LearningCompletedItem]
+    next_cursor: Optional[str] = None  # 游标分页：下一页游标，无更多数据时为 None
 
 
 class FavoriteItem(BaseModel):
@@ -79,6 +137,22 @@ class FavoriteBatchCheckResponse(BaseModel):
     results: dict[str, bool]
 
 
+class FavoriteUnifiedCheckRequest(BaseModel):
+    video_id: Optional[UUID] = Field(None, description="返回该视频及其下所有已收藏的字幕、单词、短语")
+    video_ids: List[UUID] = Field(default_factory=list, description="要检查的视频 ID")
+    subtitle_ids: List[int] = Field(default_factory=list, description="要检查的字幕 ID")
+    word_card_ids: List[UUID] = Field(default_factory=list, description="要检查的单词卡片 ID")
+    phrase_card_ids: List[UUID] = Field(default_factory=list, description="要检查的短语卡片 ID")
+
+
+class FavoriteUnifiedCheckResponse(BaseModel):
+    """各类型中已收藏的 ID（未收藏的不返回）"""
+    video_ids: List[UUID] = []
+    subtitle_ids: List[int] = []
+    word_card_ids: List[UUID] = []
+    phrase_card_ids: List[UUID] = []
+
+
 # Subtitle Favorites
 class SubtitleFavoriteItem(BaseModel):
     subtitle: SubtitleResponse
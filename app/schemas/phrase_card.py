@@ -34,3 +34,9 @@ class PhraseCardResponse(PhraseCardBase):
 class PhraseCardListResponse(BaseModel):
     total: int
     items: list[PhraseCardResponse]
+
+
+# 批量 upsert 响应
+class PhraseCardBatchResponse(PhraseCardListResponse):
+    inserted: int
+    updated: int
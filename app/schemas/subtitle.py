@@ -19,6 +19,21 @@ class SubtitleCreate(SubtitleBase):
     video_id: UUID = Field(..., description="视频 ID")
 
 
+# 整体替换视频字幕的结果
+class SubtitleReplaceResponse(BaseModel):
+    total: int  # 替换后的字幕条数
+    unchanged: int
+    updated: int
+    inserted: int
+    deleted: int
+
+
+# 字幕文件上传结果
+class SubtitleUploadResponse(BaseModel):
+    video_id: UUID
+    total: int  # 写入的字幕条数
+
+
 # 字幕响应
 class SubtitleResponse(SubtitleBase):
     id: int  # 字幕使用整型 ID
@@ -31,5 +46,47 @@ class SubtitleResponse(SubtitleBase):
 
 # 字幕列表响应
 class SubtitleListResponse(BaseModel):
-    total: int
+    total: int  # 本次返回的条数
     items: list[SubtitleResponse]
+    next_cursor: Optional[str] = None  # 分段拉取时的下一页游标，没有更多数据时为 null
+
+
+# 全库字幕检索结果
+class SubtitleSearchItem(BaseModel):
+    subtitle_id: int
+    video_id: UUID
+    video_title: str
+    video_title_zh: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    start_time: float
+    end_time: float
+    english_text: str
+    chinese_text: Optional[str] = None
+    highlight: str = Field(..., description="命中片段，关键词以 <em></em> 标记")
+
+
+# 全库字幕检索响应
+class SubtitleSearchResponse(BaseModel):
+    items: list[SubtitleSearchItem]
+    next_cursor: Optional[str] = None
+
+
+# 词形索引查询结果
+class SubtitleConcordanceItem(BaseModel):
+    subtitle_id: int
+    video_id: UUID
+    video_title: str
+    video_title_zh: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    start_time: float
+    end_time: float
+    english_text: str
+    chinese_text: Optional[str] = None
+    forms: list[str] = Field(default_factory=list, description="该字幕中出现的实际词形")
+
+
+# 词形索引查询响应
+class SubtitleConcordanceResponse(BaseModel):
+    lemma: str
+    items: list[SubtitleConcordanceItem]
+    next_cursor: Optional[str] = None
@@ -101,9 +101,36 @@ class VideoResponse(VideoBase):
         from_attributes = True
 
 
+# 视频组中单个片段的学习进度
+class VideoSegmentProgress(BaseModel):
+    video_id: UUID
+    segment_index: Optional[int] = None
+    duration: int
+    current_progress: int = 0
+    progress_percent: float = 0.0
+    is_completed: bool = False
+    last_watched_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+
+# 视频组整体学习进度（当前用户）
+class VideoGroupProgress(BaseModel):
+    group_id: UUID
+    segment_count: int
+    completed_count: int
+    watched_seconds: int  # 已完成的片段按全长计
+    total_seconds: int
+    progress_percent: float
+    is_completed: bool
+    last_watched_at: Optional[datetime] = None
+    next_segment_id: Optional[UUID] = None  # 继续学习：第一个未完成的片段
+    segments: List[VideoSegmentProgress] = []
+
+
 # 视频详情响应（包含子片段）
 class VideoDetailResponse(VideoResponse):
     segments: List[VideoBrief] = []
+    progress: Optional[VideoGroupProgress] = None  # include_progress=true 且为视频组时返回
 
     class Config:
         from_attributes = True
@@ -111,5 +138,30 @@ class VideoDetailResponse(VideoResponse):
 
 # 视频列表响应
 class VideoListResponse(BaseModel):
-    total: int
+    total: Optional[int] = None  # include_total=false 时为 None
     items: list[VideoResponse]
+    next_cursor: Optional[str] = None  # 游标分页：下一页游标，无更多数据时为 None
+
+
+# 批量导入（NDJSON 每行一个）
+class VideoImportItem(VideoCreate):
+    segments: List[VideoCreate] = Field(default_factory=list, description="片段列表（自动挂到该视频下）")
+    parent_youtube_id: Optional[str] = Field(
+        None, description="按 youtube_id 指定父视频（可引用同一文件中前面的行），与 parent_id 二选一"
+    )
+
+
+class VideoImportResult(BaseModel):
+    line: int
+    status: str  # created/updated/failed
+    id: Optional[UUID] = None
+    youtube_id: Optional[str] = None
+    segment_count: int = 0
+    error: Optional[str] = None
+
+
+class VideoImportResponse(BaseModel):
+    created: int
+    updated: int
+    failed: int
+    results: List[VideoImportResult]
@@ -33,3 +33,9 @@ class WordCardResponse(WordCardBase):
 class WordCardListResponse(BaseModel):
     total: int
     items: list[WordCardResponse]
+
+
+# 批量 upsert 响应
+class WordCardBatchResponse(WordCardListResponse):
+    inserted: int
+    updated: int
@@ -0,0 +1,72 @@
+from typing import List, Sequence, Tuple, Type, TypeVar
+
+from sqlalchemy import insert, func, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import Base
+
+ModelT = TypeVar("ModelT", bound=Base)
+
+# asyncpg 单条语句最多 32767 个参数，多行 VALUES 需按列数分块
+MAX_BIND_PARAMS = 32000
+
+
+def chunk_rows(rows: List[dict], width: int) -> List[List[dict]]:
+    """按每行列数把多行 VALUES 切分为不超过绑定参数上限的块"""
+    size = max(1, MAX_BIND_PARAMS // max(width, 1))
+    return [rows[i:i + size] for i in range(0, len(rows), size)]
+
+
+async def insert_returning(db: AsyncSession, model: Type[ModelT], rows: List[dict]) -> List[ModelT]:
+    """
+    集合式批量插入，返回带数据库生成字段（自增 id、created_at 等）的 ORM 对象，顺序与 rows 一致
+
+    SQLAlchemy 的 insertmanyvalues 会把参数列表改写为多行 INSERT ... VALUES ... RETURNING，
+    并按每页 1000 行、32700 个绑定参数自动分块，每块一次往返；提交后无需逐行 refresh。
+    """
+    if not rows:
+        return []
+    result = await db.scalars(
+        insert(model).returning(model, sort_by_parameter_order=True),
+        rows,
+    )
+    return list(result.all())
+
+
+async def upsert_returning(
+    db: AsyncSession,
+    model: Type[ModelT],
+    rows: List[dict],
+    index_elements: Sequence[str],
+) -> Tuple[List[ModelT], int]:
+    """
+    按自然键批量 upsert（INSERT ... ON CONFLICT DO UPDATE ... RETURNING），每块一条语句
+
+    - 只覆盖 rows 中给出的列，updated_at 置为当前时间
+    - 同一批内自然键重复时以最后一条为准（同一语句不能两次更新同一行）
+    - 返回 (ORM 对象列表, 新插入条数)
+    """
+    deduped = {tuple(row[key] for key in index_elements): row for row in rows}
+    rows = list(deduped.values())
+    if not rows:
+        return [], 0
+
+    objects: List[ModelT] = []
+    inserted = 0
+    # Python 端默认值（如 uuid 主键）也会占用绑定参数，按表的总列数估算
+    for chunk in chunk_rows(rows, len(model.__table__.columns)):
+        stmt = pg_insert(model).values(chunk)
+        set_ = {key: stmt.excluded[key] for key in chunk[0] if key not in index_elements}
+        if "updated_at" in model.__table__.c:
+            set_["updated_at"] = func.now()
+        stmt = (
+            stmt.on_conflict_do_update(index_elements=list(index_elements), set_=set_)
+            .returning(model, literal_column("xmax = 0").label("inserted"))
+            .execution_options(populate_existing=True)
+        )
+        result = await db.execute(stmt)
+        for obj, is_new in result.all():
+            objects.append(obj)
+            inserted += int(bool(is_new))
+    return objects, inserted
@@ -0,0 +1,33 @@
+from datetime import timedelta
+from uuid import UUID
+
+from sqlalchemy import update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.video import Video
+
+
+async def bump_content_version(db: AsyncSession, *video_ids: UUID) -> None:
+    """
+    递增视频的内容版本（字幕、单词卡、短语卡发生写入时调用）
+
+    需在写入所在的事务中调用，随事务一起提交；不修改 videos.updated_at。
+    content_updated_at 取整到秒且每次至少前进 1 秒：Last-Modified / If-Modified-Since 只有秒级精度，
+    同一秒内的两次写入也会得到不同的 Last-Modified，不会误判为未修改。
+    """
+    ids = {video_id for video_id in video_ids if video_id}
+    if not ids:
+        return
+    await db.execute(
+        update(Video)
+        .where(Video.id.in_(ids))
+        .values(
+            content_version=Video.content_version + 1,
+            content_updated_at=func.greatest(
+                func.date_trunc("second", func.now()),
+                Video.content_updated_at + timedelta(seconds=1),
+            ),
+            updated_at=Video.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,94 @@
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models.user_video_progress import UserVideoProgress
+from app.models.video import Video
+from app.schemas import VideoGroupProgress, VideoSegmentProgress
+from app.services.progress_buffer import progress_buffer
+
+
+def _percent(current: int, total: int) -> float:
+    if total <= 0:
+        return 0.0
+    return round(current / total * 100, 2)
+
+
+async def load_group_progress(db: AsyncSession, user_id: UUID, group_id: UUID) -> Optional[VideoGroupProgress]:
+    """
+    当前用户在视频组下各片段的学习进度及汇总
+
+    一条语句：视频组外连接其片段、再外连接该用户的进度（走 (user_id, video_id) 唯一索引）；
+    写回缓冲中尚未落库的进度会叠加在结果上。
+    视频不存在时返回 None，不是视频组时抛出 ValueError。
+    """
+    group = aliased(Video)
+    segment = aliased(Video)
+    result = await db.execute(
+        select(
+            group.video_type,
+            segment.id.label("segment_id"),
+            segment.segment_index,
+            segment.duration,
+            UserVideoProgress.current_progress,
+            UserVideoProgress.is_completed,
+            UserVideoProgress.last_watched_at,
+            UserVideoProgress.completed_at,
+        )
+        .select_from(group)
+        .outerjoin(segment, segment.parent_id == group.id)
+        .outerjoin(
+            UserVideoProgress,
+            and_(UserVideoProgress.video_id == segment.id, UserVideoProgress.user_id == user_id),
+        )
+        .where(group.id == group_id)
+        .order_by(segment.segment_index.asc().nullslast(), segment.id)
+    )
+    rows = result.all()
+    if not rows:
+        return None
+    if rows[0].video_type != "group":
+        raise ValueError("该视频不是视频组")
+
+    segments = []
+    for row in rows:
+        if row.segment_id is None:
+            continue
+        state = {
+            "current_progress": row.current_progress or 0,
+            "is_completed": bool(row.is_completed),
+            "last_watched_at": row.last_watched_at,
+            "completed_at": row.completed_at,
+        }
+        pending = progress_buffer.peek(user_id, row.segment_id)
+        if pending is not None:
+            state = {key: pending[key] for key in state}
+        current_progress = min(state["current_progress"], row.duration)
+        segments.append(VideoSegmentProgress(
+            video_id=row.segment_id,
+            segment_index=row.segment_index,
+            duration=row.duration,
+            progress_percent=100.0 if state["is_completed"] else _percent(current_progress, row.duration),
+            **{**state, "current_progress": current_progress},
+        ))
+
+    total_seconds = sum(s.duration for s in segments)
+    watched_seconds = sum(s.duration if s.is_completed else s.current_progress for s in segments)
+    completed_count = sum(1 for s in segments if s.is_completed)
+    watched_at = [s.last_watched_at for s in segments if s.last_watched_at is not None]
+    next_segment = next((s for s in segments if not s.is_completed), None)
+    return VideoGroupProgress(
+        group_id=group_id,
+        segment_count=len(segments),
+        completed_count=completed_count,
+        watched_seconds=watched_seconds,
+        total_seconds=total_seconds,
+        progress_percent=_percent(watched_seconds, total_seconds),
+        is_completed=bool(segments) and completed_count == len(segments),
+        last_watched_at=max(watched_at) if watched_at else None,
+        next_segment_id=next_segment.video_id if next_segment else None,
+        segments=segments,
+    )
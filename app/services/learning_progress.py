@@ -0,0 +1,310 @@
+import uuid
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from sqlalchemy import Boolean, Integer, DateTime, case, column, func, literal, or_, select, values
+from sqlalchemy.dialects.postgresql import UUID as PGUUID, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.models.user_video_progress import UserVideoProgress
+from app.models.video import Video
+from app.services.bulk_insert import chunk_rows
+
+# 观看进度达到时长的 90% 自动标记完成
+COMPLETION_RATIO = 0.9
+
+
+def reaches_completion(current_progress: int, total_duration: int) -> bool:
+    return current_progress >= total_duration * COMPLETION_RATIO
+
+
+def progress_row(
+    user_id: UUID,
+    video_id: UUID,
+    current_progress: int,
+    total_duration: int,
+    watched_at: datetime,
+    is_completed: bool = False,
+    completed_at: Optional[datetime] = None,
+) -> dict:
+    """构造一行待写入的进度；is_completed / completed_at 的含义取决于 upsert 的 explicit 模式"""
+    return {
+        "user_id": user_id,
+        "video_id": video_id,
+        "current_progress": min(current_progress, total_duration),
+        "watched_position": min(current_progress, total_duration),
+        "total_duration": total_duration,
+        "last_watched_at": watched_at,
+        "is_completed": is_completed,
+        "completed_at": completed_at if is_completed else None,
+    }
+
+
+def progress_upsert_statement(rows: List[dict], explicit: bool):
+    """
+    INSERT ... SELECT FROM (VALUES ...) JOIN videos JOIN users ON CONFLICT (user_id, video_id) DO UPDATE ... RETURNING
+
+    - explicit=True：行中的 is_completed / completed_at 是确定的结果（手动标记完成 / 取消完成），直接覆盖
+    - explicit=False：行中的 is_completed 表示"本次进度触发了自动完成"，与库中状态合并：
+      已完成的保持完成且不改 completed_at；未完成的在达到 90% 或行中已触发时标记完成
+    - 只接受不早于库中 last_watched_at 的写入（后写者胜），旧的批量 / 离线事件不会覆盖新进度
+    - 视频或用户已被删除的行在连接时丢弃（不写入也不返回），不会因外键约束使整批写入失败
+    """
+    table = UserVideoProgress.__table__
+    source_rows = values(
+        column("user_id", PGUUID(as_uuid=True)),
+        column("video_id", PGUUID(as_uuid=True)),
+        column("current_progress", Integer),
+        column("watched_position", Integer),
+        column("total_duration", Integer),
+        column("last_watched_at", DateTime(timezone=True)),
+        column("is_completed", Boolean),
+        column("completed_at", DateTime(timezone=True)),
+        name="progress_rows",
+    ).data([
+        # VALUES 中的 NULL 没有类型，未完成的行以 last_watched_at 占位，选取时再置空
+        (
+            row["user_id"], row["video_id"], row["current_progress"], row["watched_position"],
+            row["total_duration"], row["last_watched_at"], row["is_completed"], row["completed_at"] or row["last_watched_at"],
+        )
+        for row in rows
+    ])
+    source = (
+        select(
+            func.gen_random_uuid(),
+            source_rows.c.user_id,
+            source_rows.c.video_id,
+            source_rows.c.current_progress,
+            source_rows.c.watched_position,
+            source_rows.c.total_duration,
+            source_rows.c.is_completed,
+            source_rows.c.last_watched_at,
+            case((source_rows.c.is_completed, source_rows.c.completed_at), else_=None),
+        )
+        .join_from(source_rows, Video, Video.id == source_rows.c.video_id)
+        .join(User, User.id == source_rows.c.user_id)
+    )
+    stmt = pg_insert(table).from_select(
+        ["id", "user_id", "video_id", "current_progress", "watched_position", "total_duration",
+         "is_completed", "last_watched_at", "completed_at"],
+        source,
+    )
+    return _on_conflict_update(stmt, explicit)
+
+
+def video_progress_upsert_statement(
+    user_id: UUID,
+    video_id: UUID,
+    current_progress: Optional[int],
+    total_duration: Optional[int],
+    watched_at: datetime,
+    mark: Optional[bool] = None,
+):
+    """
+    单个视频的进度 upsert，一条 INSERT ... SELECT FROM videos ... ON CONFLICT ... RETURNING
+
+    - total_duration 为空时取视频时长，current_progress 为空时视为看完（等于时长），并截断到时长以内
+    - current_progress 为空（只做标记）时不改变 watched_position，标记不会被计为观看时长
+    - mark 为 True / False 时是手动标记完成 / 取消完成；为空时按 90% 规则与库中状态合并
+    - 视频不存在时不写入任何行（RETURNING 为空）
+    """
+    table = UserVideoProgress.__table__
+    duration = func.coalesce(literal(total_duration, Integer), Video.duration)
+    progress = duration if current_progress is None else func.least(literal(current_progress, Integer), duration)
+    watched = literal(watched_at, DateTime(timezone=True))
+
+    if mark is None:
+        is_completed = progress >= duration * COMPLETION_RATIO
+    else:
+        is_completed = literal(mark)
+    completed_at = case((is_completed, watched), else_=None)
+
+    source = select(
+        literal(uuid.uuid4(), table.c.id.type),
+        literal(user_id, table.c.user_id.type),
+        Video.id,
+        progress,
+        literal(0, Integer) if current_progress is None else progress,
+        duration,
+        is_completed,
+        watched,
+        completed_at,
+    ).where(Video.id == video_id)
+    stmt = pg_insert(table).from_select(
+        ["id", "user_id", "video_id", "current_progress", "watched_position", "total_duration",
+         "is_completed", "last_watched_at", "completed_at"],
+        source,
+    )
+    return _on_conflict_update(stmt, explicit=mark is not None, playback=current_progress is not None)
+
+
+def _on_conflict_update(stmt, explicit: bool, playback: bool = True):
+    """playback=False 表示只做标记的写入，保留库中的 watched_position"""
+    table = UserVideoProgress.__table__
+    excluded = stmt.excluded
+
+    if explicit:
+        is_completed = excluded.is_completed
+        completed_at = excluded.completed_at
+    else:
+        reached = or_(
+            excluded.is_completed,
+            excluded.current_progress >= excluded.total_duration * COMPLETION_RATIO,
+        )
+        is_completed = or_(table.c.is_completed, reached)
+        completed_at = case(
+            (table.c.is_completed, table.c.completed_at),
+            (reached, func.coalesce(excluded.completed_at, excluded.last_watched_at)),
+            else_=None,
+        )
+
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.video_id],
+        set_={
+            "current_progress": excluded.current_progress,
+            "watched_position": excluded.watched_position if playback else table.c.watched_position,
+            "total_duration": excluded.total_duration,
+            "last_watched_at": excluded.last_watched_at,
+            "is_completed": is_completed,
+            "completed_at": completed_at,
+            "updated_at": func.now(),
+        },
+        where=table.c.last_watched_at <= excluded.last_watched_at,
+    ).returning(*table.c)
+
+
+async def upsert_progress(db: AsyncSession, rows: List[dict], explicit: bool) -> list:
+    """按块执行进度 upsert（不提交），返回写入后的行；被后写者胜规则跳过或视频 / 用户已删除的行不会返回"""
+    if not rows:
+        return []
+    written = []
+    for chunk in chunk_rows(rows, len(rows[0])):
+        result = await db.execute(progress_upsert_statement(chunk, explicit))
+        written.extend(result.all())
+    return written
+
+
+async def write_video_progress(
+    db: AsyncSession,
+    user_id: UUID,
+    video_id: UUID,
+    current_progress: Optional[int],
+    total_duration: Optional[int],
+    watched_at: datetime,
+    mark: Optional[bool] = None,
+):
+    """
+    执行单个视频的进度 upsert（不提交），返回写入后的行；视频不存在时返回 None
+
+    并发写入被后写者胜规则跳过时，返回库中已有的更新的行。
+    """
+    result = await db.execute(
+        video_progress_upsert_statement(user_id, video_id, current_progress, total_duration, watched_at, mark)
+    )
+    row = result.first()
+    if row is not None:
+        return row
+    result = await db.execute(
+        select(*UserVideoProgress.__table__.c).where(
+            UserVideoProgress.user_id == user_id,
+            UserVideoProgress.video_id == video_id,
+        )
+    )
+    return result.first()
+
+
+def progress_sync_statement(user_id: UUID, events: List[dict]):
+    """
+    离线进度事件的集合式合并写入：一条 INSERT ... SELECT ... ON CONFLICT ... RETURNING
+
+    events: [{"video_id", "current_progress", "total_duration", "is_completed", "watched_at"}]
+    - 按视频取客户端时间最新的事件作为进度（后写者胜），比库中更旧时保留库中进度
+    - 完成状态单调：任一事件手动标记完成或达到 90% 即完成，completed_at 取最早的完成时间；
+      离线事件不会取消已完成的视频
+    - 不存在的视频被忽略
+    """
+    table = UserVideoProgress.__table__
+    source_events = values(
+        column("video_id", PGUUID(as_uuid=True)),
+        column("current_progress", Integer),
+        column("total_duration", Integer),
+        column("is_completed", Boolean),
+        column("watched_at", DateTime(timezone=True)),
+        name="events",
+    ).data([
+        # VALUES 中的 NULL 没有类型，用 0 / False 表示"未提供"
+        (e["video_id"], e["current_progress"], e["total_duration"] or 0, e["is_completed"] is True, e["watched_at"])
+        for e in events
+    ])
+
+    duration = func.coalesce(func.nullif(source_events.c.total_duration, 0), Video.duration)
+    progress = func.least(source_events.c.current_progress, duration)
+    merged = (
+        select(
+            source_events.c.video_id,
+            source_events.c.watched_at,
+            progress.label("current_progress"),
+            duration.label("total_duration"),
+            or_(source_events.c.is_completed, progress >= duration * COMPLETION_RATIO).label("reached"),
+        )
+        .join_from(source_events, Video, Video.id == source_events.c.video_id)
+        .cte("merged_events")
+    )
+    latest = (
+        select(merged.c.video_id, merged.c.current_progress, merged.c.total_duration, merged.c.watched_at)
+        .distinct(merged.c.video_id)
+        .order_by(merged.c.video_id, merged.c.watched_at.desc())
+        .subquery("latest")
+    )
+    first_completed = (
+        select(
+            merged.c.video_id,
+            func.min(merged.c.watched_at).filter(merged.c.reached).label("completed_at"),
+        )
+        .group_by(merged.c.video_id)
+        .subquery("first_completed")
+    )
+    source = select(
+        func.gen_random_uuid(),
+        literal(user_id, table.c.user_id.type),
+        latest.c.video_id,
+        latest.c.current_progress,
+        latest.c.current_progress,
+        latest.c.total_duration,
+        first_completed.c.completed_at.is_not(None),
+        latest.c.watched_at,
+        first_completed.c.completed_at,
+    ).join(first_completed, first_completed.c.video_id == latest.c.video_id)
+
+    stmt = pg_insert(table).from_select(
+        ["id", "user_id", "video_id", "current_progress", "watched_position", "total_duration",
+         "is_completed", "last_watched_at", "completed_at"],
+        source,
+    )
+    excluded = stmt.excluded
+    newer = table.c.last_watched_at <= excluded.last_watched_at
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.video_id],
+        set_={
+            "current_progress": case((newer, excluded.current_progress), else_=table.c.current_progress),
+            "watched_position": case((newer, excluded.watched_position), else_=table.c.watched_position),
+            "total_duration": case((newer, excluded.total_duration), else_=table.c.total_duration),
+            "last_watched_at": func.greatest(table.c.last_watched_at, excluded.last_watched_at),
+            "is_completed": or_(table.c.is_completed, excluded.is_completed),
+            "completed_at": case(
+                (table.c.is_completed, func.least(table.c.completed_at, excluded.completed_at)),
+                else_=excluded.completed_at,
+            ),
+            "updated_at": func.now(),
+        },
+    ).returning(*table.c)
+
+
+async def sync_progress_events(db: AsyncSession, user_id: UUID, events: List[dict]) -> list:
+    """合并写入一批离线进度事件（不提交），返回写入后的行"""
+    if not events:
+        return []
+    result = await db.execute(progress_sync_statement(user_id, events))
+    return result.all()
@@ -0,0 +1,298 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.user_video_progress import UserVideoProgress
+from app.models.video import Video
+from app.services.learning_progress import progress_row, reaches_completion, upsert_progress
+
+logger = logging.getLogger(__name__)
+
+ProgressKey = Tuple[UUID, UUID]  # (user_id, video_id)
+CompletionState = Tuple[bool, Optional[datetime]]  # (is_completed, completed_at)
+
+# 视频时长缓存有效期（秒）；时长极少变化，过期后重新读取
+_DURATION_TTL_SECONDS = 300
+
+
+@dataclass
+class PendingProgress:
+    """
+    某用户某视频尚未落库的最新进度
+
+    完成状态以"相对库中状态的变化"记录，落库时在 SQL 中与当前行合并，保证与逐条写入的结果一致：
+    - mark：期间最后一次手动标记（True 完成 / False 取消），之后的状态完全确定
+    - auto_at：没有手动标记时，进度首次达到 90% 的时间（库中未完成时才生效）
+    """
+    current_progress: int
+    total_duration: int
+    watched_at: datetime
+    mark: Optional[bool] = None
+    mark_at: Optional[datetime] = None
+    auto_at: Optional[datetime] = None
+
+    def completion(self, known: CompletionState) -> CompletionState:
+        if self.mark is not None:
+            return self.mark, self.mark_at
+        if known[0]:
+            return known
+        if self.auto_at is not None:
+            return True, self.auto_at
+        return False, None
+
+    def absorb(self, older: "PendingProgress") -> None:
+        """写入失败回退时，把更早的一批变化合并到当前（更新的）条目之下"""
+        if self.mark is not None:
+            return
+        if older.mark is True:
+            self.mark, self.mark_at, self.auto_at = True, older.mark_at, None
+        elif older.mark is False:
+            # 先取消完成，之后若又达到 90% 则重新标记完成
+            if self.auto_at is not None:
+                self.mark, self.mark_at = True, self.auto_at
+            else:
+                self.mark, self.mark_at = False, None
+            self.auto_at = None
+        elif older.auto_at is not None:
+            self.auto_at = older.auto_at
+
+
+class ProgressBuffer:
+    """
+    学习进度心跳的写回缓冲（write-behind）
+
+    - 心跳只更新内存中每个 (用户, 视频) 的最新进度，不访问数据库（首次出现时读取一次完成状态）
+    - 每 PROGRESS_FLUSH_SECONDS 秒把所有待写条目合并为一条批量 upsert 落库
+    - 应用关闭时最后落库一次；落库失败的条目放回缓冲等待下次重试
+    - 视频或用户已被删除的条目落库时直接丢弃，不会让整批数据反复失败
+    - 多 worker 部署下各自缓冲，库中以 last_watched_at 后写者胜
+    """
+
+    def __init__(self) -> None:
+        self._pending: Dict[ProgressKey, PendingProgress] = {}
+        self._known: "OrderedDict[ProgressKey, CompletionState]" = OrderedDict()
+        self._durations: Dict[UUID, Tuple[int, float]] = {}
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.heartbeats = 0
+        self.flushes = 0
+        self.rows_flushed = 0
+        self.last_flush_seconds = 0.0
+
+    # ------------------------------------------------------------------
+    # 读取
+    # ------------------------------------------------------------------
+
+    async def video_duration(self, db: AsyncSession, video_id: UUID) -> Optional[int]:
+        cached = self._durations.get(video_id)
+        if cached and time.monotonic() - cached[1] < _DURATION_TTL_SECONDS:
+            return cached[0]
+        result = await db.execute(select(Video.duration).where(Video.id == video_id))
+        duration = result.scalar_one_or_none()
+        if duration is None:
+            self._durations.pop(video_id, None)
+            return None
+        self._durations[video_id] = (duration, time.monotonic())
+        return duration
+
+    async def _known_state(self, db: AsyncSession, key: ProgressKey) -> CompletionState:
+        state = self._known.get(key)
+        if state is not None:
+            self._known.move_to_end(key)
+            return state
+        result = await db.execute(
+            select(UserVideoProgress.is_completed, UserVideoProgress.completed_at).where(
+                UserVideoProgress.user_id == key[0],
+                UserVideoProgress.video_id == key[1],
+            )
+        )
+        row = result.first()
+        state = (bool(row.is_completed), row.completed_at) if row else (False, None)
+        self._remember(key, state)
+        return state
+
+    def _remember(self, key: ProgressKey, state: CompletionState) -> None:
+        self._known[key] = state
+        self._known.move_to_end(key)
+        while len(self._known) > settings.PROGRESS_KNOWN_STATES_MAX:
+            self._known.popitem(last=False)
+
+    def peek(self, user_id: UUID, video_id: UUID) -> Optional[dict]:
+        """返回尚未落库的最新进度（用于读接口叠加），没有待写条目时返回 None"""
+        key = (user_id, video_id)
+        entry = self._pending.get(key)
+        if entry is None:
+            return None
+        is_completed, completed_at = entry.completion(self._known.get(key, (False, None)))
+        return {
+            "video_id": video_id,
+            "current_progress": entry.current_progress,
+            "total_duration": entry.total_duration,
+            "is_completed": is_completed,
+            "last_watched_at": entry.watched_at,
+            "completed_at": completed_at,
+        }
+
+    # ------------------------------------------------------------------
+    # 写入
+    # ------------------------------------------------------------------
+
+    async def record(
+        self,
+        db: AsyncSession,
+        user_id: UUID,
+        video_id: UUID,
+        current_progress: int,
+        total_duration: int,
+        is_completed: Optional[bool],
+    ) -> dict:
+        """记录一次心跳，返回合并后的进度（与逐条写库时接口返回的内容一致）"""
+        key = (user_id, video_id)
+        await self._known_state(db, key)
+        # 等待查询期间可能已有一次落库更新了已知状态，这里重新读取
+        known = self._known.get(key, (False, None))
+        now = datetime.now(timezone.utc)
+        current_progress = min(current_progress, total_duration)
+
+        entry = self._pending.get(key)
+        if entry is None:
+            entry = PendingProgress(current_progress, total_duration, now)
+            self._pending[key] = entry
+        entry.current_progress = current_progress
+        entry.total_duration = total_duration
+        entry.watched_at = now
+
+        if is_completed is True:
+            entry.mark, entry.mark_at, entry.auto_at = True, now, None
+        elif is_completed is False:
+            entry.mark, entry.mark_at, entry.auto_at = False, None, None
+        elif reaches_completion(current_progress, total_duration) and not entry.completion(known)[0]:
+            if entry.mark is False:
+                entry.mark, entry.mark_at = True, now
+            else:
+                entry.auto_at = now
+
+        self.heartbeats += 1
+        return self.peek(user_id, video_id)
+
+    async def discard(self, user_id: UUID, video_id: UUID) -> None:
+        """
+        进度被删除前丢弃缓冲中的条目与已知状态
+
+        先等待进行中的落库结束，调用方随后删除的行不会再被这批数据写回。
+        """
+        key = (user_id, video_id)
+        async with self._flush_lock:
+            self._pending.pop(key, None)
+            self._known.pop(key, None)
+
+    def remember(self, user_id: UUID, video_id: UUID, is_completed: bool, completed_at: Optional[datetime]) -> None:
+        """其他接口直接写库后同步已知完成状态"""
+        key = (user_id, video_id)
+        self._pending.pop(key, None)
+        self._remember(key, (is_completed, completed_at))
+
+    def refresh(self, user_id: UUID, video_id: UUID, is_completed: bool, completed_at: Optional[datetime]) -> None:
+        """其他接口合并写库后更新已知完成状态，保留缓冲中的待写进度"""
+        self._remember((user_id, video_id), (is_completed, completed_at))
+
+    async def flush(self) -> int:
+        """把当前所有待写条目合并为批量 upsert 落库，返回写入行数"""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            started = time.monotonic()
+
+            explicit_rows, relative_rows = [], []
+            for (user_id, video_id), entry in batch.items():
+                # 落库完成前到达的心跳以这批数据的结果为已知状态
+                self._remember((user_id, video_id), entry.completion(self._known.get((user_id, video_id), (False, None))))
+                if entry.mark is not None:
+                    explicit_rows.append(progress_row(
+                        user_id, video_id, entry.current_progress, entry.total_duration,
+                        entry.watched_at, entry.mark, entry.mark_at,
+                    ))
+                else:
+                    relative_rows.append(progress_row(
+                        user_id, video_id, entry.current_progress, entry.total_duration,
+                        entry.watched_at, entry.auto_at is not None, entry.auto_at,
+                    ))
+
+            try:
+                async with SessionLocal() as db:
+                    written = await upsert_progress(db, explicit_rows, explicit=True)
+                    written += await upsert_progress(db, relative_rows, explicit=False)
+                    await db.commit()
+            except Exception:
+                logger.exception("学习进度批量落库失败，%s 条放回缓冲", len(batch))
+                for key, older in batch.items():
+                    newer = self._pending.get(key)
+                    if newer is None:
+                        self._pending[key] = older
+                    else:
+                        newer.absorb(older)
+                return 0
+
+            for row in written:
+                key = (row.user_id, row.video_id)
+                if key not in self._pending:
+                    self._remember(key, (row.is_completed, row.completed_at))
+
+            self.flushes += 1
+            self.rows_flushed += len(written)
+            self.last_flush_seconds = round(time.monotonic() - started, 4)
+            return len(written)
+
+    # ------------------------------------------------------------------
+    # 生命周期
+    # ------------------------------------------------------------------
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.PROGRESS_FLUSH_SECONDS)
+            try:
+                # stop() 取消定时任务时，进行中的落库继续完成，已取出的这批数据不会丢失
+                await asyncio.shield(self.flush())
+            except Exception:
+                logger.exception("学习进度定时落库异常")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """停止定时任务并把剩余数据落库（应用关闭时调用；进行中的落库完成后才会执行最后一次）"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "pending": len(self._pending),
+            "known_states": len(self._known),
+            "heartbeats": self.heartbeats,
+            "flushes": self.flushes,
+            "rows_flushed": self.rows_flushed,
+            "last_flush_seconds": self.last_flush_seconds,
+            # 每次落库平均合并的心跳数，即写库次数的缩减倍数
+            "coalescing_ratio": round(self.heartbeats / self.rows_flushed, 2) if self.rows_flushed else 0.0,
+        }
+
+
+progress_buffer = ProgressBuffer()
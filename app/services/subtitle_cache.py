@@ -0,0 +1,90 @@
+import gzip
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional
+from uuid import UUID
+
+from app.core.config import settings
+
+
+@dataclass
+class SubtitlePayload:
+    """单个视频已序列化并压缩的完整字幕响应"""
+    content_version: int
+    gzip_body: bytes
+    raw_size: int
+
+    def body(self, accept_gzip: bool) -> bytes:
+        return self.gzip_body if accept_gzip else gzip.decompress(self.gzip_body)
+
+
+class SubtitleCache:
+    """
+    按视频缓存完整字幕列表的 JSON 响应（gzip 压缩后存储）
+
+    - 以 (video_id, content_version) 为键：字幕写入会递增内容版本，旧条目自然失效，
+      多 worker 部署下无需广播失效
+    - 命中时直接返回压缩字节，不查询字幕表、不经过 Pydantic 校验与序列化
+    - 按压缩后字节数做 LRU 淘汰，总量不超过 SUBTITLE_CACHE_MAX_BYTES
+    """
+
+    def __init__(self) -> None:
+        self._entries: "OrderedDict[UUID, SubtitlePayload]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, video_id: UUID, content_version: int) -> Optional[SubtitlePayload]:
+        entry = self._entries.get(video_id)
+        if entry is None or entry.content_version != content_version:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(video_id)
+        self.hits += 1
+        return entry
+
+    def put(self, video_id: UUID, content_version: int, body: bytes) -> SubtitlePayload:
+        entry = SubtitlePayload(
+            content_version=content_version,
+            gzip_body=gzip.compress(body, compresslevel=settings.SUBTITLE_CACHE_GZIP_LEVEL),
+            raw_size=len(body),
+        )
+        if len(entry.gzip_body) > settings.SUBTITLE_CACHE_MAX_BYTES:
+            return entry
+
+        current = self._entries.get(video_id)
+        if current is not None and current.content_version > content_version:
+            # 并发请求读到了更旧的版本，不覆盖
+            return entry
+        self.invalidate(video_id)
+        self._entries[video_id] = entry
+        self._bytes += len(entry.gzip_body)
+        while self._bytes > settings.SUBTITLE_CACHE_MAX_BYTES:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted.gzip_body)
+            self.evictions += 1
+        return entry
+
+    def invalidate(self, *video_ids: UUID) -> None:
+        """字幕写入后释放对应条目（版本号已保证正确性，这里只是尽早回收内存）"""
+        for video_id in video_ids:
+            entry = self._entries.pop(video_id, None)
+            if entry is not None:
+                self._bytes -= len(entry.gzip_body)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "raw_bytes": sum(entry.raw_size for entry in self._entries.values()),
+            "max_bytes": settings.SUBTITLE_CACHE_MAX_BYTES,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+subtitle_cache = SubtitleCache()
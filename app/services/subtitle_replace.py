@@ -0,0 +1,221 @@
+from bisect import bisect_left
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import Integer, select, update, delete, bindparam, column, exists, values
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.phrase_card import PhraseCard
+from app.models.subtitle import Subtitle
+from app.models.user_subtitle_favorite import UserSubtitleFavorite
+from app.models.word_card import WordCard
+from app.schemas import SubtitleBase, SubtitleReplaceResponse
+from app.services.bulk_insert import chunk_rows, insert_returning
+from app.services.content_version import bump_content_version
+
+# 参与比较的内容字段；不变的行不会被写入
+_CONTENT_FIELDS = ("start_time", "end_time", "english_text", "chinese_text", "sequence_number", "word_refs")
+
+_MILLIS = Decimal("0.001")
+
+
+def _time(value) -> Decimal:
+    return Decimal(str(value)).quantize(_MILLIS)
+
+
+def _incoming_row(item: SubtitleBase) -> dict:
+    row = item.model_dump()
+    row["start_time"] = _time(row["start_time"])
+    row["end_time"] = _time(row["end_time"])
+    row["word_refs"] = row.get("word_refs") or {}
+    return row
+
+
+def _unique_keys(values: Sequence[Optional[object]]) -> set:
+    """只有非空且唯一的值才能作为匹配键"""
+    seen, duplicates = set(), set()
+    for value in values:
+        if value is None:
+            continue
+        (duplicates if value in seen else seen).add(value)
+    return seen - duplicates
+
+
+def _match(existing: List[Subtitle], incoming: List[dict]) -> Dict[int, Subtitle]:
+    """
+    将新字幕行匹配到已有字幕，返回 {新行下标: 已有字幕}
+
+    先按 sequence_number（两侧均唯一时）匹配，剩余的再按 start_time 精确匹配。
+    """
+    matched: Dict[int, Subtitle] = {}
+    used: set = set()
+
+    seq_keys = _unique_keys([row["sequence_number"] for row in incoming]) & _unique_keys(
+        [subtitle.sequence_number for subtitle in existing]
+    )
+    by_seq = {s.sequence_number: s for s in existing if s.sequence_number in seq_keys}
+    for index, row in enumerate(incoming):
+        subtitle = by_seq.get(row["sequence_number"])
+        if subtitle is not None:
+            matched[index] = subtitle
+            used.add(subtitle.id)
+
+    by_start: Dict[Decimal, List[Subtitle]] = {}
+    for subtitle in existing:
+        if subtitle.id not in used:
+            by_start.setdefault(_time(subtitle.start_time), []).append(subtitle)
+    for index, row in enumerate(incoming):
+        if index in matched:
+            continue
+        candidates = by_start.get(row["start_time"])
+        if candidates:
+            subtitle = candidates.pop(0)
+            matched[index] = subtitle
+            used.add(subtitle.id)
+    return matched
+
+
+def _changed(subtitle: Subtitle, row: dict) -> bool:
+    for field in _CONTENT_FIELDS:
+        current = getattr(subtitle, field)
+        if field in ("start_time", "end_time"):
+            current = _time(current)
+        elif field == "word_refs":
+            current = current or {}
+        if current != row[field]:
+            return True
+    return False
+
+
+def _nearest(targets: List[tuple], start_time: Decimal) -> Optional[int]:
+    """在按 start_time 排序的 [(start_time, id)] 中找时间最近的字幕 ID"""
+    if not targets:
+        return None
+    pos = bisect_left(targets, (start_time,))
+    candidates = targets[max(pos - 1, 0):pos + 1]
+    return min(candidates, key=lambda target: abs(target[0] - start_time))[1]
+
+
+async def _repoint_favorites(db: AsyncSession, mapping: List[dict]) -> None:
+    """
+    把收藏从被删除字幕改挂到新字幕，每个 (用户, 新字幕) 只保留一条
+
+    多条旧字幕可能映射到同一条新字幕：用户尚未收藏新字幕时保留其中最早收藏的一条改挂，
+    其余（以及用户已收藏新字幕时的全部旧收藏）删除，避免违反 (user_id, subtitle_id) 唯一约束。
+    """
+    favorites = UserSubtitleFavorite.__table__
+    existing = favorites.alias("existing")
+    moves = values(column("old_id", Integer), column("new_id", Integer), name="moves").data(
+        [(m["old_id"], m["new_id"]) for m in mapping]
+    )
+    keepers = (
+        select(favorites.c.id, moves.c.new_id)
+        .join_from(favorites, moves, favorites.c.subtitle_id == moves.c.old_id)
+        .where(~exists().where(
+            existing.c.user_id == favorites.c.user_id,
+            existing.c.subtitle_id == moves.c.new_id,
+        ))
+        .distinct(favorites.c.user_id, moves.c.new_id)
+        .order_by(favorites.c.user_id, moves.c.new_id, favorites.c.favorited_at, favorites.c.id)
+        .cte("keepers")
+    )
+    await db.execute(
+        delete(favorites).where(
+            favorites.c.subtitle_id.in_(select(moves.c.old_id)),
+            favorites.c.id.not_in(select(keepers.c.id)),
+        )
+    )
+    await db.execute(
+        update(favorites)
+        .where(favorites.c.id == keepers.c.id)
+        .values(subtitle_id=keepers.c.new_id)
+    )
+
+
+async def _repoint_references(db: AsyncSession, mapping: List[dict]) -> None:
+    """
+    把引用被删除字幕的单词卡、短语卡和用户收藏改挂到时间最近的新字幕上
+
+    mapping: [{"old_id": ..., "new_id": ...}]；new_id 为空表示新字幕为空，卡片引用置空、收藏随级联删除
+    """
+    targets = [m for m in mapping if m["new_id"] is not None]
+    orphans = [m["old_id"] for m in mapping if m["new_id"] is None]
+
+    if targets:
+        for model in (WordCard, PhraseCard):
+            await db.execute(
+                update(model.__table__)
+                .where(model.__table__.c.subtitle_id == bindparam("old_id"))
+                .values(subtitle_id=bindparam("new_id")),
+                targets,
+            )
+
+        for chunk in chunk_rows(targets, 2):
+            await _repoint_favorites(db, chunk)
+
+    if orphans:
+        for model in (WordCard, PhraseCard):
+            await db.execute(
+                update(model).where(model.subtitle_id.in_(orphans)).values(subtitle_id=None)
+                .execution_options(synchronize_session=False)
+            )
+
+
+async def replace_subtitles(
+    db: AsyncSession, video_id: UUID, items: List[SubtitleBase]
+) -> SubtitleReplaceResponse:
+    """
+    在当前事务中用 items 整体替换视频的字幕（不提交）
+
+    - 已有行按 sequence_number / start_time 匹配，内容不变的不写入，变化的按主键批量更新
+    - 多出的新行批量插入，不再出现的旧行批量删除
+    - 被删除字幕上的单词卡、短语卡和收藏改挂到时间最近的字幕，不会悬空或丢失
+    """
+    result = await db.execute(
+        select(Subtitle).where(Subtitle.video_id == video_id).order_by(Subtitle.start_time, Subtitle.id)
+    )
+    existing = list(result.scalars().all())
+    incoming = [_incoming_row(item) for item in items]
+    matched = _match(existing, incoming)
+
+    updates = [
+        {**row, "id": matched[index].id}
+        for index, row in enumerate(incoming)
+        if index in matched and _changed(matched[index], row)
+    ]
+    inserts = [{**row, "video_id": video_id} for index, row in enumerate(incoming) if index not in matched]
+    kept_ids = {subtitle.id for subtitle in matched.values()}
+    removed = [subtitle for subtitle in existing if subtitle.id not in kept_ids]
+
+    if updates:
+        # ORM 按主键批量更新（executemany）
+        await db.execute(update(Subtitle), updates)
+    inserted = await insert_returning(db, Subtitle, inserts)
+
+    if removed:
+        final = sorted(
+            [(row["start_time"], matched[index].id) for index, row in enumerate(incoming) if index in matched]
+            + [(_time(subtitle.start_time), subtitle.id) for subtitle in inserted]
+        )
+        mapping = [
+            {"old_id": subtitle.id, "new_id": _nearest(final, _time(subtitle.start_time))}
+            for subtitle in removed
+        ]
+        await _repoint_references(db, mapping)
+        await db.execute(
+            delete(Subtitle)
+            .where(Subtitle.id.in_([subtitle.id for subtitle in removed]))
+            .execution_options(synchronize_session=False)
+        )
+
+    if updates or inserted or removed:
+        await bump_content_version(db, video_id)
+
+    return SubtitleReplaceResponse(
+        total=len(incoming),
+        unchanged=len(matched) - len(updates),
+        updated=len(updates),
+        inserted=len(inserted),
+        deleted=len(removed),
+    )
@@ -0,0 +1,163 @@
+import asyncio
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.video import Video
+from app.utils.http_cache import make_etag
+from app.utils.serialization import json_bytes
+
+# 单个视频对分面的贡献：(分类名列表, (作者, 头像) 或 None)
+FacetContribution = Tuple[Tuple[str, ...], Optional[Tuple[str, Optional[str]]]]
+
+
+def _contribution(
+    categories: Optional[list],
+    categories_zh: Optional[list],
+    original_author: Optional[str],
+    author_avatar_url: Optional[str],
+    video_type: Optional[str],
+) -> FacetContribution:
+    # 与原先 SQL 一致：优先中文分类，为空时回退到英文分类
+    source = categories_zh if categories_zh else categories
+    names = []
+    for value in source or []:
+        if not isinstance(value, str):
+            continue
+        name = value.strip()
+        if name and name not in names:
+            names.append(name)
+
+    # 作者只统计主视频（不含片段）
+    author = None
+    if original_author and video_type != 'segment':
+        author = (original_author, author_avatar_url)
+    return tuple(names), author
+
+
+def facet_contribution(video: Video) -> FacetContribution:
+    """计算视频当前字段对分面的贡献，用于增量维护"""
+    return _contribution(
+        video.categories,
+        video.categories_zh,
+        video.original_author,
+        video.author_avatar_url,
+        video.video_type,
+    )
+
+
+class VideoFacetCache:
+    """
+    视频分类 / 作者分面的内存缓存
+
+    - 首次读取时扫描一次 videos 表，之后由视频增删改接口增量维护计数
+    - 读取时直接返回预先序列化的 JSON 和对应的 ETag，不访问数据库
+    - 每隔 FACETS_RESYNC_SECONDS 全量重建一次，使多进程部署下各 worker 收敛
+    """
+
+    def __init__(self) -> None:
+        self._categories: Counter = Counter()
+        self._authors: Counter = Counter()
+        self._loaded_at: Optional[float] = None
+        self._writes = 0
+        self._lock = asyncio.Lock()
+        self._payloads: Dict[str, Tuple[bytes, str]] = {}
+
+    def _is_fresh(self) -> bool:
+        if self._loaded_at is None:
+            return False
+        return time.monotonic() - self._loaded_at < settings.FACETS_RESYNC_SECONDS
+
+    async def _ensure_loaded(self, db: AsyncSession) -> None:
+        if self._is_fresh():
+            return
+        async with self._lock:
+            if self._is_fresh():
+                return
+            writes_before = self._writes
+            result = await db.execute(
+                select(
+                    Video.categories,
+                    Video.categories_zh,
+                    Video.original_author,
+                    Video.author_avatar_url,
+                    Video.video_type,
+                )
+            )
+            categories: Counter = Counter()
+            authors: Counter = Counter()
+            for row in result.all():
+                names, author = _contribution(*row)
+                categories.update(names)
+                if author:
+                    authors[author] += 1
+            self._categories = categories
+            self._authors = authors
+            self._payloads.clear()
+            # 扫描期间有写入时无法确定是否已包含，下次读取再重建
+            self._loaded_at = time.monotonic() if self._writes == writes_before else None
+
+    def replace(
+        self,
+        before: Optional[FacetContribution],
+        after: Optional[FacetContribution],
+    ) -> None:
+        """用视频修改前后的贡献增量更新计数（新增传 before=None，删除传 after=None）"""
+        self._writes += 1
+        if before == after:
+            return
+        if before:
+            names, author = before
+            self._categories.subtract(names)
+            if author:
+                self._authors[author] -= 1
+        if after:
+            names, author = after
+            self._categories.update(names)
+            if author:
+                self._authors[author] += 1
+        self._categories = +self._categories
+        self._authors = +self._authors
+        self._payloads.clear()
+
+    def invalidate(self) -> None:
+        """标记缓存失效，下次读取时全量重建（如级联删除等无法增量计算的场景）"""
+        self._writes += 1
+        self._loaded_at = None
+        self._payloads.clear()
+
+    def _payload(self, key: str, build) -> Tuple[bytes, str]:
+        cached = self._payloads.get(key)
+        if cached is None:
+            body = json_bytes(build())
+            cached = (body, make_etag(body))
+            self._payloads[key] = cached
+        return cached
+
+    async def categories(self, db: AsyncSession) -> Tuple[bytes, str]:
+        """返回 (分类列表 JSON, ETag)"""
+        await self._ensure_loaded(db)
+        return self._payload(
+            "categories",
+            lambda: sorted(self._categories, key=str.lower),
+        )
+
+    async def authors(self, db: AsyncSession) -> Tuple[bytes, str]:
+        """返回 (作者列表 JSON, ETag)"""
+        await self._ensure_loaded(db)
+
+        def build() -> List[dict]:
+            items = sorted(self._authors.items(), key=lambda item: (-item[1], item[0][0]))
+            return [
+                {"name": name, "avatar_url": avatar_url, "video_count": count}
+                for (name, avatar_url), count in items
+            ]
+
+        return self._payload("authors", build)
+
+
+video_facets = VideoFacetCache()
@@ -0,0 +1,337 @@
+import logging
+import uuid
+from typing import AsyncIterator, Dict, FrozenSet, List, Optional, Tuple
+from uuid import UUID
+
+from pydantic import ValidationError
+from sqlalchemy import select, delete, update, func, literal_column, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.tag import Tag, DEFAULT_TAG_TYPE
+from app.models.video import Video
+from app.models.video_tag import VideoTag
+from app.schemas import VideoCreate, VideoImportItem, VideoImportResult, VideoImportResponse
+from app.services.bulk_insert import chunk_rows
+from app.services.video_facets import video_facets
+from app.utils.normalize import normalize_names
+
+logger = logging.getLogger(__name__)
+
+# 每个事务处理的 NDJSON 行数
+IMPORT_BATCH_SIZE = 500
+
+# ON CONFLICT 更新时不覆盖的列
+_INSERT_ONLY_COLUMNS = {"id", "status"}
+
+
+def _video_row(item: VideoCreate, parent_id: Optional[UUID] = None) -> dict:
+    row = item.model_dump(exclude={"tags", "categories", "categories_zh", "segments", "parent_youtube_id"})
+    row["categories"] = normalize_names(item.categories)
+    row["categories_zh"] = normalize_names(item.categories_zh)
+    if parent_id is not None:
+        row["parent_id"] = parent_id
+    if row.get("parent_id"):
+        row["video_type"] = "segment"
+    row["id"] = uuid.uuid4()
+    row["status"] = "published"
+    return row
+
+
+def _update_columns(item: VideoCreate, row: dict) -> FrozenSet[str]:
+    """
+    更新已有视频时覆盖的列：只取导入行中实际出现的字段
+
+    未出现的字段（如 display_order、is_published）在新建时取默认值，更新时保持原值；
+    父视频与随之推导出的 video_type 由导入逻辑给出，总是覆盖。
+    """
+    columns = set(item.model_fields_set) & set(row)
+    if row.get("parent_id"):
+        columns |= {"parent_id", "video_type"}
+    return frozenset(columns - _INSERT_ONLY_COLUMNS)
+
+
+def _error_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'line'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+def _youtube_ids(item: VideoImportItem) -> List[str]:
+    ids = [item.youtube_id] + [segment.youtube_id for segment in item.segments]
+    return [youtube_id for youtube_id in ids if youtube_id]
+
+
+async def _upsert_by_youtube_id(
+    db: AsyncSession, rows: List[Tuple[dict, FrozenSet[str]]]
+) -> Dict[str, Tuple[UUID, bool]]:
+    """
+    INSERT ... ON CONFLICT (youtube_id) DO UPDATE，返回 {youtube_id: (id, 是否新建)}
+
+    rows 为 (行数据, 更新时覆盖的列)；覆盖列相同的行合并为一条多行语句。
+    """
+    resolved: Dict[str, Tuple[UUID, bool]] = {}
+    groups: Dict[FrozenSet[str], List[dict]] = {}
+    for row, columns in rows:
+        groups.setdefault(columns, []).append(row)
+    for columns, group in groups.items():
+        for chunk in chunk_rows(group, len(group[0])):
+            stmt = pg_insert(Video).values(chunk)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Video.youtube_id],
+                set_={**{key: stmt.excluded[key] for key in sorted(columns)}, "updated_at": func.now()},
+            ).returning(Video.id, Video.youtube_id, literal_column("xmax = 0").label("inserted"))
+            result = await db.execute(stmt)
+            for video_id, youtube_id, inserted in result.all():
+                resolved[youtube_id] = (video_id, bool(inserted))
+    return resolved
+
+
+async def _insert_rows(db: AsyncSession, rows: List[dict]) -> None:
+    if not rows:
+        return
+    for chunk in chunk_rows(rows, len(rows[0])):
+        await db.execute(pg_insert(Video).values(chunk))
+
+
+async def _write_segments(
+    db: AsyncSession, rows: List[Tuple[dict, FrozenSet[str]]]
+) -> Dict[int, Tuple[UUID, bool]]:
+    """
+    写入片段，返回 {行下标: (id, 是否新建)}
+
+    有 youtube_id 的片段按 youtube_id upsert；没有的按 (parent_id, segment_index) 匹配已有片段，
+    命中则按主键批量更新（只更新导入行中出现的字段），否则批量插入。
+    """
+    resolved: Dict[int, Tuple[UUID, bool]] = {}
+    keyed = [(row, columns) for row, columns in rows if row.get("youtube_id")]
+    by_youtube_id = await _upsert_by_youtube_id(db, keyed)
+    for index, (row, _columns) in enumerate(rows):
+        if row.get("youtube_id"):
+            resolved[index] = by_youtube_id[row["youtube_id"]]
+
+    positional = [(index, row, columns) for index, (row, columns) in enumerate(rows) if not row.get("youtube_id")]
+    if not positional:
+        return resolved
+
+    result = await db.execute(
+        select(Video.id, Video.parent_id, Video.segment_index).where(
+            tuple_(Video.parent_id, Video.segment_index).in_(
+                [(row["parent_id"], row["segment_index"]) for _, row, _columns in positional]
+            ),
+            Video.youtube_id.is_(None),
+        )
+    )
+    existing = {(parent_id, segment_index): video_id for video_id, parent_id, segment_index in result.all()}
+
+    updates: Dict[FrozenSet[str], List[dict]] = {}
+    inserts = []
+    for index, row, columns in positional:
+        video_id = existing.get((row["parent_id"], row["segment_index"]))
+        if video_id:
+            updates.setdefault(columns, []).append({**{k: row[k] for k in columns}, "id": video_id})
+            resolved[index] = (video_id, False)
+        else:
+            inserts.append(row)
+            resolved[index] = (row["id"], True)
+    for group in updates.values():
+        # ORM 按主键批量更新（executemany），同一组的更新列相同
+        await db.execute(update(Video), group)
+    await _insert_rows(db, inserts)
+    return resolved
+
+
+async def _replace_tags(db: AsyncSession, video_tags: Dict[UUID, List[str]]) -> None:
+    """批量 upsert 标签并整体替换这些视频的标签关联"""
+    if not video_tags:
+        return
+    names = sorted({name for tags in video_tags.values() for name in tags})
+    tag_ids: Dict[str, UUID] = {}
+    if names:
+        for chunk in chunk_rows([{"id": uuid.uuid4(), "name": name, "type": DEFAULT_TAG_TYPE} for name in names], 3):
+            await db.execute(
+                pg_insert(Tag).values(chunk).on_conflict_do_nothing(index_elements=[Tag.name])
+            )
+        result = await db.execute(select(Tag.id, Tag.name).where(Tag.name.in_(names)))
+        tag_ids = {name: tag_id for tag_id, name in result.all()}
+
+    await db.execute(delete(VideoTag).where(VideoTag.video_id.in_(list(video_tags))))
+    links = [
+        {"video_id": video_id, "tag_id": tag_ids[name]}
+        for video_id, tags in video_tags.items()
+        for name in tags
+        if name in tag_ids
+    ]
+    for chunk in chunk_rows(links, 2):
+        await db.execute(pg_insert(VideoTag).values(chunk).on_conflict_do_nothing())
+
+
+async def _write_items(
+    db: AsyncSession, rows: List[Tuple[int, VideoImportItem, dict]]
+) -> Dict[int, Tuple[UUID, bool]]:
+    """写入一组导入行（主视频、片段、标签），返回 {行号: (id, 是否新建)}"""
+    resolved: Dict[int, Tuple[UUID, bool]] = {}
+    if not rows:
+        return resolved
+
+    # 1. 主视频
+    by_youtube_id = await _upsert_by_youtube_id(
+        db, [(row, _update_columns(item, row)) for _, item, row in rows if row.get("youtube_id")]
+    )
+    await _insert_rows(db, [row for _, _, row in rows if not row.get("youtube_id")])
+    for line, _item, row in rows:
+        resolved[line] = by_youtube_id[row["youtube_id"]] if row.get("youtube_id") else (row["id"], True)
+
+    # 2. 片段
+    segment_rows, segment_items = [], []
+    for line, item, _row in rows:
+        parent_id = resolved[line][0]
+        for segment in item.segments:
+            row = _video_row(segment, parent_id=parent_id)
+            segment_rows.append((row, _update_columns(segment, row)))
+            segment_items.append(segment)
+    segment_ids = await _write_segments(db, segment_rows)
+
+    # 3. 标签：导入行带 tags 时以导入数据为准整体替换，未带时保持原有标签
+    video_tags = {
+        resolved[line][0]: normalize_names(item.tags)
+        for line, item, _row in rows
+        if "tags" in item.model_fields_set
+    }
+    for index, segment in enumerate(segment_items):
+        if "tags" in segment.model_fields_set:
+            video_tags[segment_ids[index][0]] = normalize_names(segment.tags)
+    await _replace_tags(db, video_tags)
+    return resolved
+
+
+async def _write_batch(
+    db: AsyncSession, batch: List[Tuple[int, VideoImportItem]]
+) -> List[VideoImportResult]:
+    results: Dict[int, VideoImportResult] = {}
+
+    def fail(line: int, item: VideoImportItem, error: str) -> None:
+        results[line] = VideoImportResult(line=line, status="failed", youtube_id=item.youtube_id, error=error)
+
+    # 校验显式指定的父视频是否存在
+    parent_ids = {item.parent_id for _, item in batch if item.parent_id}
+    existing_parents = set()
+    if parent_ids:
+        result = await db.execute(select(Video.id).where(Video.id.in_(parent_ids)))
+        existing_parents = set(result.scalars().all())
+    top_level, children = [], []
+    for line, item in batch:
+        if item.parent_id and item.parent_youtube_id:
+            fail(line, item, "parent_id 与 parent_youtube_id 不能同时指定")
+        elif item.parent_id and item.parent_id not in existing_parents:
+            fail(line, item, "父视频不存在")
+        elif item.parent_youtube_id:
+            children.append((line, item))
+        else:
+            top_level.append((line, item))
+
+    # 先写不依赖本批父视频的行
+    resolved = await _write_items(db, [(line, item, _video_row(item)) for line, item in top_level])
+
+    # 再写按 youtube_id 指定父视频的行：优先匹配本批已写入的行，其余查库
+    parents = {
+        item.youtube_id: resolved[line][0] for line, item in top_level if item.youtube_id
+    }
+    missing = {item.parent_youtube_id for _, item in children} - set(parents)
+    if missing:
+        result = await db.execute(select(Video.youtube_id, Video.id).where(Video.youtube_id.in_(missing)))
+        parents.update(result.all())
+    child_rows = []
+    for line, item in children:
+        parent_id = parents.get(item.parent_youtube_id)
+        if parent_id is None:
+            fail(line, item, "父视频不存在")
+        else:
+            child_rows.append((line, item, _video_row(item, parent_id=parent_id)))
+    resolved.update(await _write_items(db, child_rows))
+
+    for line, item in top_level + children:
+        if line not in resolved:
+            continue
+        video_id, inserted = resolved[line]
+        results[line] = VideoImportResult(
+            line=line,
+            status="created" if inserted else "updated",
+            id=video_id,
+            youtube_id=item.youtube_id,
+            segment_count=len(item.segments),
+        )
+    return [results[line] for line, _ in batch]
+
+
+async def _flush(db: AsyncSession, batch: List[Tuple[int, VideoImportItem]]) -> List[VideoImportResult]:
+    """在独立事务中写入一批数据；失败时整批回滚并标记为 failed"""
+    try:
+        results = await _write_batch(db, batch)
+        await db.commit()
+        return results
+    except Exception as exc:
+        await db.rollback()
+        logger.exception("视频批量导入失败（第 %s-%s 行）", batch[0][0], batch[-1][0])
+        return [
+            VideoImportResult(
+                line=line,
+                status="failed",
+                youtube_id=item.youtube_id,
+                error=f"批次写入失败: {str(exc).splitlines()[0] if str(exc) else exc.__class__.__name__}",
+            )
+            for line, item in batch
+        ]
+
+
+async def import_videos(db: AsyncSession, lines: AsyncIterator[str]) -> VideoImportResponse:
+    """
+    从 NDJSON 行流批量导入视频（含标签、分类、片段）
+
+    - 逐行解析校验，单行错误不影响其他行
+    - 每 IMPORT_BATCH_SIZE 行一个事务，使用多行 INSERT ... ON CONFLICT 集合写入
+    - youtube_id 为幂等键：已存在则更新，否则新建
+    """
+    results: List[VideoImportResult] = []
+    batch: List[Tuple[int, VideoImportItem]] = []
+    batch_keys: set = set()
+    line_no = 0
+
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            item = VideoImportItem.model_validate_json(line)
+        except ValidationError as exc:
+            results.append(VideoImportResult(line=line_no, status="failed", error=_error_message(exc)))
+            continue
+
+        keys = _youtube_ids(item)
+        if len(set(keys)) != len(keys):
+            results.append(VideoImportResult(
+                line=line_no, status="failed", youtube_id=item.youtube_id, error="youtube_id 重复"
+            ))
+            continue
+        # 同一条 ON CONFLICT 语句不能两次更新同一行，遇到重复 youtube_id 时先提交当前批次
+        if len(batch) >= IMPORT_BATCH_SIZE or batch_keys.intersection(keys):
+            results.extend(await _flush(db, batch))
+            batch, batch_keys = [], set()
+        batch.append((line_no, item))
+        batch_keys.update(keys)
+
+    if batch:
+        results.extend(await _flush(db, batch))
+
+    results.sort(key=lambda r: r.line)
+    created = sum(1 for r in results if r.status == "created")
+    updated = sum(1 for r in results if r.status == "updated")
+    if created or updated:
+        video_facets.invalidate()
+    return VideoImportResponse(
+        created=created,
+        updated=updated,
+        failed=len(results) - created - updated,
+        results=results,
+    )
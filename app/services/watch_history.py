@@ -0,0 +1,131 @@
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+# 观看流水按月分区：user_watch_events_yYYYYmMM，范围 [当月 1 日, 次月 1 日)（UTC）
+_PARTITION_PREFIX = "user_watch_events_y"
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(day: date, months: int) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{_PARTITION_PREFIX}{month.year:04d}m{month.month:02d}"
+
+
+def _utc_midnight(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+async def ensure_partitions(conn: AsyncConnection, first: date, last: date) -> List[str]:
+    """
+    确保 [first 所在月, last 所在月] 的月分区存在，返回新建的分区名
+
+    默认分区中已有落在该月的行时先搬到新分区再挂载，挂载校验不会失败。
+    """
+    created = []
+    month = month_start(first)
+    while month <= last:
+        name = partition_name(month)
+        exists = await conn.scalar(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name})
+        if not exists:
+            bounds = {"start": _utc_midnight(month), "end": _utc_midnight(add_months(month, 1))}
+            await conn.execute(text(
+                f"CREATE TABLE {name} (LIKE user_watch_events INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            ))
+            await conn.execute(text(f"""
+                WITH moved AS (
+                    DELETE FROM user_watch_events_default
+                    WHERE watched_at >= :start AND watched_at < :end
+                    RETURNING *
+                )
+                INSERT INTO {name} SELECT * FROM moved
+            """), bounds)
+            start, end = (bounds[key].isoformat() for key in ("start", "end"))
+            await conn.execute(text(
+                f"ALTER TABLE user_watch_events ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{start}') TO ('{end}')"
+            ))
+            created.append(name)
+        month = add_months(month, 1)
+    return created
+
+
+async def drop_partitions_before(conn: AsyncConnection, month: date) -> List[str]:
+    """删除整月都早于 month 的流水分区（按日汇总已保留），返回删除的分区名"""
+    result = await conn.execute(text("""
+        SELECT c.relname
+        FROM pg_inherits AS i
+        JOIN pg_class AS c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'user_watch_events'::regclass
+          AND c.relname LIKE :pattern
+    """), {"pattern": f"{_PARTITION_PREFIX}%"})
+    cutoff = partition_name(month_start(month))
+    dropped = sorted(name for name in result.scalars() if name < cutoff)
+    for name in dropped:
+        await conn.execute(text(f"DROP TABLE {name}"))
+    return dropped
+
+
+async def rollup_daily_activity(conn: AsyncConnection, since: date, until: date) -> int:
+    """
+    按日重算 [since, until] 内每个用户的观看汇总并覆盖写入 user_daily_activity
+
+    以整天为单位重算，重复执行结果不变；流水分区被清理后不要再重算对应日期。返回写入的汇总行数。
+    """
+    bounds = {"start": _utc_midnight(since), "end": _utc_midnight(until + timedelta(days=1))}
+    written = await conn.execute(text("""
+        INSERT INTO user_daily_activity (user_id, day, watch_seconds, videos_watched, updated_at)
+        SELECT e.user_id, (e.watched_at AT TIME ZONE 'UTC')::date, sum(e.watch_seconds), count(DISTINCT e.video_id), now()
+        FROM user_watch_events AS e
+        JOIN users AS u ON u.id = e.user_id
+        WHERE e.watched_at >= :start AND e.watched_at < :end
+        GROUP BY 1, 2
+        ORDER BY 1, 2
+        ON CONFLICT (user_id, day) DO UPDATE SET
+            watch_seconds = EXCLUDED.watch_seconds,
+            videos_watched = EXCLUDED.videos_watched,
+            updated_at = now()
+    """), bounds)
+    return written.rowcount
+
+
+async def late_event_days(conn: AsyncConnection, recorded_since: datetime, before: date,
+                          not_before: Optional[date] = None) -> List[date]:
+    """
+    recorded_since 之后写入、观看日期却早于 before 的流水所在日期（离线同步迟到的上报）
+
+    not_before：更早的日期不返回（流水分区已清理的月份只剩迟到的行，重算会覆盖原有的完整汇总）。
+    """
+    result = await conn.execute(text("""
+        SELECT DISTINCT (watched_at AT TIME ZONE 'UTC')::date
+        FROM user_watch_events
+        WHERE recorded_at >= :recorded_since AND watched_at >= :start AND watched_at < :end
+        ORDER BY 1
+    """), {
+        "recorded_since": recorded_since,
+        "start": _utc_midnight(not_before or date.min),
+        "end": _utc_midnight(before),
+    })
+    return list(result.scalars())
+
+
+async def rollup_recent_activity(conn: AsyncConnection, since: date, until: date,
+                                 not_before: Optional[date] = None) -> int:
+    """
+    重算 [since, until] 的按日汇总，并重算 since 之后写入的迟到流水所在的更早日期，返回写入的汇总行数
+
+    定时任务的间隔短于窗口时，每条迟到的流水至少会在一次执行中被计入。
+    """
+    written = await rollup_daily_activity(conn, since, until)
+    for day in await late_event_days(conn, _utc_midnight(since), since, not_before):
+        written += await rollup_daily_activity(conn, day, day)
+    return written
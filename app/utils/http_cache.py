@@ -0,0 +1,113 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+
+
+def make_etag(body: bytes) -> str:
+    """根据响应内容生成强校验 ETag"""
+    return f'"{hashlib.sha1(body).hexdigest()}"'
+
+
+def version_etag(*parts) -> str:
+    """根据内容版本号（如 id + 写入计数）生成弱校验 ETag，无需序列化响应体"""
+    return 'W/"' + "-".join(str(part) for part in parts) + '"'
+
+
+def cache_control(is_public: bool) -> str:
+    """
+    公开内容（匿名请求 + 免费视频）允许 nginx / CDN 共享缓存 HTTP_CACHE_MAX_AGE 秒；
+    其余内容只允许客户端私有缓存，每次使用前需重新验证
+    """
+    if is_public:
+        return f"public, max-age={settings.HTTP_CACHE_MAX_AGE}"
+    return "private, no-cache"
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """判断请求的 If-None-Match 是否命中当前 ETag（忽略弱校验前缀）"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    current = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == current:
+            return True
+    return False
+
+
+def is_not_modified(
+    request: Request,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+) -> bool:
+    """
+    按 RFC 9110 判断条件请求：有 If-None-Match 时只比较 ETag，忽略 If-Modified-Since
+
+    If-Modified-Since 只有秒级精度，依赖 last_modified 每次写入至少前进 1 秒（见 bump_content_version）。
+    """
+    if request.headers.get("if-none-match"):
+        return etag_matches(request, etag)
+    header = request.headers.get("if-modified-since")
+    if not header or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def accepts_gzip(request: Request) -> bool:
+    """判断客户端 Accept-Encoding 是否接受 gzip（q=0 视为不接受）"""
+    for part in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            q = params.strip().replace(" ", "")
+            return q not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def validator_headers(
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    cache_control: str = "no-cache",
+) -> Dict[str, str]:
+    headers = {
+        "ETag": etag,
+        "Cache-Control": cache_control,
+        "Vary": "Authorization",
+    }
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+
+def not_modified_response(headers: Dict[str, str]) -> Response:
+    return Response(status_code=304, headers=headers)
+
+
+def cached_json_response(
+    request: Request,
+    body: bytes,
+    etag: Optional[str] = None,
+    cache_control: str = "no-cache",
+    last_modified: Optional[datetime] = None,
+) -> Response:
+    """返回带校验头的 JSON 响应；客户端缓存仍有效时返回 304"""
+    etag = etag or make_etag(body)
+    headers = validator_headers(etag, last_modified, cache_control)
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(headers)
+    return Response(content=body, media_type="application/json", headers=headers)
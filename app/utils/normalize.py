@@ -0,0 +1,21 @@
+from typing import List, Optional
+
+
+def normalize_names(values: Optional[List[str]]) -> List[str]:
+    """去除空白、忽略大小写去重，保留首次出现的写法和顺序"""
+    if not values:
+        return []
+    normalized = []
+    seen = set()
+    for value in values:
+        if not value or not isinstance(value, str):
+            continue
+        name = value.strip()
+        if not name:
+            continue
+        key = name.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        normalized.append(name)
+    return normalized
@@ -0,0 +1,37 @@
+from typing import AsyncIterator
+
+from fastapi import UploadFile
+
+
+async def iter_lines(chunks: AsyncIterator[bytes], encoding: str = "utf-8") -> AsyncIterator[str]:
+    """
+    将字节块流切分为文本行（不含换行符），不会把整个请求体读入内存
+
+    兼容 \\n 与 \\r\\n，并去除 UTF-8 BOM。
+    """
+    buffer = b""
+    first = True
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        buffer += chunk
+        if first and len(buffer) >= 3:
+            if buffer.startswith(b"\xef\xbb\xbf"):
+                buffer = buffer[3:]
+            first = False
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.rstrip(b"\r").decode(encoding)
+    if first and buffer.startswith(b"\xef\xbb\xbf"):
+        buffer = buffer[3:]
+    if buffer:
+        yield buffer.rstrip(b"\r").decode(encoding)
+
+
+async def iter_upload(upload: UploadFile, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    """按块读取上传文件（Starlette 已将大文件暂存到磁盘），配合 iter_lines 逐行处理"""
+    while True:
+        chunk = await upload.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
@@ -0,0 +1,189 @@
+import re
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import AsyncIterator, Iterable, List, Optional, Tuple
+
+# (start_time, end_time, english_text, chinese_text)
+CueRow = Tuple[Decimal, Decimal, str, Optional[str]]
+
+
+def format_timestamp(seconds, decimal_sep: str = ".") -> str:
+    """秒数转 HH:MM:SS.mmm（WebVTT）或 HH:MM:SS,mmm（SRT）"""
+    millis = int(round(Decimal(seconds) * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{decimal_sep}{millis:03d}"
+
+
+def _cue_text(english_text: str, chinese_text: Optional[str]) -> str:
+    # 空行在 WebVTT / SRT 中表示字幕块结束，正文内不能出现
+    lines = [line for line in (english_text or "").splitlines() if line.strip()]
+    if chinese_text:
+        lines.extend(line for line in chinese_text.splitlines() if line.strip())
+    return "\n".join(lines)
+
+
+async def iter_webvtt(rows: AsyncIterator[CueRow]) -> AsyncIterator[str]:
+    """按行生成 WebVTT 文本（英文在上、中文在下）"""
+    yield "WEBVTT\n\n"
+    async for start_time, end_time, english_text, chinese_text in rows:
+        yield (
+            f"{format_timestamp(start_time)} --> {format_timestamp(end_time)}\n"
+            f"{_cue_text(english_text, chinese_text)}\n\n"
+        )
+
+
+async def iter_srt(rows: AsyncIterator[CueRow]) -> AsyncIterator[str]:
+    """按行生成 SRT 文本，序号从 1 连续编号"""
+    index = 0
+    async for start_time, end_time, english_text, chinese_text in rows:
+        index += 1
+        yield (
+            f"{index}\n"
+            f"{format_timestamp(start_time, ',')} --> {format_timestamp(end_time, ',')}\n"
+            f"{_cue_text(english_text, chinese_text)}\n\n"
+        )
+
+
+def columnar(rows: Iterable[tuple]) -> dict:
+    """
+    (id, start_time, end_time, english_text, chinese_text, word_refs) 行转为并行数组，
+    去掉逐行重复的键名、video_id 和 created_at
+    """
+    columns = {"id": [], "start": [], "end": [], "en": [], "zh": [], "word_refs": []}
+    for subtitle_id, start_time, end_time, english_text, chinese_text, word_refs in rows:
+        columns["id"].append(subtitle_id)
+        columns["start"].append(start_time)
+        columns["end"].append(end_time)
+        columns["en"].append(english_text)
+        columns["zh"].append(chinese_text)
+        columns["word_refs"].append(word_refs or {})
+    return columns
+
+
+# ---------------------------------------------------------------------------
+# 解析（上传）
+# ---------------------------------------------------------------------------
+
+_TIMESTAMP_RE = re.compile(r"^(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{1,3})$")
+_TAG_RE = re.compile(r"<[^>]+>|\{\\[^}]*\}")
+_CJK_RE = re.compile(r"[\u3000-\u9fff\uf900-\ufaff\uff00-\uffef]")
+
+
+class SubtitleParseError(ValueError):
+    """字幕文件格式错误，带出错行号"""
+
+    def __init__(self, line_no: int, message: str) -> None:
+        super().__init__(f"第 {line_no} 行: {message}")
+        self.line_no = line_no
+
+
+@dataclass
+class Cue:
+    start_time: Decimal
+    end_time: Decimal
+    english_text: str
+    chinese_text: Optional[str] = None
+
+
+def contains_cjk(text: str) -> bool:
+    return bool(_CJK_RE.search(text))
+
+
+def parse_timestamp(value: str) -> Decimal:
+    """解析 HH:MM:SS,mmm / HH:MM:SS.mmm / MM:SS.mmm 为秒"""
+    match = _TIMESTAMP_RE.match(value.strip())
+    if not match:
+        raise ValueError(f"无效的时间戳: {value}")
+    hours, minutes, seconds, millis = match.groups()
+    total = int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds)
+    return Decimal(total) + Decimal(millis.ljust(3, "0")) / 1000
+
+
+def _split_bilingual(text_lines: List[str]) -> Tuple[str, Optional[str]]:
+    """双语字幕块：含中文的行归为中文，其余为英文"""
+    english, chinese = [], []
+    for line in text_lines:
+        (chinese if contains_cjk(line) else english).append(line)
+    return " ".join(english), (" ".join(chinese) or None)
+
+
+async def parse_cues(lines: AsyncIterator[str]) -> AsyncIterator[Cue]:
+    """
+    逐行解析 SRT / WebVTT，按字幕块生成 Cue，内存占用与文件大小无关
+
+    - 兼容 SRT 序号行、WebVTT 头部 / NOTE / STYLE / REGION 块、cue 标识与 cue 设置
+    - 去除 <i>、<c.xxx>、{\\an8} 等样式标签
+    - 同一块内的中英文行拆分为 english_text / chinese_text
+    """
+    line_no = 0
+    block: List[Tuple[int, str]] = []
+
+    def build(block: List[Tuple[int, str]]) -> Optional[Cue]:
+        first = block[0][1]
+        if first.startswith(("WEBVTT", "NOTE", "STYLE", "REGION")):
+            return None
+        timing_index = next((i for i, (_, text) in enumerate(block) if "-->" in text), None)
+        if timing_index is None or timing_index > 1:
+            raise SubtitleParseError(block[0][0], "缺少时间轴行")
+        timing_no, timing = block[timing_index]
+        start, _, rest = timing.partition("-->")
+        end = rest.strip().split()[0] if rest.strip() else ""
+        try:
+            start_time, end_time = parse_timestamp(start), parse_timestamp(end)
+        except ValueError as exc:
+            raise SubtitleParseError(timing_no, str(exc)) from exc
+        if end_time < start_time:
+            raise SubtitleParseError(timing_no, "结束时间早于开始时间")
+        text_lines = [_TAG_RE.sub("", text).strip() for _, text in block[timing_index + 1:]]
+        english_text, chinese_text = _split_bilingual([text for text in text_lines if text])
+        if not english_text and not chinese_text:
+            return None
+        return Cue(start_time, end_time, english_text, chinese_text)
+
+    async for line in lines:
+        line_no += 1
+        if line.strip():
+            block.append((line_no, line.strip()))
+            continue
+        if block:
+            cue = build(block)
+            block = []
+            if cue is not None:
+                yield cue
+    if block:
+        cue = build(block)
+        if cue is not None:
+            yield cue
+
+
+async def merge_translation(cues: AsyncIterator[Cue], translations: AsyncIterator[Cue]) -> AsyncIterator[Cue]:
+    """
+    将独立的中文字幕文件按开始时间合并到英文字幕（两者均按时间有序，归并一次遍历）
+
+    开始时间相差不超过 0.5 秒视为同一句；英文字幕本身已带中文时保留原文。
+    """
+    tolerance = Decimal("0.5")
+    pending: Optional[Cue] = None
+    exhausted = False
+
+    async def next_translation() -> Optional[Cue]:
+        try:
+            return await translations.__anext__()
+        except StopAsyncIteration:
+            return None
+
+    async for cue in cues:
+        if pending is None and not exhausted:
+            pending = await next_translation()
+            exhausted = pending is None
+        # 跳过早于当前英文字幕的译文
+        while pending is not None and pending.start_time < cue.start_time - tolerance:
+            pending = await next_translation()
+            exhausted = pending is None
+        if pending is not None and abs(pending.start_time - cue.start_time) <= tolerance:
+            if not cue.chinese_text:
+                cue.chinese_text = pending.chinese_text or pending.english_text
+            pending = None
+        yield cue
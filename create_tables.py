@@ -2,20 +2,25 @@
 """直接创建所有数据库表"""
 
 import asyncio
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from app.core.config import settings
 from app.core.database import Base
 
 # 导入所有模型
 from app.models.video import Video
 from app.models.subtitle import Subtitle
+from app.models.subtitle_lemma import SubtitleLemma
 from app.models.tag import Tag
 from app.models.video_tag import VideoTag
+from app.models.video_catalog_version import VideoCatalogVersion
 from app.models.word_card import WordCard
 from app.models.phrase_card import PhraseCard
 from app.models.user import User
 from app.models.sms_code import SmsCode
 from app.models.user_video_progress import UserVideoProgress
+from app.models.user_learning_stats import UserLearningStats
+from app.models.user_watch_event import UserWatchEvent
+from app.models.user_daily_activity import UserDailyActivity
 from app.models.user_video_favorite import UserVideoFavorite
 from app.models.user_word_favorite import UserWordFavorite
 from app.models.user_subtitle_favorite import UserSubtitleFavorite
@@ -27,6 +32,10 @@ def create_tables():
         print("🔌 连接数据库...")
         engine = create_engine(settings.DATABASE_URL)
         
+        # 视频搜索的 trigram 索引依赖 pg_trgm 扩展
+        with engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
         print("🗄️  创建所有表...")
         Base.metadata.create_all(bind=engine)
         
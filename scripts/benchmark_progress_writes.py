@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+学习进度心跳写入基准测试：逐条直接写库 vs 写回缓冲（PROGRESS_WRITE_BEHIND）
+
+模拟 --clients 个播放器（各自一个用户、一个视频）在 --seconds 秒内按 --interval 间隔上报心跳，
+分别测量两种写法下的心跳吞吐、心跳延迟，以及数据库侧每秒提交的事务数（pg_stat_database.xact_commit）
+和写入的进度行数。测试用户与视频在结束时删除。
+
+请在开发或测试库上运行（使用配置中的 DATABASE_URL）。
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Tuple
+from uuid import UUID
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import delete, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.models.user import User
+from app.models.video import Video
+from app.services.learning_progress import write_video_progress
+from app.services.progress_buffer import ProgressBuffer
+
+EMAIL_DOMAIN = "progress-bench.local"
+
+
+async def _setup(clients: int) -> List[Tuple[UUID, UUID]]:
+    keys = [(uuid.uuid4(), uuid.uuid4()) for _ in range(clients)]
+    async with SessionLocal() as db:
+        await db.execute(pg_insert(User).values([
+            {"id": user_id, "email": f"{user_id}@{EMAIL_DOMAIN}", "hashed_password": "x"} for user_id, _ in keys
+        ]))
+        await db.execute(pg_insert(Video).values([
+            {"id": video_id, "title": "进度写入基准", "duration": 3600} for _, video_id in keys
+        ]))
+        await db.commit()
+    return keys
+
+
+async def _cleanup(keys: List[Tuple[UUID, UUID]]) -> None:
+    # 学习进度随用户 / 视频级联删除
+    async with SessionLocal() as db:
+        await db.execute(delete(Video).where(Video.id.in_([video_id for _, video_id in keys])))
+        await db.execute(delete(User).where(User.email.like(f"%@{EMAIL_DOMAIN}")))
+        await db.commit()
+
+
+async def _commits() -> int:
+    # 各后端的统计信息在空闲或断开时才上报：先关闭连接池中的连接再读取
+    await engine.dispose()
+    await asyncio.sleep(0.5)
+    async with engine.connect() as conn:
+        return await conn.scalar(
+            text("SELECT xact_commit FROM pg_stat_database WHERE datname = current_database()")
+        )
+
+
+async def _drive(keys, seconds: float, interval: float, heartbeat) -> List[float]:
+    """每个客户端循环上报心跳，返回每次心跳的耗时（毫秒）"""
+    latencies: List[float] = []
+    deadline = time.monotonic() + seconds
+
+    async def client(user_id: UUID, video_id: UUID) -> None:
+        position = 0
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            await heartbeat(user_id, video_id, position)
+            latencies.append((time.perf_counter() - started) * 1000)
+            position = (position + 5) % 3600
+            # 缓冲写法的心跳不一定真正等待 IO，间隔为 0 时也要让出事件循环给落库任务
+            await asyncio.sleep(interval)
+
+    await asyncio.gather(*(client(user_id, video_id) for user_id, video_id in keys))
+    return latencies
+
+
+async def bench_direct(keys, seconds: float, interval: float) -> dict:
+    async def heartbeat(user_id, video_id, position):
+        async with SessionLocal() as db:
+            await write_video_progress(db, user_id, video_id, position, None, datetime.now(timezone.utc))
+            await db.commit()
+
+    latencies = await _drive(keys, seconds, interval, heartbeat)
+    return {"latencies": latencies, "rows": len(latencies)}
+
+
+async def bench_buffered(keys, seconds: float, interval: float, flush_seconds: float) -> dict:
+    settings.PROGRESS_FLUSH_SECONDS = flush_seconds
+    buffer = ProgressBuffer()
+
+    async def heartbeat(user_id, video_id, position):
+        async with SessionLocal() as db:
+            duration = await buffer.video_duration(db, video_id)
+            await buffer.record(db, user_id, video_id, position, duration, None)
+
+    buffer.start()
+    try:
+        latencies = await _drive(keys, seconds, interval, heartbeat)
+    finally:
+        await buffer.stop()
+    stats = buffer.stats()
+    return {"latencies": latencies, "rows": stats["rows_flushed"], "flushes": stats["flushes"]}
+
+
+def _report(name: str, result: dict, commits: int, seconds: float) -> None:
+    latencies = sorted(result["latencies"])
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(f"\n{name}")
+    print(f"  心跳            {len(latencies):>8} 次   {len(latencies) / seconds:10.1f} 次/秒")
+    print(f"  心跳延迟        中位数 {statistics.median(latencies):8.2f} ms   p95 {p95:8.2f} ms")
+    print(f"  写入进度行      {result['rows']:>8} 行   {result['rows'] / seconds:10.1f} 行/秒")
+    print(f"  数据库提交事务  {commits:>8} 个   {commits / seconds:10.1f} TPS")
+    if "flushes" in result:
+        print(f"  批量落库        {result['flushes']:>8} 次")
+
+
+async def run(args: argparse.Namespace) -> None:
+    keys = await _setup(args.clients)
+    try:
+        before = await _commits()
+        direct = await bench_direct(keys, args.seconds, args.interval)
+        middle = await _commits()
+        buffered = await bench_buffered(keys, args.seconds, args.interval, args.flush_seconds)
+        after = await _commits()
+    finally:
+        await _cleanup(keys)
+
+    print(f"{args.clients} 个客户端，{args.seconds} 秒，心跳间隔 {args.interval} 秒，落库间隔 {args.flush_seconds} 秒")
+    _report("逐条直接写库", direct, middle - before, args.seconds)
+    _report("写回缓冲", buffered, after - middle, args.seconds)
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark learning-progress heartbeat writes: direct upsert vs write-behind buffer.")
+    parser.add_argument("--clients", type=int, default=50, help="并发播放器数")
+    parser.add_argument("--seconds", type=float, default=10.0, help="每种写法的测量时长")
+    parser.add_argument("--interval", type=float, default=0.0, help="每个客户端的心跳间隔（秒），0 表示连续上报")
+    parser.add_argument("--flush-seconds", type=float, default=5.0, help="写回缓冲的落库间隔（秒）")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+检索与批量导入基准测试（合成数据）
+
+在一个事务内生成合成视频与字幕语料，测量后整体回滚，不会留下数据：
+
+- 字幕批量导入：insert_returning（多行 INSERT ... RETURNING，含 subtitle_lemmas 触发器）
+  与逐行 refresh 的旧写法在不同行数下的耗时
+- 视频目录检索：search_vector / search_text 索引检索与旧的七列 ILIKE 的延迟
+- 词形检索：subtitle_lemmas 倒排索引与逐行展开 word_refs JSONB 的延迟
+
+合成词表按 Zipf 分布取词，检索词分别取高频、中频、低频词。
+请在开发或测试库上运行（--database-url，默认使用配置中的 DATABASE_URL）。
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import cast, desc, or_, select, text, Text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.api.v1.endpoints.videos import _apply_search
+from app.core.database import _build_async_url, engine as default_engine
+from app.models.subtitle import Subtitle
+from app.models.subtitle_lemma import SubtitleLemma
+from app.models.video import Video
+from app.services.bulk_insert import chunk_rows, insert_returning
+
+# 批量导入基准单块上限（与接口的 BATCH_CREATE_MAX_ITEMS 同量级）
+FILL_CHUNK = 2000
+
+
+class Corpus:
+    """合成词表：原形 w00042，词形为原形加 s / ing 后缀"""
+
+    def __init__(self, size: int, seed: int):
+        self.rng = random.Random(seed)
+        self.lemmas = [f"w{i:05d}" for i in range(size)]
+        self.weights = [1 / (rank + 1) for rank in range(size)]
+
+    def words(self, count: int) -> List[str]:
+        return self.rng.choices(self.lemmas, weights=self.weights, k=count)
+
+    def subtitle_rows(self, count: int, video_ids: List[uuid.UUID]) -> List[dict]:
+        rows = []
+        for i in range(count):
+            refs = {}
+            for lemma in self.words(8):
+                refs[lemma + self.rng.choice(("", "s", "ing"))] = lemma
+            rows.append({
+                "video_id": self.rng.choice(video_ids),
+                "start_time": i,
+                "end_time": i + 1,
+                "english_text": " ".join(refs),
+                "chinese_text": "合成字幕",
+                "sequence_number": i,
+                "word_refs": refs,
+            })
+        return rows
+
+    def keywords(self) -> Dict[str, str]:
+        size = len(self.lemmas)
+        return {"高频": self.lemmas[0], "中频": self.lemmas[size // 20], "低频": self.lemmas[size - 1]}
+
+
+async def _timed(run: Callable[[], Awaitable[None]], repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await run()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def _report(label: str, samples: List[float]) -> None:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"  {label:<36} 中位数 {statistics.median(ordered):8.2f} ms   p95 {p95:8.2f} ms")
+
+
+async def _insert_videos(db: AsyncSession, corpus: Corpus, count: int) -> List[uuid.UUID]:
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "title": " ".join(corpus.words(6)),
+            "title_zh": "合成视频",
+            "description": " ".join(corpus.words(40)),
+            "original_author": f"author {i % 50}",
+            "categories": corpus.words(2),
+            "categories_zh": [],
+            "duration": 600,
+            "is_published": True,
+            "is_free": True,
+        }
+        for i in range(count)
+    ]
+    # Python 端默认值也会占用绑定参数，按表的总列数分块
+    for chunk in chunk_rows(rows, len(Video.__table__.columns)):
+        await db.execute(pg_insert(Video).values(chunk))
+    return [row["id"] for row in rows]
+
+
+async def bench_import(db: AsyncSession, corpus: Corpus, video_ids, sizes: List[int], repeat: int) -> None:
+    print("\n字幕批量导入（含 subtitle_lemmas 触发器）")
+    for size in sizes:
+        # 语料在计时之外预先生成
+        set_based_batches = iter([corpus.subtitle_rows(size, video_ids) for _ in range(repeat)])
+        per_row_batches = iter([corpus.subtitle_rows(size, video_ids) for _ in range(repeat)])
+
+        async def set_based():
+            await insert_returning(db, Subtitle, next(set_based_batches))
+
+        async def per_row():
+            subtitles = [Subtitle(**row) for row in next(per_row_batches)]
+            db.add_all(subtitles)
+            await db.flush()
+            for subtitle in subtitles:
+                await db.refresh(subtitle)
+
+        _report(f"{size} 行 insert_returning", await _timed(set_based, repeat))
+        _report(f"{size} 行 add_all + 逐行 refresh", await _timed(per_row, repeat))
+        db.expunge_all()
+
+
+async def bench_catalog_search(db: AsyncSession, corpus: Corpus, repeat: int) -> None:
+    print("\n视频目录检索（limit 20）")
+    has_trgm = await db.scalar(text("SELECT count(*) FROM pg_indexes WHERE indexname = 'ix_videos_search_text_trgm'"))
+    if not has_trgm:
+        print("  ⚠️  缺少 ix_videos_search_text_trgm（pg_trgm 未安装？），search_text 的 ILIKE 分支将顺序扫描")
+    for label, keyword in corpus.keywords().items():
+        query, rank = _apply_search(select(Video.id), keyword)
+        indexed = query.order_by(desc(rank)).limit(20)
+
+        pattern = f"%{keyword}%"
+        legacy = select(Video.id).where(
+            or_(
+                Video.title.ilike(pattern),
+                Video.title_zh.ilike(pattern),
+                Video.description.ilike(pattern),
+                Video.description_zh.ilike(pattern),
+                Video.original_author.ilike(pattern),
+                cast(Video.categories, Text).ilike(pattern),
+                cast(Video.categories_zh, Text).ilike(pattern),
+            )
+        ).order_by(Video.created_at.desc()).limit(20)
+
+        _report(f"{label} {keyword} 索引检索", await _timed(lambda: db.execute(indexed), repeat))
+        _report(f"{label} {keyword} 七列 ILIKE", await _timed(lambda: db.execute(legacy), repeat))
+
+
+async def bench_concordance(db: AsyncSession, corpus: Corpus, repeat: int) -> None:
+    print("\n词形检索（limit 21）")
+    scan = text(
+        "SELECT s.id FROM subtitles AS s WHERE EXISTS ("
+        "  SELECT 1 FROM jsonb_each_text(s.word_refs) AS r WHERE lower(r.value) = :lemma"
+        ") ORDER BY s.id DESC LIMIT 21"
+    )
+    for label, lemma in corpus.keywords().items():
+        indexed = (
+            select(SubtitleLemma.subtitle_id)
+            .where(SubtitleLemma.lemma == lemma)
+            .order_by(SubtitleLemma.subtitle_id.desc())
+            .limit(21)
+        )
+        _report(f"{label} {lemma} subtitle_lemmas", await _timed(lambda: db.execute(indexed), repeat))
+        _report(f"{label} {lemma} 展开 word_refs", await _timed(lambda: db.execute(scan, {"lemma": lemma}), repeat))
+
+
+async def run(args: argparse.Namespace) -> None:
+    engine = create_async_engine(_build_async_url(args.database_url)) if args.database_url else default_engine
+    corpus = Corpus(args.vocabulary, args.seed)
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            db = AsyncSession(bind=conn, autoflush=False, expire_on_commit=False)
+            print(f"生成语料：{args.videos} 个视频，{args.subtitles} 条字幕，词表 {args.vocabulary} 个原形")
+            video_ids = await _insert_videos(db, corpus, args.videos)
+
+            await bench_import(db, corpus, video_ids, sizes, args.import_repeat)
+
+            for _ in range(0, args.subtitles, FILL_CHUNK):
+                await insert_returning(db, Subtitle, corpus.subtitle_rows(FILL_CHUNK, video_ids))
+                db.expunge_all()
+            await db.execute(text("ANALYZE videos"))
+            await db.execute(text("ANALYZE subtitles"))
+            await db.execute(text("ANALYZE subtitle_lemmas"))
+
+            await bench_catalog_search(db, corpus, args.repeat)
+            await bench_concordance(db, corpus, args.repeat)
+        finally:
+            await transaction.rollback()
+            print("\n已回滚，未保留任何合成数据")
+    await engine.dispose()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark catalog search, lemma concordance and batch subtitle import on a synthetic corpus.")
+    parser.add_argument("--database-url", help="目标数据库（默认使用配置中的 DATABASE_URL）")
+    parser.add_argument("--videos", type=int, default=5000, help="合成视频数")
+    parser.add_argument("--subtitles", type=int, default=100000, help="合成字幕数")
+    parser.add_argument("--vocabulary", type=int, default=20000, help="词表大小（原形个数）")
+    parser.add_argument("--sizes", default="100,500,2000", help="批量导入测量的行数，逗号分隔")
+    parser.add_argument("--repeat", type=int, default=20, help="每个查询的重复次数")
+    parser.add_argument("--import-repeat", type=int, default=3, help="每个导入规模的重复次数")
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+重建学习统计 user_learning_stats
+
+正常情况下由 user_video_progress 上的触发器增量维护，此脚本用于首次上线、触发器缺失期间写入的数据，
+或统计出现偏差时的全量重建。重建只能依据当前进度行，观看时长按各视频的播放位置近似。
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from typing import Optional
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from app.core.database import engine
+from app.models.user_learning_stats import STATS_ROWS_SQL
+
+
+async def rebuild(user_id: Optional[str], dry_run: bool) -> None:
+    params = {}
+    where = ""
+    if user_id:
+        where = "WHERE user_id = CAST(:user_id AS uuid)"
+        params["user_id"] = user_id
+
+    async with engine.connect() as conn:
+        # 锁住进度表，重建期间的进度写入等待重建完成后再由触发器计入
+        await conn.execute(text("LOCK TABLE user_video_progress IN SHARE MODE"))
+        deleted = await conn.execute(text(f"DELETE FROM user_learning_stats {where}"), params)
+        inserted = await conn.execute(
+            text(
+                "INSERT INTO user_learning_stats "
+                "(user_id, total_watch_seconds, videos_started, videos_completed, week_start, week_watch_seconds, updated_at) "
+                + STATS_ROWS_SQL.format(where=where.replace("user_id", "p.user_id"))
+            ),
+            params,
+        )
+        summary = f"删除 {deleted.rowcount} 条，写入 {inserted.rowcount} 条"
+        if dry_run:
+            await conn.rollback()
+            print(f"🔍 {summary}（dry-run，未写入）")
+        else:
+            await conn.commit()
+            print(f"✅ 重建完成：{summary}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild user_learning_stats from user_video_progress.")
+    parser.add_argument("--user-id", help="只重建指定用户")
+    parser.add_argument("--dry-run", action="store_true", help="只统计不写入")
+    args = parser.parse_args()
+    asyncio.run(rebuild(args.user_id, args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
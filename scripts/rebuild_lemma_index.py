@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+重建词形还原倒排索引 subtitle_lemmas
+
+正常情况下由 subtitles 上的触发器维护，此脚本用于首次上线、触发器缺失期间写入的数据，
+或调整了展开规则（LEMMA_ROWS_SQL）之后的全量重建。
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from typing import Optional
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from app.core.database import engine
+from app.models.subtitle_lemma import LEMMA_ROWS_SQL
+
+
+async def rebuild(video_id: Optional[str], dry_run: bool) -> None:
+    params = {}
+    source = "subtitles"
+    where = ""
+    if video_id:
+        source = "(SELECT * FROM subtitles WHERE video_id = CAST(:video_id AS uuid))"
+        where = " WHERE video_id = CAST(:video_id AS uuid)"
+        params["video_id"] = video_id
+
+    async with engine.connect() as conn:
+        deleted = await conn.execute(text(f"DELETE FROM subtitle_lemmas{where}"), params)
+        inserted = await conn.execute(
+            text(
+                "INSERT INTO subtitle_lemmas (lemma, subtitle_id, video_id, start_time, forms) "
+                + LEMMA_ROWS_SQL.format(source=source)
+            ),
+            params,
+        )
+        summary = f"删除 {deleted.rowcount} 条，写入 {inserted.rowcount} 条"
+        if dry_run:
+            await conn.rollback()
+            print(f"🔍 {summary}（dry-run，未写入）")
+        else:
+            await conn.commit()
+            print(f"✅ 重建完成：{summary}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild the subtitle_lemmas concordance index from subtitles.word_refs.")
+    parser.add_argument("--video-id", help="只重建指定视频")
+    parser.add_argument("--dry-run", action="store_true", help="只统计不写入")
+    args = parser.parse_args()
+    asyncio.run(rebuild(args.video_id, args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
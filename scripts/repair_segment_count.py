@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+数据修复：按实际子视频数量重算 videos.segment_count
+
+正常情况下由数据库触发器维护，此脚本用于触发器缺失期间写入的数据或手工修改后的校正。
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from app.core.database import engine
+
+REPAIR_SQL = """
+    UPDATE videos AS v
+    SET segment_count = COALESCE(c.cnt, 0)
+    FROM videos AS p
+    LEFT JOIN (
+        SELECT parent_id, COUNT(*) AS cnt
+        FROM videos
+        WHERE parent_id IS NOT NULL
+        GROUP BY parent_id
+    ) AS c ON c.parent_id = p.id
+    WHERE v.id = p.id
+      AND v.segment_count IS DISTINCT FROM COALESCE(c.cnt, 0)
+    RETURNING v.id, v.title, v.segment_count
+"""
+
+
+async def repair(dry_run: bool) -> None:
+    async with engine.connect() as conn:
+        result = await conn.execute(text(REPAIR_SQL))
+        rows = result.all()
+        for video_id, title, segment_count in rows:
+            print(f"  - {video_id} {title}: segment_count -> {segment_count}")
+        if dry_run:
+            await conn.rollback()
+            print(f"🔍 发现 {len(rows)} 条不一致记录（dry-run，未写入）")
+        else:
+            await conn.commit()
+            print(f"✅ 已修复 {len(rows)} 条记录")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recompute videos.segment_count from actual segments.")
+    parser.add_argument("--dry-run", action="store_true", help="只检查不写入")
+    args = parser.parse_args()
+    asyncio.run(repair(args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
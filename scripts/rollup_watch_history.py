@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+观看流水维护任务（建议每小时由 cron 执行一次）
+
+1. 预建当月与下月的 user_watch_events 月分区（默认分区中已有的对应行会被搬入）
+2. 从流水按日重算最近几天的 user_daily_activity，以及这几天内写入的迟到流水（离线同步）所在的更早日期
+3. 可选：删除超过保留期的流水分区（按日汇总不受影响）
+"""
+import argparse
+import asyncio
+import sys
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+
+# 添加项目根目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.database import engine
+from app.services.watch_history import (
+    add_months,
+    drop_partitions_before,
+    ensure_partitions,
+    month_start,
+    rollup_recent_activity,
+)
+
+
+async def run(days: int, since: Optional[date], retain_months: int, dry_run: bool) -> None:
+    today = datetime.now(timezone.utc).date()
+    since = since or today - timedelta(days=days)
+
+    async with engine.connect() as conn:
+        created = await ensure_partitions(conn, today, add_months(month_start(today), 1))
+        # 已清理的流水分区只剩迟到的行，不重算这些月份
+        retained_from = add_months(month_start(today), -retain_months) if retain_months > 0 else None
+        written = await rollup_recent_activity(conn, since, today, retained_from)
+        dropped = []
+        if retained_from is not None:
+            dropped = await drop_partitions_before(conn, retained_from)
+
+        summary = (
+            f"新建分区 {len(created)} 个，汇总 {since} ~ {today} 写入 {written} 行，"
+            f"删除过期分区 {len(dropped)} 个"
+        )
+        if dry_run:
+            await conn.rollback()
+            print(f"🔍 {summary}（dry-run，未写入）")
+        else:
+            await conn.commit()
+            print(f"✅ 完成：{summary}")
+        for name in created + dropped:
+            print(f"   - {name}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Maintain watch-history partitions and daily rollups.")
+    parser.add_argument("--days", type=int, default=2, help="重算最近几天的按日汇总（默认 2）；这几天内写入的迟到流水所在的更早日期一并重算，窗口需长于执行间隔")
+    parser.add_argument("--since", type=date.fromisoformat, help="从指定日期（YYYY-MM-DD）开始重算，优先于 --days")
+    parser.add_argument("--retain-months", type=int, default=0, help="流水保留的整月数，0 表示不删除")
+    parser.add_argument("--dry-run", action="store_true", help="只统计不写入")
+    args = parser.parse_args()
+    asyncio.run(run(args.days, args.since, args.retain_months, args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
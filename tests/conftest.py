@@ -0,0 +1,99 @@
+import os
+import uuid
+
+import httpx
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.database import _build_async_url, get_db
+from app.main import app  # 导入全部路由即注册全部模型，ORM 映射才能完成配置
+from app.models.user import User
+from app.models.video import Video
+
+# 数据库测试使用单独的测试库（需先执行 alembic upgrade head 或 create_tables.py 建表），未配置时跳过
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "")
+
+
+@pytest_asyncio.fixture
+async def db_engine():
+    if not TEST_DATABASE_URL:
+        pytest.skip("未设置 TEST_DATABASE_URL，跳过数据库测试")
+    engine = create_async_engine(_build_async_url(TEST_DATABASE_URL), pool_size=20, max_overflow=40)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def query_counter(db_engine):
+    """统计测试库引擎上执行的 SQL 语句"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(db_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest_asyncio.fixture
+async def session_factory(db_engine):
+    return async_sessionmaker(bind=db_engine, autoflush=False, expire_on_commit=False)
+
+
+@pytest_asyncio.fixture
+async def user_and_video(session_factory):
+    """创建一个测试用户和一个时长 100 秒的视频，结束后连同其学习记录一起删除"""
+    async with session_factory() as db:
+        user = User(email=f"{uuid.uuid4()}@test.local", hashed_password="x")
+        db.add(user)
+        await db.flush()
+        video = Video(title="并发测试视频", duration=100)
+        db.add(video)
+        await db.commit()
+
+    yield user.id, video.id
+
+    async with session_factory() as db:
+        await db.execute(delete(Video).where(Video.id == video.id))
+        await db.execute(delete(User).where(User.id == user.id))
+        # 观看流水没有外键，需要单独清理
+        await db.execute(text("DELETE FROM user_watch_events WHERE user_id = :user_id"), {"user_id": user.id})
+        await db.commit()
+
+
+@pytest_asyncio.fixture
+async def video_factory(session_factory):
+    """创建视频（默认已发布、免费），结束后先删片段再删视频组"""
+    created = []
+
+    async def create(**fields):
+        fields = {"title": "测试视频", "duration": 100, "is_published": True, "is_free": True, **fields}
+        async with session_factory() as db:
+            video = Video(**fields)
+            db.add(video)
+            await db.commit()
+        created.append(video.id)
+        return video
+
+    yield create
+
+    async with session_factory() as db:
+        await db.execute(delete(Video).where(Video.id.in_(created), Video.parent_id.is_not(None)))
+        await db.execute(delete(Video).where(Video.id.in_(created)))
+        await db.commit()
+
+
+@pytest_asyncio.fixture
+async def client(session_factory):
+    """未登录的 API 客户端，get_db 改为连接测试库"""
+    async def override_get_db():
+        async with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+        yield http
+    app.dependency_overrides.pop(get_db, None)
@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from app.api.v1.endpoints.phrase_cards import create_phrase_card
+from app.api.v1.endpoints.word_cards import create_word_card
+from app.models.phrase_card import PhraseCard
+from app.models.word_card import WordCard
+from app.schemas import PhraseCardCreate, WordCardCreate
+
+
+async def _create_concurrently(session_factory, create, card_in, attempts=10):
+    """并发创建同一张卡片，返回 (成功数, 409 数)"""
+    ready = asyncio.Event()
+
+    async def attempt():
+        async with session_factory() as db:
+            await db.connection()
+            await ready.wait()
+            try:
+                await create(card_in, db=db, _user=None)
+                return 201
+            except HTTPException as exc:
+                return exc.status_code
+
+    tasks = [asyncio.create_task(attempt()) for _ in range(attempts)]
+    await asyncio.sleep(0.2)
+    ready.set()
+    statuses = await asyncio.gather(*tasks)
+    return statuses.count(201), statuses.count(409)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_create_word_card_conflicts(session_factory, video_factory):
+    """并发创建同一视频的同一单词卡：只有一个成功，其余返回 409 而不是唯一键冲突报错"""
+    video = await video_factory()
+    card_in = WordCardCreate(video_id=video.id, word="granted", difficulty_level=2)
+    assert await _create_concurrently(session_factory, create_word_card, card_in) == (1, 9)
+
+    async with session_factory() as db:
+        count = await db.scalar(select(func.count()).select_from(WordCard).where(WordCard.video_id == video.id))
+    assert count == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_create_phrase_card_conflicts(session_factory, video_factory):
+    """并发创建同一视频的同一短语卡：只有一个成功，其余返回 409 而不是唯一键冲突报错"""
+    video = await video_factory()
+    card_in = PhraseCardCreate(video_id=video.id, phrase="take it for granted")
+    assert await _create_concurrently(session_factory, create_phrase_card, card_in) == (1, 9)
+
+    async with session_factory() as db:
+        count = await db.scalar(select(func.count()).select_from(PhraseCard).where(PhraseCard.video_id == video.id))
+    assert count == 1
@@ -0,0 +1,116 @@
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.user_video_progress import UserVideoProgress
+from app.services.learning_progress import write_video_progress
+
+
+def _at(base: datetime, seconds: int) -> datetime:
+    return base + timedelta(seconds=seconds)
+
+
+async def _write_all(session_factory, user_id, video_id, calls):
+    """
+    并发执行一组进度写入：[(current_progress, watched_at, mark)]
+
+    每个调用使用独立连接，先取得连接再等待同一时刻放行，尽量让语句在数据库中同时执行。
+    """
+    ready = asyncio.Event()
+
+    async def write(current_progress, watched_at, mark):
+        async with session_factory() as db:
+            await db.connection()
+            await ready.wait()
+            await write_video_progress(db, user_id, video_id, current_progress, None, watched_at, mark=mark)
+            await db.commit()
+
+    tasks = [asyncio.create_task(write(*call)) for call in calls]
+    await asyncio.sleep(0.2)
+    ready.set()
+    await asyncio.gather(*tasks)
+
+
+async def _load(session_factory, user_id, video_id):
+    async with session_factory() as db:
+        result = await db.execute(
+            select(UserVideoProgress).where(
+                UserVideoProgress.user_id == user_id,
+                UserVideoProgress.video_id == video_id,
+            )
+        )
+        return result.scalars().first()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_heartbeats_and_complete(session_factory, user_and_video):
+    """
+    同一 (用户, 视频) 的并发心跳与标记完成：
+
+    - 首次写入并发插入时只产生一行（无唯一键冲突报错）
+    - 进度按 watched_at 后写者胜，不会被乱序到达的旧心跳覆盖
+    - 完成状态单调：标记完成后之后的心跳不会取消完成，也不会改写 completed_at
+    """
+    user_id, video_id = user_and_video
+    base = datetime.now(timezone.utc).replace(microsecond=0)
+
+    # 第一波：新行上的 30 次心跳（均未达到 90%）与 3 次标记完成（时间晚于所有心跳），乱序并发
+    first_wave = [(i, _at(base, i), None) for i in range(30)]
+    first_wave += [(None, _at(base, 100 + j), True) for j in range(3)]
+    random.shuffle(first_wave)
+
+    # 第二波：完成之后的 30 次心跳，进度回到 90% 以下
+    second_wave = [(10 + i, _at(base, 200 + i), None) for i in range(30)]
+    random.shuffle(second_wave)
+
+    snapshots = []
+    stop = asyncio.Event()
+
+    async def poll():
+        while not stop.is_set():
+            row = await _load(session_factory, user_id, video_id)
+            if row is not None:
+                snapshots.append((row.last_watched_at, row.is_completed, row.completed_at))
+            await asyncio.sleep(0.005)
+
+    poller = asyncio.create_task(poll())
+    try:
+        await _write_all(session_factory, user_id, video_id, first_wave)
+
+        row = await _load(session_factory, user_id, video_id)
+        assert row.is_completed is True
+        assert row.current_progress == 100
+        assert row.last_watched_at == _at(base, 102)
+        assert row.completed_at == _at(base, 102)
+
+        await _write_all(session_factory, user_id, video_id, second_wave)
+    finally:
+        stop.set()
+        await poller
+
+    async with session_factory() as db:
+        count = await db.scalar(
+            select(func.count()).select_from(UserVideoProgress).where(
+                UserVideoProgress.user_id == user_id,
+                UserVideoProgress.video_id == video_id,
+            )
+        )
+    assert count == 1
+
+    row = await _load(session_factory, user_id, video_id)
+    assert row.current_progress == 39
+    assert row.last_watched_at == _at(base, 229)
+    assert row.is_completed is True
+    assert row.completed_at == _at(base, 102)
+
+    # 轮询观察到的状态：last_watched_at 不回退，一旦完成不再变为未完成，第二波期间 completed_at 不变
+    watched = [snapshot[0] for snapshot in snapshots]
+    assert watched == sorted(watched)
+    completed_from = next((i for i, snapshot in enumerate(snapshots) if snapshot[1]), len(snapshots))
+    assert all(snapshot[1] for snapshot in snapshots[completed_from:])
+    assert all(
+        snapshot[2] == _at(base, 102) for snapshot in snapshots if snapshot[0] >= _at(base, 200)
+    )
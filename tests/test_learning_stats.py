@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, text
+
+from app.models.user_learning_stats import UserLearningStats
+from app.services.learning_progress import sync_progress_events, write_video_progress
+
+
+async def _write(session_factory, user_id, video_id, current_progress, watched_at, mark=None):
+    async with session_factory() as db:
+        await write_video_progress(db, user_id, video_id, current_progress, None, watched_at, mark=mark)
+        await db.commit()
+
+
+async def _watched(session_factory, user_id):
+    """(统计中的观看秒数, 已完成视频数, 观看流水 [(观看秒数, 播放位置)])"""
+    async with session_factory() as db:
+        stats = await db.scalar(select(UserLearningStats).where(UserLearningStats.user_id == user_id))
+        result = await db.execute(
+            text(
+                "SELECT watch_seconds, position FROM user_watch_events "
+                "WHERE user_id = :user_id ORDER BY watched_at"
+            ),
+            {"user_id": user_id},
+        )
+        return stats.total_watch_seconds, stats.videos_completed, [tuple(row) for row in result.all()]
+
+
+@pytest.mark.asyncio
+async def test_complete_on_insert_counts_no_watch_time(session_factory, user_and_video):
+    """首次写入就是手动标记完成：计为已完成，但不计观看时长，也不记录观看流水"""
+    user_id, video_id = user_and_video
+    await _write(session_factory, user_id, video_id, None, datetime.now(timezone.utc), mark=True)
+    assert await _watched(session_factory, user_id) == (0, 1, [])
+
+
+@pytest.mark.asyncio
+async def test_first_heartbeat_after_seek_counts_no_watch_time(session_factory, user_and_video):
+    """拖动到 80 秒后的首次心跳不计观看时长；之后按前进的秒数计，拖动不计"""
+    user_id, video_id = user_and_video
+    base = datetime.now(timezone.utc)
+    await _write(session_factory, user_id, video_id, 80, base)
+    assert await _watched(session_factory, user_id) == (0, 0, [])
+
+    await _write(session_factory, user_id, video_id, 85, base + timedelta(seconds=5))
+    # 回拖到 20 秒
+    await _write(session_factory, user_id, video_id, 20, base + timedelta(seconds=8))
+    # 5 秒内前拖到 60 秒：只计经过的 5 秒
+    await _write(session_factory, user_id, video_id, 60, base + timedelta(seconds=13))
+    assert await _watched(session_factory, user_id) == (10, 0, [(5, 85), (5, 60)])
+
+
+@pytest.mark.asyncio
+async def test_mark_complete_counts_no_watch_time(session_factory, user_and_video):
+    """看到 30 秒后隔一小时标记完成不计观看时长；之后的心跳从 30 秒的播放位置起算"""
+    user_id, video_id = user_and_video
+    base = datetime.now(timezone.utc) - timedelta(hours=2)
+    await _write(session_factory, user_id, video_id, 0, base)
+    await _write(session_factory, user_id, video_id, 30, base + timedelta(seconds=30))
+    await _write(session_factory, user_id, video_id, None, base + timedelta(hours=1), mark=True)
+    assert await _watched(session_factory, user_id) == (30, 1, [(30, 30)])
+
+    await _write(session_factory, user_id, video_id, 35, base + timedelta(hours=1, seconds=5))
+    assert await _watched(session_factory, user_id) == (35, 1, [(30, 30), (5, 35)])
+
+
+@pytest.mark.asyncio
+async def test_offline_sync_counts_from_playback_position(session_factory, user_and_video):
+    """离线同步新建进度行不计观看时长；已有行按同步后的播放位置前进的秒数计"""
+    user_id, video_id = user_and_video
+    base = datetime.now(timezone.utc) - timedelta(hours=1)
+
+    async def sync(current_progress, watched_at, is_completed=False):
+        async with session_factory() as db:
+            await sync_progress_events(db, user_id, [{
+                "video_id": video_id, "current_progress": current_progress, "total_duration": 100,
+                "is_completed": is_completed, "watched_at": watched_at,
+            }])
+            await db.commit()
+
+    await sync(40, base, is_completed=True)
+    assert await _watched(session_factory, user_id) == (0, 1, [])
+
+    await sync(70, base + timedelta(seconds=60))
+    # 比库中更旧的事件不改变播放位置
+    await sync(10, base + timedelta(seconds=30))
+    assert await _watched(session_factory, user_id) == (30, 1, [(30, 70)])
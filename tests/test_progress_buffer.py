@@ -0,0 +1,171 @@
+import asyncio
+import itertools
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app.models.user_video_progress import UserVideoProgress
+from app.services import progress_buffer as progress_buffer_module
+from app.services.learning_progress import write_video_progress
+from app.services.progress_buffer import PendingProgress, ProgressBuffer
+
+BASE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _at(seconds: int) -> datetime:
+    return BASE + timedelta(seconds=seconds)
+
+
+def _entry(mark=None, mark_at=None, auto_at=None, watched=100) -> PendingProgress:
+    return PendingProgress(50, 100, _at(watched), mark=mark, mark_at=mark_at, auto_at=auto_at)
+
+
+# 待写条目相对库中状态可能出现的各种变化
+ENTRY_KINDS = {
+    "无变化": {},
+    "自动完成": {"auto_at": 1},
+    "标记完成": {"mark": True, "mark_at": 1},
+    "取消完成": {"mark": False},
+}
+KNOWN_STATES = [(False, None), (True, _at(0))]
+
+
+def _build(kind: str, offset: int) -> PendingProgress:
+    fields = dict(ENTRY_KINDS[kind])
+    for name in ("auto_at", "mark_at"):
+        if name in fields:
+            fields[name] = _at(fields[name] + offset)
+    return _entry(watched=offset + 5, **fields)
+
+
+@pytest.mark.parametrize("known", KNOWN_STATES)
+def test_completion_follows_mark_then_known_then_auto(known):
+    """手动标记决定结果；没有标记时已完成保持不变，未完成时看是否自动完成"""
+    assert _entry(mark=True, mark_at=_at(5)).completion(known) == (True, _at(5))
+    assert _entry(mark=False).completion(known) == (False, None)
+    assert _entry().completion(known) == known
+    expected = known if known[0] else (True, _at(7))
+    assert _entry(auto_at=_at(7)).completion(known) == expected
+
+
+def test_absorb_keeps_newer_mark():
+    newer = _entry(mark=False)
+    newer.absorb(_entry(mark=True, mark_at=_at(1)))
+    assert (newer.mark, newer.mark_at, newer.auto_at) == (False, None, None)
+
+
+def test_absorb_older_mark_false_then_newer_reaches_completion():
+    """更早的取消完成 + 之后的自动完成 = 在自动完成的时间重新标记完成"""
+    newer = _entry(auto_at=_at(20))
+    newer.absorb(_entry(mark=False))
+    assert (newer.mark, newer.mark_at, newer.auto_at) == (True, _at(20), None)
+
+
+def test_absorb_keeps_earliest_auto_completion():
+    newer = _entry(auto_at=_at(20))
+    newer.absorb(_entry(auto_at=_at(10)))
+    assert (newer.mark, newer.auto_at) == (None, _at(10))
+
+
+@pytest.mark.parametrize(
+    "older_kind, newer_kind, known",
+    list(itertools.product(ENTRY_KINDS, ENTRY_KINDS, KNOWN_STATES)),
+)
+def test_absorb_matches_sequential_writes(older_kind, newer_kind, known):
+    """落库失败回退后合并的条目，与两批依次落库得到的完成状态一致"""
+    older, newer = _build(older_kind, 0), _build(newer_kind, 10)
+    sequential = newer.completion(older.completion(known))
+    newer.absorb(older)
+    assert newer.completion(known) == sequential
+
+
+# 心跳脚本：(current_progress, is_completed)，视频时长 100 秒
+SCRIPTS = {
+    "自动完成后回看": [(50, None), (95, None), (20, None), (30, None)],
+    "标记完成后取消再看完": [(30, True), (40, None), (10, False), (95, None), (50, None)],
+    "取消完成后继续停留在末尾": [(95, None), (96, False), (97, None), (98, None)],
+}
+FLUSH_SCHEDULES = {"每次心跳后": "every", "只在最后": "end", "中途一次": "middle"}
+
+
+def _should_flush(schedule: str, step: int, steps: int) -> bool:
+    return schedule == "every" or step == steps - 1 or (schedule == "middle" and step == steps // 2)
+
+
+async def _row(session_factory, user_id, video_id):
+    async with session_factory() as db:
+        result = await db.execute(
+            select(UserVideoProgress).where(
+                UserVideoProgress.user_id == user_id, UserVideoProgress.video_id == video_id
+            )
+        )
+        return result.scalars().one()
+
+
+def _state(row, watched_times):
+    """(进度, 是否完成, 完成于第几次心跳)"""
+    completed_step = watched_times.index(row.completed_at) if row.completed_at is not None else None
+    return row.current_progress, row.is_completed, completed_step
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("schedule", FLUSH_SCHEDULES.values(), ids=list(FLUSH_SCHEDULES))
+@pytest.mark.parametrize("script", SCRIPTS.values(), ids=list(SCRIPTS))
+async def test_flush_matches_direct_writes(session_factory, user_and_video, video_factory, monkeypatch, script, schedule):
+    """同一串心跳经写回缓冲落库与逐条直接写库，接口返回与最终行一致"""
+    user_id, direct_video = user_and_video
+    buffered_video = (await video_factory(duration=100)).id
+    monkeypatch.setattr(progress_buffer_module, "SessionLocal", session_factory)
+    buffer = ProgressBuffer()
+
+    direct_times, buffered_times = [], []
+    for step, (current_progress, mark) in enumerate(script):
+        watched_at = datetime.now(timezone.utc)
+        async with session_factory() as db:
+            direct = await write_video_progress(db, user_id, direct_video, current_progress, None, watched_at, mark)
+            await db.commit()
+        direct_times.append(watched_at)
+
+        async with session_factory() as db:
+            buffered = await buffer.record(db, user_id, buffered_video, current_progress, 100, mark)
+        buffered_times.append(buffered["last_watched_at"])
+
+        # 每次心跳的返回值一致
+        assert (buffered["current_progress"], buffered["is_completed"]) == (direct.current_progress, direct.is_completed)
+        direct_step = direct_times.index(direct.completed_at) if direct.completed_at else None
+        buffered_step = buffered_times.index(buffered["completed_at"]) if buffered["completed_at"] else None
+        assert buffered_step == direct_step
+
+        if _should_flush(schedule, step, len(script)):
+            await buffer.flush()
+            assert _state(await _row(session_factory, user_id, buffered_video), buffered_times) == _state(
+                await _row(session_factory, user_id, direct_video), direct_times
+            )
+
+
+@pytest.mark.asyncio
+async def test_stop_during_flush_keeps_batch(session_factory, user_and_video, monkeypatch):
+    """定时落库进行中应用关闭：stop() 等这批写完，不会因取消定时任务丢失已取出的数据"""
+    user_id, video_id = user_and_video
+    monkeypatch.setattr(progress_buffer_module, "SessionLocal", session_factory)
+    monkeypatch.setattr(progress_buffer_module.settings, "PROGRESS_FLUSH_SECONDS", 0.01)
+    flushing = asyncio.Event()
+    upsert_progress = progress_buffer_module.upsert_progress
+
+    async def slow_upsert(db, rows, explicit):
+        flushing.set()
+        await asyncio.sleep(0.2)
+        return await upsert_progress(db, rows, explicit)
+
+    monkeypatch.setattr(progress_buffer_module, "upsert_progress", slow_upsert)
+    buffer = ProgressBuffer()
+    async with session_factory() as db:
+        await buffer.record(db, user_id, video_id, 42, 100, None)
+
+    buffer.start()
+    await flushing.wait()
+    await buffer.stop()
+
+    row = await _row(session_factory, user_id, video_id)
+    assert row.current_progress == 42
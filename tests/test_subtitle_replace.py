@@ -0,0 +1,80 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import delete, insert, select
+
+from app.models.phrase_card import PhraseCard
+from app.models.subtitle import Subtitle
+from app.models.user import User
+from app.models.user_subtitle_favorite import UserSubtitleFavorite
+from app.models.word_card import WordCard
+from app.schemas import SubtitleBase
+from app.services.subtitle_replace import replace_subtitles
+
+
+@pytest.mark.asyncio
+async def test_removed_subtitles_merge_into_one_favorite(session_factory, user_and_video):
+    """
+    两条被删除的字幕映射到同一条新字幕：
+
+    - 未收藏新字幕的用户只保留最早的一条收藏并改挂
+    - 已收藏新字幕的用户保留原收藏，旧收藏删除
+    - 单词卡、短语卡改挂到新字幕
+    """
+    user_id, video_id = user_and_video
+    base = datetime.now(timezone.utc)
+    async with session_factory() as db:
+        other = User(email=f"{uuid.uuid4()}@test.local", hashed_password="x")
+        db.add(other)
+        await db.flush()
+        kept, first, second = (
+            Subtitle(video_id=video_id, start_time=t, end_time=t + 1, english_text=f"line {t}", sequence_number=i)
+            for i, t in enumerate((0, 10, 11))
+        )
+        db.add_all([kept, first, second])
+        await db.flush()
+
+        favorites = [
+            (user_id, second.id, base),
+            (user_id, first.id, base + timedelta(seconds=1)),
+            (other.id, kept.id, base + timedelta(seconds=2)),
+            (other.id, first.id, base),
+            (other.id, second.id, base),
+        ]
+        favorite_ids = {}
+        for owner, subtitle_id, favorited_at in favorites:
+            favorite_ids[(owner, subtitle_id)] = uuid.uuid4()
+            await db.execute(insert(UserSubtitleFavorite).values(
+                id=favorite_ids[(owner, subtitle_id)], user_id=owner, subtitle_id=subtitle_id,
+                video_id=video_id, favorited_at=favorited_at,
+            ))
+        word_card = WordCard(video_id=video_id, word="line", subtitle_id=first.id)
+        phrase_card = PhraseCard(video_id=video_id, phrase="line ten", subtitle_id=second.id)
+        db.add_all([word_card, phrase_card])
+        await db.commit()
+
+    try:
+        async with session_factory() as db:
+            response = await replace_subtitles(
+                db, video_id, [SubtitleBase(start_time=0, end_time=1, english_text="line 0", sequence_number=0)]
+            )
+            await db.commit()
+        assert response.deleted == 2
+
+        async with session_factory() as db:
+            result = await db.execute(
+                select(UserSubtitleFavorite.user_id, UserSubtitleFavorite.id, UserSubtitleFavorite.subtitle_id)
+                .where(UserSubtitleFavorite.video_id == video_id)
+            )
+            rows = result.all()
+            assert sorted(rows) == sorted([
+                (user_id, favorite_ids[(user_id, second.id)], kept.id),
+                (other.id, favorite_ids[(other.id, kept.id)], kept.id),
+            ])
+            assert await db.scalar(select(WordCard.subtitle_id).where(WordCard.id == word_card.id)) == kept.id
+            assert await db.scalar(select(PhraseCard.subtitle_id).where(PhraseCard.id == phrase_card.id)) == kept.id
+    finally:
+        async with session_factory() as db:
+            await db.execute(delete(User).where(User.id == other.id))
+            await db.commit()
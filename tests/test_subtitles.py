@@ -0,0 +1,93 @@
+import uuid
+
+import pytest
+from sqlalchemy import delete, insert, select, update
+
+from app.models.subtitle import Subtitle
+from app.models.subtitle_lemma import SubtitleLemma
+from app.models.video import Video
+
+
+async def _lemmas(session_factory, video_id):
+    """{(字幕 ID, 原形): (排序后的词形, start_time)}"""
+    async with session_factory() as db:
+        result = await db.execute(
+            select(SubtitleLemma.subtitle_id, SubtitleLemma.lemma, SubtitleLemma.forms, SubtitleLemma.start_time)
+            .where(SubtitleLemma.video_id == video_id)
+        )
+        return {(row.subtitle_id, row.lemma): (sorted(row.forms), row.start_time) for row in result.all()}
+
+
+@pytest.mark.asyncio
+async def test_search_hides_segments_of_unpublished_parent(client, session_factory, video_factory):
+    """父视频未发布时，已发布片段的字幕不出现在全库检索与词形检索中"""
+    word = f"zq{uuid.uuid4().hex[:8]}"
+    group = await video_factory(title="未发布视频组", video_type="group", is_published=False)
+    segment = await video_factory(title="片段", video_type="segment", parent_id=group.id, segment_index=1)
+    async with session_factory() as db:
+        db.add(Subtitle(
+            video_id=segment.id, start_time=0, end_time=1, english_text=f"say {word} now", word_refs={word: word},
+        ))
+        await db.commit()
+
+    async def found():
+        search = await client.get("/api/v1/subtitles/search", params={"q": word})
+        concordance = await client.get("/api/v1/subtitles/concordance", params={"lemma": word})
+        assert search.status_code == 200 and concordance.status_code == 200
+        return len(search.json()["items"]), len(concordance.json()["items"])
+
+    assert await found() == (0, 0)
+
+    async with session_factory() as db:
+        await db.execute(update(Video).where(Video.id == group.id).values(is_published=True))
+        await db.commit()
+    assert await found() == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_lemma_index_follows_word_refs(session_factory, video_factory):
+    """subtitle_lemmas 随字幕的插入、更新、删除由触发器同步维护"""
+    video = await video_factory()
+    async with session_factory() as db:
+        # 多行插入：原形统一小写，空原形与非对象的 word_refs 不产生索引行
+        result = await db.execute(
+            insert(Subtitle).returning(Subtitle.id),
+            [
+                {
+                    "video_id": video.id, "start_time": 1, "end_time": 2, "english_text": "Cleaner, cleanest",
+                    "word_refs": {"Cleaner": "Clean", "cleanest": "clean", "the": " "},
+                },
+                {"video_id": video.id, "start_time": 3, "end_time": 4, "english_text": "run", "word_refs": {"run": "run"}},
+                {"video_id": video.id, "start_time": 5, "end_time": 6, "english_text": "x", "word_refs": ["run"]},
+            ],
+        )
+        first, second, third = result.scalars().all()
+        await db.commit()
+
+    assert await _lemmas(session_factory, video.id) == {
+        (first, "clean"): (["Cleaner", "cleanest"], 1),
+        (second, "run"): (["run"], 3),
+    }
+
+    # 更新 word_refs：旧原形移除、新原形加入；只改时间轴时索引行随之更新
+    async with session_factory() as db:
+        await db.execute(
+            update(Subtitle).where(Subtitle.id == first).values(word_refs={"cleaning": "clean", "went": "go"})
+        )
+        await db.execute(update(Subtitle).where(Subtitle.id == second).values(start_time=10))
+        await db.execute(update(Subtitle).where(Subtitle.id == third).values(word_refs={"ran": "run"}))
+        await db.commit()
+
+    assert await _lemmas(session_factory, video.id) == {
+        (first, "clean"): (["cleaning"], 1),
+        (first, "go"): (["went"], 1),
+        (second, "run"): (["run"], 10),
+        (third, "run"): (["ran"], 5),
+    }
+
+    # 删除字幕：索引行随外键级联删除
+    async with session_factory() as db:
+        await db.execute(delete(Subtitle).where(Subtitle.id.in_([first, third])))
+        await db.commit()
+
+    assert await _lemmas(session_factory, video.id) == {(second, "run"): (["run"], 10)}
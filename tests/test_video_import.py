@@ -0,0 +1,116 @@
+import json
+import uuid
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, select
+
+from app.models.tag import Tag
+from app.models.video import Video
+from app.models.video_tag import VideoTag
+from app.services.video_import import import_videos
+
+
+async def _lines(*items):
+    for item in items:
+        yield json.dumps(item, ensure_ascii=False)
+
+
+@pytest.fixture
+def youtube_ids():
+    """本测试使用的 youtube_id 前缀，结束后按前缀清理导入的视频"""
+    return f"t{uuid.uuid4().hex[:10]}"
+
+
+@pytest_asyncio.fixture
+async def cleanup(session_factory, youtube_ids):
+    yield
+    async with session_factory() as db:
+        ids = select(Video.id).where(Video.youtube_id.like(f"{youtube_ids}%"))
+        await db.execute(delete(Video).where(Video.parent_id.in_(ids)))
+        await db.execute(delete(Video).where(Video.youtube_id.like(f"{youtube_ids}%")))
+        await db.execute(delete(Tag).where(Tag.name.like(f"{youtube_ids}%")))
+        await db.commit()
+
+
+async def _import(session_factory, *items):
+    async with session_factory() as db:
+        return await import_videos(db, _lines(*items))
+
+
+async def _video(session_factory, youtube_id):
+    async with session_factory() as db:
+        return await db.scalar(select(Video).where(Video.youtube_id == youtube_id))
+
+
+@pytest.mark.asyncio
+async def test_segment_line_references_parent_in_same_batch(session_factory, youtube_ids, cleanup):
+    """片段单独成行时可用 parent_youtube_id 引用同一批次中前面新建的视频组"""
+    group, segment, orphan = f"{youtube_ids}-g", f"{youtube_ids}-s1", f"{youtube_ids}-s2"
+    response = await _import(
+        session_factory,
+        {"title": "视频组", "duration": 120, "youtube_id": group, "video_type": "group"},
+        {"title": "片段 1", "duration": 60, "youtube_id": segment, "parent_youtube_id": group, "segment_index": 1},
+        {"title": "孤儿片段", "duration": 60, "youtube_id": orphan, "parent_youtube_id": f"{youtube_ids}-none"},
+    )
+    assert [r.status for r in response.results] == ["created", "created", "failed"]
+    assert response.results[2].error == "父视频不存在"
+
+    parent = await _video(session_factory, group)
+    child = await _video(session_factory, segment)
+    assert child.parent_id == parent.id
+    assert child.video_type == "segment"
+    assert parent.segment_count == 1
+
+    # 父视频已在库中时同样可以按 youtube_id 引用
+    response = await _import(
+        session_factory,
+        {"title": "片段 2", "duration": 60, "youtube_id": orphan, "parent_youtube_id": group, "segment_index": 2},
+    )
+    assert response.results[0].status == "created"
+    assert (await _video(session_factory, orphan)).parent_id == parent.id
+
+
+@pytest.mark.asyncio
+async def test_reimport_keeps_omitted_fields(session_factory, youtube_ids, cleanup):
+    """重新导入时只覆盖行中出现的字段，未出现的 display_order / is_published / 标签保持原值"""
+    youtube_id, tag = f"{youtube_ids}-v", f"{youtube_ids}-tag"
+    await _import(
+        session_factory,
+        {
+            "title": "原标题", "duration": 100, "youtube_id": youtube_id,
+            "display_order": 5, "is_published": True, "tags": [tag],
+            "segments": [{"title": "片段", "duration": 50, "segment_index": 1, "display_order": 3}],
+        },
+    )
+
+    response = await _import(
+        session_factory,
+        {
+            "title": "新标题", "duration": 100, "youtube_id": youtube_id,
+            "segments": [{"title": "新片段标题", "duration": 50, "segment_index": 1}],
+        },
+    )
+    assert response.updated == 1
+
+    video = await _video(session_factory, youtube_id)
+    assert video.title == "新标题"
+    assert video.display_order == 5
+    assert video.is_published is True
+    async with session_factory() as db:
+        tags = await db.scalars(
+            select(Tag.name).join(VideoTag, VideoTag.tag_id == Tag.id).where(VideoTag.video_id == video.id)
+        )
+        assert list(tags) == [tag]
+        segment = await db.scalar(select(Video).where(Video.parent_id == video.id))
+    assert segment.title == "新片段标题"
+    assert segment.display_order == 3
+
+    # 显式给出的字段照常覆盖
+    await _import(
+        session_factory,
+        {"title": "新标题", "duration": 100, "youtube_id": youtube_id, "is_published": False, "tags": []},
+    )
+    video = await _video(session_factory, youtube_id)
+    assert video.is_published is False
+    assert video.display_order == 5
@@ -0,0 +1,100 @@
+import uuid
+
+import pytest
+from sqlalchemy import delete, select, update
+
+from app.models.video import Video
+from app.services.content_version import bump_content_version
+
+
+async def _segment_count(session_factory, video_id):
+    async with session_factory() as db:
+        return await db.scalar(select(Video.segment_count).where(Video.id == video_id))
+
+
+@pytest.mark.asyncio
+async def test_detail_segment_count_matches_column(client, session_factory, video_factory):
+    """详情接口的 segment_count 直接取触发器维护的列，与列表接口一致"""
+    group = await video_factory(title="视频组", video_type="group")
+    first = await video_factory(title="片段 1", video_type="segment", parent_id=group.id, segment_index=1)
+    await video_factory(title="片段 2", video_type="segment", parent_id=group.id, segment_index=2)
+    assert await _segment_count(session_factory, group.id) == 2
+
+    response = await client.get(f"/api/v1/videos/{group.id}")
+    assert response.status_code == 200
+    assert response.json()["segment_count"] == 2
+    assert len(response.json()["segments"]) == 2
+
+    async with session_factory() as db:
+        await db.execute(delete(Video).where(Video.id == first.id))
+        await db.commit()
+    assert await _segment_count(session_factory, group.id) == 1
+
+    response = await client.get(f"/api/v1/videos/{group.id}")
+    assert response.json()["segment_count"] == 1
+    assert len(response.json()["segments"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_detail_endpoints_use_one_query(client, video_factory, query_counter):
+    """详情、片段列表、按 YouTube ID 查询各只需一次数据库往返（视频、访问权限、标签、片段）"""
+    group = await video_factory(title="视频组", video_type="group", youtube_id=f"yt-{uuid.uuid4().hex[:12]}")
+    for index in (1, 2, 3):
+        await video_factory(title=f"片段 {index}", video_type="segment", parent_id=group.id, segment_index=index)
+
+    for path in (
+        f"/api/v1/videos/{group.id}",
+        f"/api/v1/videos/{group.id}/segments",
+        f"/api/v1/videos/by-youtube-id/{group.youtube_id}",
+    ):
+        query_counter.clear()
+        response = await client.get(path)
+        assert response.status_code == 200, path
+        assert len(query_counter) == 1, (path, query_counter)
+
+
+@pytest.mark.asyncio
+async def test_catalog_conditional_get_skips_query(client, session_factory, video_factory, query_counter):
+    """列表与详情的 ETag 由目录版本派生：命中时只读一行版本即返回 304，目录写入后 ETag 变化"""
+    video = await video_factory(title="条件请求")
+
+    for path in ("/api/v1/videos/", f"/api/v1/videos/{video.id}"):
+        response = await client.get(path)
+        assert response.status_code == 200, path
+        etag = response.headers["etag"]
+
+        query_counter.clear()
+        response = await client.get(path, headers={"If-None-Match": etag})
+        assert response.status_code == 304, path
+        assert len(query_counter) == 1, (path, query_counter)
+
+        async with session_factory() as db:
+            await db.execute(update(Video).where(Video.id == video.id).values(title=f"条件请求 {path}"))
+            await db.commit()
+        response = await client.get(path, headers={"If-None-Match": etag})
+        assert response.status_code == 200, path
+        assert response.headers["etag"] != etag
+        assert f"条件请求 {path}" in response.text
+
+
+@pytest.mark.asyncio
+async def test_last_modified_advances_within_same_second(client, session_factory, video_factory):
+    """同一秒内的两次内容写入得到不同的 Last-Modified，If-Modified-Since 不会误判为未修改"""
+    video = await video_factory(title="单词卡")
+    path = f"/api/v1/word-cards/?video_id={video.id}"
+
+    async with session_factory() as db:
+        await bump_content_version(db, video.id)
+        await db.commit()
+    first = await client.get(path)
+    assert first.status_code == 200
+
+    async with session_factory() as db:
+        await bump_content_version(db, video.id)
+        await db.commit()
+    response = await client.get(path, headers={"If-Modified-Since": first.headers["last-modified"]})
+    assert response.status_code == 200
+    assert response.headers["last-modified"] != first.headers["last-modified"]
+
+    response = await client.get(path, headers={"If-Modified-Since": response.headers["last-modified"]})
+    assert response.status_code == 304
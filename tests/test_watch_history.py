@@ -0,0 +1,42 @@
+from datetime import datetime, time, timedelta, timezone
+
+import pytest
+from sqlalchemy import text
+
+from app.services.learning_progress import sync_progress_events
+from app.services.watch_history import rollup_recent_activity
+
+
+async def _daily(session_factory, user_id):
+    async with session_factory() as db:
+        result = await db.execute(
+            text("SELECT day, watch_seconds FROM user_daily_activity WHERE user_id = :user_id ORDER BY day"),
+            {"user_id": user_id},
+        )
+        return [tuple(row) for row in result.all()]
+
+
+@pytest.mark.asyncio
+async def test_rollup_rerolls_days_of_late_offline_events(session_factory, user_and_video, video_factory):
+    """离线同步在窗口外的日期产生的流水：重算窗口时一并重算这些日期；早于保留期的日期不重算"""
+    user_id, video_id = user_and_video
+    expired_video = (await video_factory()).id
+    today = datetime.now(timezone.utc).date()
+    late_day, expired_day = today - timedelta(days=10), today - timedelta(days=40)
+
+    async with session_factory() as db:
+        for day, video in ((expired_day, expired_video), (late_day, video_id)):
+            watched = datetime.combine(day, time(8), tzinfo=timezone.utc)
+            for offset, current_progress in ((0, 10), (60, 60)):
+                await sync_progress_events(db, user_id, [{
+                    "video_id": video, "current_progress": current_progress, "total_duration": 100,
+                    "is_completed": False, "watched_at": watched + timedelta(seconds=offset),
+                }])
+        await db.commit()
+
+    async with session_factory() as db:
+        conn = await db.connection()
+        await rollup_recent_activity(conn, today - timedelta(days=2), today, not_before=today - timedelta(days=30))
+        await db.commit()
+
+    assert await _daily(session_factory, user_id) == [(late_day, 50)]